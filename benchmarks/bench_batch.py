@@ -0,0 +1,131 @@
+"""
+Compare one prepare_meetings batch call with individual prepare_meeting calls.
+
+Starts the stub upstream APIs and fake LLM from load_test.py, then, against a
+fresh server for each variant, prepares the same meetings either with one
+`prepare_meeting` call per meeting (sequentially, as a scheduler would) or with
+a single `prepare_meetings` call. Both variants use pipeline planning with
+combined enhancement, so every meeting gets the same LLM work.
+
+Reports the wall time, stub API requests and LLM requests of each variant.
+
+Usage:
+    uv run python benchmarks/bench_batch.py --meetings 50
+    uv run python benchmarks/bench_batch.py --meetings 200 --upstream-latency-ms 200 --llm-latency-ms 300
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import tempfile
+import time
+
+from aiohttp import web
+from fastmcp import Client
+
+from load_test import DEFAULT_CORPUS, UpstreamFaults, free_port, llm_routes, start_server, upstream_routes, wait_for_port
+
+SERVER_ENV = {
+    "PLANNER_MODE": "pipeline",
+    "PIPELINE_COMBINED_ENHANCEMENT": "true",
+    "LLM_CACHE_BACKEND": "none",
+    "ADMISSION_MAX_PER_CLIENT": "64",
+}
+
+
+async def start_counting_stubs(faults: UpstreamFaults, llm_latency_ms: float) -> tuple[web.AppRunner, str, dict]:
+    """Start the stubs like load_test.start_stubs, also counting LLM requests."""
+    counts = {"llm": 0}
+
+    @web.middleware
+    async def count_llm(request, handler):
+        if request.path.startswith("/v1/"):
+            counts["llm"] += 1
+        return await handler(request)
+
+    app = web.Application(middlewares=[count_llm])
+    app.add_routes(upstream_routes(faults) + llm_routes(llm_latency_ms))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", counts
+
+
+async def run_variant(variant: str, contexts: list, stub_url: str, faults: UpstreamFaults, counts: dict) -> dict:
+    """Prepare every meeting with one server, returning the wall time and request counts."""
+    port = free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        process = start_server(stub_url, port, "sse", SERVER_ENV, workdir)
+        try:
+            await wait_for_port(port, process)
+
+            async def ignore_server_log(message):
+                pass
+
+            async with Client(f"http://127.0.0.1:{port}/sse", timeout=3600, log_handler=ignore_server_log) as client:
+                # Warm the planner and connections before measuring
+                await client.call_tool("prepare_meeting", {"meeting_context": "warm-up"})
+                upstream_before, llm_before = faults.requests, counts["llm"]
+                start = time.perf_counter()
+                if variant == "batch":
+                    result = await client.call_tool("prepare_meetings", {"contexts": contexts})
+                    notes = result.data
+                else:
+                    notes = []
+                    for context in contexts:
+                        result = await client.call_tool("prepare_meeting", {"meeting_context": context})
+                        notes.append(result.content[0].text)
+                wall_seconds = time.perf_counter() - start
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    return {
+        "meetings": len(notes),
+        "wall_seconds": round(wall_seconds, 3),
+        "upstream_requests": faults.requests - upstream_before,
+        "llm_requests": counts["llm"] - llm_before,
+    }
+
+
+async def main(args: argparse.Namespace):
+    with open(args.corpus) as corpus:
+        corpus_contexts = [line.strip() for line in corpus if line.strip()]
+    contexts = [corpus_contexts[i % len(corpus_contexts)] for i in range(args.meetings)]
+
+    faults = UpstreamFaults(args.upstream_latency_ms, 0, 0, 1)
+    runner, stub_url, counts = await start_counting_stubs(faults, args.llm_latency_ms)
+    report = {}
+    try:
+        for variant in ("individual", "batch"):
+            report[variant] = await run_variant(variant, contexts, stub_url, faults, counts)
+    finally:
+        await runner.cleanup()
+
+    print(f"{args.meetings} meetings ({len(set(contexts))} distinct contexts)")
+    print(f"{'variant':<11} {'wall time':>10} {'per meeting':>12} {'API requests':>13} {'LLM requests':>13}")
+    for variant, result in report.items():
+        per_meeting_ms = result["wall_seconds"] * 1000 / args.meetings
+        print(
+            f"{variant:<11} {result['wall_seconds']:>8.2f} s {per_meeting_ms:>9.1f} ms "
+            f"{result['upstream_requests']:>13} {result['llm_requests']:>13}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=50, help="Meetings to prepare per variant")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Meeting contexts, one per line, used round robin")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50.0, help="Mean stub API latency (jittered +/-50%%)")
+    parser.add_argument("--llm-latency-ms", type=float, default=100.0, help="Fake LLM latency per completion")
+    parser.add_argument("--json", help="Write the report as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
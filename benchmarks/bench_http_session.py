@@ -0,0 +1,124 @@
+"""
+Benchmark upstream fetch latency with and without the pooled HTTP session.
+
+Starts a local stub HTTP server that emulates the opentdb trivia endpoint and
+measures p50/p99 latency of TechTriviaService fetches when every request opens
+a fresh aiohttp.ClientSession (the previous behaviour) versus the shared pooled
+session used by BaseService.
+
+Usage:
+    uv run python benchmarks/bench_http_session.py --requests 500 --concurrency 10
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+import aiohttp
+import structlog
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from app.core.http_session import http_session_manager  # noqa: E402
+from app.services.tech_trivia_service import TechTriviaService  # noqa: E402
+
+TRIVIA_PAYLOAD = {
+    "response_code": 0,
+    "results": [
+        {
+            "category": "Science: Computers",
+            "type": "multiple",
+            "difficulty": "medium",
+            "question": "What does CPU stand for?",
+            "correct_answer": "Central Processing Unit",
+            "incorrect_answers": ["Central Process Unit", "Computer Personal Unit", "Central Processor Unit"]
+        }
+    ]
+}
+
+
+async def start_stub_server(latency_ms: float) -> tuple[web.AppRunner, str]:
+    """Start a local trivia stub server and return its runner and URL."""
+    async def handler(request):
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return web.json_response(TRIVIA_PAYLOAD)
+
+    app = web.Application()
+    app.router.add_get("/api.php", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api.php?amount=1&category=18&type=multiple"
+
+
+async def fetch_fresh_session(url: str):
+    """Fetch with a new ClientSession per request, as BaseService used to."""
+    async with aiohttp.ClientSession() as client:
+        async with client.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+async def run_scenario(fetch, requests: int, concurrency: int) -> list[float]:
+    """Run `requests` fetches with bounded concurrency and return latencies in ms."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await fetch()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def summarize(name: str, latencies: list[float], elapsed: float):
+    """Print p50/p99 latency and throughput for one scenario."""
+    cuts = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<16} p50={cuts[49]:7.2f} ms  p99={cuts[98]:7.2f} ms  "
+        f"mean={statistics.mean(latencies):7.2f} ms  throughput={len(latencies) / elapsed:8.1f} req/s"
+    )
+
+
+async def main(requests: int, concurrency: int, latency_ms: float):
+    # Keep per-request service logs out of the measurements
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    runner, url = await start_stub_server(latency_ms)
+    try:
+        service = TechTriviaService()
+        service.api_url = url
+
+        # Warm up both paths so the first-request import/setup cost is excluded
+        await fetch_fresh_session(url)
+        await service.get_tech_trivia()
+
+        start = time.perf_counter()
+        fresh = await run_scenario(lambda: fetch_fresh_session(url), requests, concurrency)
+        summarize("fresh session", fresh, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        pooled = await run_scenario(service.get_tech_trivia, requests, concurrency)
+        summarize("pooled session", pooled, time.perf_counter() - start)
+    finally:
+        await http_session_manager.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Number of fetches per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight fetches")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial stub server latency")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency_ms))
@@ -0,0 +1,123 @@
+"""
+Micro-benchmark per-call LLM gateway construction versus the shared registry.
+
+Agent tools used to build a new LLMGateway (chat model, API client and HTTP
+connection pool) on every invocation. This measures that construction cost
+against looking up the shared gateway, and the end-to-end latency of chat model
+calls against a local OpenAI-compatible stub when each call uses a fresh gateway
+versus the shared, pooled one.
+
+Usage:
+    uv run python benchmarks/bench_llm_gateway.py --iterations 200 --calls 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+import structlog
+from aiohttp import web
+from pydantic import SecretStr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from app.core.config import settings  # noqa: E402
+from app.core.llm_gateway import LLMGateway, get_llm_gateway  # noqa: E402
+
+
+def completion_payload(model: str) -> dict:
+    """Build a minimal OpenAI chat completion response."""
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "ok"},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    }
+
+
+async def start_stub_server() -> tuple[web.AppRunner, str]:
+    """Start a local OpenAI-compatible stub and return its runner and base URL."""
+    async def handler(request):
+        body = await request.json()
+        return web.json_response(completion_payload(body.get("model", "bench")))
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v1"
+
+
+def time_construction(iterations: int) -> tuple[list[float], list[float]]:
+    """Return per-call latencies in ms for building a gateway versus a registry lookup."""
+    fresh = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        LLMGateway()
+        fresh.append((time.perf_counter() - start) * 1000)
+
+    get_llm_gateway()
+    shared = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        get_llm_gateway()
+        shared.append((time.perf_counter() - start) * 1000)
+    return fresh, shared
+
+
+async def time_calls(calls: int, make_gateway) -> list[float]:
+    """Return latencies in ms of sequential chat model calls using `make_gateway` per call."""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await make_gateway().chat_model.ainvoke("ping")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(name: str, latencies: list[float]):
+    """Print p50/p99 and mean latency for one scenario."""
+    cuts = statistics.quantiles(latencies, n=100)
+    print(f"{name:<24} p50={cuts[49]:8.3f} ms  p99={cuts[98]:8.3f} ms  mean={statistics.mean(latencies):8.3f} ms")
+
+
+async def main(iterations: int, calls: int):
+    # Keep per-call gateway logs out of the measurements
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    runner, base_url = await start_stub_server()
+    settings.LLM_API_KEY = SecretStr("bench-key")
+    settings.LLM_API_BASE_URL = base_url
+    settings.LLM_MODEL = "gpt-4o-mini"
+    try:
+        fresh, shared = time_construction(iterations)
+        summarize("construct per call", fresh)
+        summarize("shared registry lookup", shared)
+
+        # Warm up both paths so one-off import costs are excluded
+        await time_calls(1, LLMGateway)
+        await time_calls(1, get_llm_gateway)
+        summarize("call, fresh gateway", await time_calls(calls, LLMGateway))
+        summarize("call, shared gateway", await time_calls(calls, get_llm_gateway))
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="Gateway constructions/lookups to time")
+    parser.add_argument("--calls", type=int, default=200, help="Chat model calls per call scenario")
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.calls))
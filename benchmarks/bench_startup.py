@@ -0,0 +1,144 @@
+"""
+Benchmark server cold start with eager versus lazy initialization.
+
+For each mode, every run starts a fresh interpreter and measures:
+- import time of `server` from `python -X importtime -c "import server"`,
+  with the slowest top-level imports
+- time from process start until server.py accepts connections
+- time from process start until a first prepare_meeting call returns,
+  served by the local stub upstreams and fake LLM from load_test.py
+
+Usage:
+    uv run python benchmarks/bench_startup.py --runs 5
+    uv run python benchmarks/bench_startup.py --modes lazy --top 15 --json startup.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from load_test import ROOT, UpstreamFaults, drive, free_port, start_server, start_stubs, wait_for_port
+
+MODES = {
+    "eager": {"SERVER_LAZY_INIT": "false"},
+    "lazy": {"SERVER_LAZY_INIT": "true", "SERVER_WARMUP_ENABLED": "true"},
+}
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_import(env: dict, workdir: str) -> tuple[float, dict]:
+    """
+    Import server.py in a fresh interpreter with -X importtime.
+
+    Returns:
+        The cumulative import time of `server` in ms, and the cumulative ms
+        of each module imported directly by it.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {ROOT!r}); import server"],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    total = 0.0
+    direct = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        depth = len(match.group(3)) // 2
+        if match.group(4) == "server" and depth == 0:
+            total = cumulative_ms
+        elif depth == 1:
+            direct[match.group(4)] = cumulative_ms
+    return total, direct
+
+
+async def measure_start(env_overrides: dict, stub_url: str, workdir: str) -> tuple[float, float]:
+    """
+    Start server.py and time it until it listens and until a first call returns.
+
+    Returns:
+        Milliseconds to listen and to the first prepare_meeting response.
+    """
+    port = free_port()
+    start = time.perf_counter()
+    process = start_server(stub_url, port, "sse", env_overrides, workdir)
+    try:
+        await wait_for_port(port, process)
+        listening_ms = (time.perf_counter() - start) * 1000
+        _, errors, _ = await drive(f"http://127.0.0.1:{port}/sse", ["sprint planning"], "pipeline", 1, 1)
+        if errors:
+            raise RuntimeError("First prepare_meeting call failed")
+        first_response_ms = (time.perf_counter() - start) * 1000
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return listening_ms, first_response_ms
+
+
+async def main(args: argparse.Namespace):
+    runner, stub_url = await start_stubs(UpstreamFaults(0, 0, 0, 1), llm_latency_ms=0)
+    report = {}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for mode in args.modes:
+                env = {**os.environ, "LLM_API_KEY": "bench-key", "LLM_MODEL": "gpt-4o-mini", **MODES[mode]}
+                imports, listens, responses = [], [], []
+                slowest: dict = {}
+                for _ in range(args.runs):
+                    total, direct = measure_import(env, workdir)
+                    imports.append(total)
+                    for module, ms in direct.items():
+                        slowest.setdefault(module, []).append(ms)
+                    listening_ms, first_response_ms = await measure_start(MODES[mode], stub_url, workdir)
+                    listens.append(listening_ms)
+                    responses.append(first_response_ms)
+
+                top = sorted(
+                    ((module, statistics.median(times)) for module, times in slowest.items()),
+                    key=lambda item: item[1],
+                    reverse=True
+                )[:args.top]
+                report[mode] = {
+                    "import_ms": round(statistics.median(imports), 1),
+                    "listen_ms": round(statistics.median(listens), 1),
+                    "first_response_ms": round(statistics.median(responses), 1),
+                    "slowest_imports_ms": {module: round(ms, 1) for module, ms in top},
+                }
+    finally:
+        await runner.cleanup()
+
+    print(f"median of {args.runs} runs")
+    print(f"{'mode':<8} {'import server':>14} {'listening':>12} {'first response':>15}")
+    for mode, result in report.items():
+        print(f"{mode:<8} {result['import_ms']:>11.1f} ms {result['listen_ms']:>9.1f} ms {result['first_response_ms']:>12.1f} ms")
+    for mode, result in report.items():
+        print(f"\nslowest imports by server.py ({mode})")
+        for module, ms in result["slowest_imports_ms"].items():
+            print(f"  {ms:>9.1f} ms  {module}")
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per mode")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES), help="Initialization modes to compare")
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports of server.py to list")
+    parser.add_argument("--json", help="Write the report as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
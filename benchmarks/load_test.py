@@ -0,0 +1,457 @@
+"""
+Load-test the MCP server end to end, fully offline.
+
+Starts local aiohttp stubs for the upstream content APIs (opentdb,
+uselessfacts, ossinsight) with configurable latency, error rate and 429 rate,
+plus a fake OpenAI-compatible chat endpoint that supports tool calling,
+structured output and streaming. `server.py` is then launched as a subprocess
+pointed at the stubs and driven over SSE or streamable HTTP by concurrent MCP
+clients calling `prepare_meeting`.
+
+Reports throughput, p50/p95/p99 latency, the error rate and the server's
+resident memory. Threshold flags turn it into a regression gate: the exit
+status is 1 when any threshold is breached.
+
+Usage:
+    uv run python benchmarks/load_test.py --requests 200 --concurrency 20 --mode pipeline
+    uv run python benchmarks/load_test.py --upstream-latency-ms 200 --error-rate 0.05 --rate-limit-rate 0.05
+    uv run python benchmarks/load_test.py --max-p95-ms 500 --min-throughput 20 --json results.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from aiohttp import web
+from fastmcp import Client
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "data", "meeting_contexts.txt")
+
+
+class UpstreamFaults:
+    """Latency and failure injection shared by the stub upstream APIs."""
+
+    def __init__(self, latency_ms: float, error_rate: float, rate_limit_rate: float, seed: int):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+
+    async def apply(self) -> Optional[web.Response]:
+        """Sleep for a jittered latency, then return an injected failure response, if any."""
+        self.requests += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.random.uniform(0.5, 1.5) * self.latency_ms / 1000)
+        roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            return web.json_response({"error": "Too Many Requests"}, status=429, headers={"Retry-After": "1"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            return web.json_response({"error": "Internal Server Error"}, status=500)
+        return None
+
+
+def trivia_payload(amount: int) -> dict:
+    """Build an opentdb response with `amount` distinct questions."""
+    return {
+        "response_code": 0,
+        "results": [
+            {
+                "category": "Science: Computers",
+                "type": "multiple",
+                "difficulty": "easy",
+                "question": f"Benchmark question {random.getrandbits(32)}?",
+                "correct_answer": "Python",
+                "incorrect_answers": ["Java", "C++", "Go"]
+            }
+            for _ in range(amount)
+        ]
+    }
+
+
+def fun_fact_payload() -> dict:
+    """Build a uselessfacts response."""
+    fact_id = f"{random.getrandbits(32):08x}"
+    return {
+        "id": fact_id,
+        "text": "Honey never spoils.",
+        "source": "benchmark",
+        "source_url": "http://127.0.0.1/",
+        "language": "en",
+        "permalink": f"http://127.0.0.1/facts/{fact_id}"
+    }
+
+
+def trending_payload() -> dict:
+    """Build an ossinsight trending repositories response."""
+    return {
+        "data": [
+            {"repo_name": f"bench/repo{i}", "description": f"Benchmark repository {i}", "language": "Python", "stars": 1000 - i}
+            for i in range(10)
+        ]
+    }
+
+
+def upstream_routes(faults: UpstreamFaults) -> list:
+    """Return aiohttp routes emulating the three upstream content APIs."""
+    async def opentdb(request):
+        failure = await faults.apply()
+        return failure or web.json_response(trivia_payload(int(request.query.get("amount", "1"))))
+
+    async def uselessfacts(request):
+        failure = await faults.apply()
+        return failure or web.json_response(fun_fact_payload())
+
+    async def ossinsight(request):
+        failure = await faults.apply()
+        return failure or web.json_response(trending_payload())
+
+    return [
+        web.get("/opentdb/api.php", opentdb),
+        web.get("/uselessfacts/random.json", uselessfacts),
+        web.get("/ossinsight/v1/trends/repos/", ossinsight),
+    ]
+
+
+def meeting_context_from(messages: list) -> str:
+    """Extract the meeting context from the planner's input message."""
+    for message in reversed(messages):
+        content = message.get("content")
+        if message.get("role") == "user" and isinstance(content, str) and "Prepare meeting notes for:" in content:
+            return content.split("Prepare meeting notes for:", 1)[1].split(".", 1)[0].strip()
+    return ""
+
+
+def fake_value(schema: dict, defs: dict, name: str, tasks: int, index: int = 1):
+    """Build a value matching a JSON schema, with `tasks` numbered items in each list."""
+    if "$ref" in schema:
+        schema = defs[schema["$ref"].rsplit("/", 1)[-1]]
+    if schema.get("type") == "object" or "properties" in schema:
+        return {field: fake_value(field_schema, defs, field, tasks, index) for field, field_schema in schema.get("properties", {}).items()}
+    if schema.get("type") == "array":
+        return [fake_value(schema.get("items", {}), defs, name, tasks, number) for number in range(1, tasks + 1)]
+    if schema.get("type") == "integer":
+        return index
+    return f"Benchmark {name}"
+
+
+def plan_reply(body: dict) -> dict:
+    """
+    Decide the fake model's reply to a chat completion request.
+
+    Returns:
+        {"content": str} or {"tool_calls": [(name, arguments), ...]}.
+    """
+    messages = body.get("messages", [])
+    tools = body.get("tools") or []
+    tool_choice = body.get("tool_choice")
+
+    # Packed prompts get one list item per numbered task
+    tasks = max(1, sum(str(message.get("content", "")).count("### Task ") for message in messages))
+
+    # Structured output via a JSON schema response format: answer with a matching object
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        schema = response_format["json_schema"]["schema"]
+        return {"content": json.dumps(fake_value(schema, schema.get("$defs", {}), "result", tasks))}
+
+    # Structured output via forced function calling: fill every schema field
+    if isinstance(tool_choice, dict):
+        name = tool_choice["function"]["name"]
+        schema = next(tool["function"].get("parameters", {}) for tool in tools if tool["function"]["name"] == name)
+        return {"tool_calls": [(name, fake_value(schema, schema.get("$defs", {}), name, tasks))]}
+
+    # Agent loop: call every tool first, then write the notes from their results
+    if tools and not any(message.get("role") == "tool" for message in messages):
+        context = meeting_context_from(messages)
+        return {"tool_calls": [(tool["function"]["name"], {"meeting_context": context}) for tool in tools]}
+
+    return {"content": "Meeting Notes for Host\n\nTech Trivia: benchmark trivia\n\nFun Fact: benchmark fact\n\nTrending Repositories: benchmark repos"}
+
+
+def completion(body: dict, reply: dict) -> dict:
+    """Build a non-streaming chat completion response."""
+    message = {"role": "assistant", "content": reply.get("content")}
+    if "tool_calls" in reply:
+        message["tool_calls"] = [
+            {"id": f"call_{index}", "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+            for index, (name, arguments) in enumerate(reply["tool_calls"])
+        ]
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "bench"),
+        "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if "tool_calls" in reply else "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    }
+
+
+def stream_chunks(body: dict, reply: dict) -> list:
+    """Build the chunks of a streaming chat completion response."""
+    def chunk(delta: dict, finish_reason: Optional[str] = None) -> dict:
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "bench"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+
+    if "tool_calls" in reply:
+        calls = [
+            {"index": index, "id": f"call_{index}", "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+            for index, (name, arguments) in enumerate(reply["tool_calls"])
+        ]
+        return [chunk({"role": "assistant", "content": None, "tool_calls": calls}), chunk({}, "tool_calls")]
+
+    words = reply["content"].split(" ")
+    parts = [word + (" " if index < len(words) - 1 else "") for index, word in enumerate(words)]
+    return [chunk({"role": "assistant", "content": ""})] + [chunk({"content": part}) for part in parts] + [chunk({}, "stop")]
+
+
+def llm_routes(latency_ms: float) -> list:
+    """Return aiohttp routes for a fake OpenAI-compatible chat completions endpoint."""
+    async def chat_completions(request):
+        body = await request.json()
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        reply = plan_reply(body)
+        if not body.get("stream"):
+            return web.json_response(completion(body, reply))
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for chunk in stream_chunks(body, reply):
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    return [web.post("/v1/chat/completions", chat_completions)]
+
+
+async def start_stubs(faults: UpstreamFaults, llm_latency_ms: float) -> tuple[web.AppRunner, str]:
+    """Start the upstream and LLM stubs on one local port and return the runner and base URL."""
+    app = web.Application()
+    app.add_routes(upstream_routes(faults) + llm_routes(llm_latency_ms))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(stub_url: str, port: int, transport: str, extra_env: dict, workdir: str) -> subprocess.Popen:
+    """Launch server.py against the stubs, isolated from any local .env file."""
+    env = dict(os.environ)
+    env.update({
+        "TECH_TRIVIA_API_URL": f"{stub_url}/opentdb/api.php?amount=1&category=18&type=multiple",
+        "FUN_FACTS_API_URL": f"{stub_url}/uselessfacts/random.json?language=en",
+        "GITHUB_TRENDING_URL": f"{stub_url}/ossinsight/v1/trends/repos/",
+        "LLM_API_BASE_URL": f"{stub_url}/v1",
+        "LLM_API_KEY": "bench-key",
+        "LLM_MODEL": "gpt-4o-mini",
+        "MCP_HOST": "127.0.0.1",
+        "MCP_PORT": str(port),
+        "MCP_TRANSPORT": transport,
+        "LOG_LEVEL": "WARNING",
+        "LANGFUSE_SECRET_KEY": "",
+        "LANGFUSE_PUBLIC_KEY": "",
+        "LANGFUSE_HOST": "",
+    })
+    env.update(extra_env)
+    return subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "server.py")],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+async def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 60.0):
+    """Wait until the server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server.py exited with status {process.returncode}")
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            await writer.wait_closed()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise TimeoutError("server.py did not start listening in time")
+
+
+def memory_kb(pid: int) -> dict:
+    """Return the current and peak resident memory of a process in KiB (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            fields = dict(line.split(":", 1) for line in status if ":" in line)
+        return {
+            "rss_kb": int(fields["VmRSS"].split()[0]),
+            "peak_rss_kb": int(fields["VmHWM"].split()[0])
+        }
+    except (OSError, KeyError):
+        return {"rss_kb": None, "peak_rss_kb": None}
+
+
+async def drive(url: str, contexts: list, mode: str, requests: int, concurrency: int) -> tuple[list, int, float]:
+    """
+    Send `requests` prepare_meeting calls from `concurrency` concurrent MCP sessions.
+
+    Returns:
+        Successful call latencies in ms, the error count and the wall time in seconds.
+    """
+    counter = itertools.count()
+    latencies: list = []
+    errors = 0
+
+    async def ignore_server_log(message):
+        pass
+
+    async def worker():
+        nonlocal errors
+        async with Client(url, timeout=600, log_handler=ignore_server_log) as client:
+            while (index := next(counter)) < requests:
+                arguments = {"meeting_context": contexts[index % len(contexts)], "mode": mode}
+                start = time.perf_counter()
+                try:
+                    await client.call_tool("prepare_meeting", arguments)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                except Exception:
+                    errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize(latencies: list, errors: int, wall_seconds: float, requests: int, memory: dict, upstream_requests: int) -> dict:
+    """Compute the load test report."""
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [latencies[0] if latencies else 0.0] * 99
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "throughput_rps": round(len(latencies) / wall_seconds, 2) if wall_seconds else 0.0,
+        "p50_ms": round(cuts[49], 1),
+        "p95_ms": round(cuts[94], 1),
+        "p99_ms": round(cuts[98], 1),
+        "mean_ms": round(statistics.mean(latencies), 1) if latencies else 0.0,
+        "upstream_requests": upstream_requests,
+        **memory
+    }
+
+
+def check_thresholds(report: dict, args: argparse.Namespace) -> list:
+    """Return a description of every breached threshold."""
+    breaches = []
+    if args.max_p95_ms is not None and report["p95_ms"] > args.max_p95_ms:
+        breaches.append(f"p95 {report['p95_ms']} ms > {args.max_p95_ms} ms")
+    if args.max_p99_ms is not None and report["p99_ms"] > args.max_p99_ms:
+        breaches.append(f"p99 {report['p99_ms']} ms > {args.max_p99_ms} ms")
+    if args.min_throughput is not None and report["throughput_rps"] < args.min_throughput:
+        breaches.append(f"throughput {report['throughput_rps']} req/s < {args.min_throughput} req/s")
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        breaches.append(f"error rate {report['error_rate']} > {args.max_error_rate}")
+    if args.max_rss_mb is not None and report["peak_rss_kb"] and report["peak_rss_kb"] / 1024 > args.max_rss_mb:
+        breaches.append(f"peak RSS {report['peak_rss_kb'] / 1024:.1f} MiB > {args.max_rss_mb} MiB")
+    return breaches
+
+
+def parse_env(pairs: list) -> dict:
+    """Parse repeated KEY=VALUE server settings."""
+    return dict(pair.split("=", 1) for pair in pairs)
+
+
+async def main(args: argparse.Namespace) -> int:
+    with open(args.corpus) as corpus:
+        contexts = [line.strip() for line in corpus if line.strip()]
+
+    faults = UpstreamFaults(args.upstream_latency_ms, args.error_rate, args.rate_limit_rate, args.seed)
+    runner, stub_url = await start_stubs(faults, args.llm_latency_ms)
+    port = free_port()
+    path = "/sse" if args.transport == "sse" else "/mcp"
+    url = f"http://127.0.0.1:{port}{path}"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        process = start_server(stub_url, port, args.transport, parse_env(args.server_env), workdir)
+        try:
+            await wait_for_port(port, process)
+            if args.warmup:
+                await drive(url, contexts, args.mode, args.warmup, min(args.warmup, args.concurrency))
+            upstream_before = faults.requests
+            latencies, errors, wall_seconds = await drive(url, contexts, args.mode, args.requests, args.concurrency)
+            report = summarize(
+                latencies, errors, wall_seconds, args.requests,
+                memory_kb(process.pid), faults.requests - upstream_before
+            )
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            await runner.cleanup()
+
+    print(f"mode={args.mode} transport={args.transport} requests={args.requests} concurrency={args.concurrency}")
+    print(f"throughput   {report['throughput_rps']:10.2f} req/s")
+    print(f"latency      p50={report['p50_ms']:.1f} ms  p95={report['p95_ms']:.1f} ms  p99={report['p99_ms']:.1f} ms  mean={report['mean_ms']:.1f} ms")
+    print(f"errors       {report['errors']} ({report['error_rate']:.2%})")
+    print(f"upstream     {report['upstream_requests']} stub API requests")
+    if report["rss_kb"] is not None:
+        print(f"server RSS   {report['rss_kb'] / 1024:.1f} MiB (peak {report['peak_rss_kb'] / 1024:.1f} MiB)")
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
+
+    breaches = check_thresholds(report, args)
+    for breach in breaches:
+        print(f"THRESHOLD BREACHED: {breach}")
+    return 1 if breaches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100, help="Measured prepare_meeting calls")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent MCP client sessions")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured calls before the run")
+    parser.add_argument("--mode", choices=["agent", "pipeline"], default="pipeline", help="Planner mode requested per call")
+    parser.add_argument("--transport", choices=["sse", "http"], default="sse", help="MCP transport of the server")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Meeting contexts, one per line, used round robin")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50.0, help="Mean stub API latency (jittered +/-50%%)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of stub API responses that are 500s")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of stub API responses that are 429s")
+    parser.add_argument("--llm-latency-ms", type=float, default=100.0, help="Fake LLM latency per completion")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for fault injection")
+    parser.add_argument("--server-env", action="append", default=[], metavar="KEY=VALUE", help="Extra server setting, repeatable")
+    parser.add_argument("--json", help="Write the report as JSON to this path")
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if p95 latency exceeds this")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if p99 latency exceeds this")
+    parser.add_argument("--min-throughput", type=float, help="Fail if throughput (req/s) is below this")
+    parser.add_argument("--max-error-rate", type=float, help="Fail if the share of failed calls exceeds this")
+    parser.add_argument("--max-rss-mb", type=float, help="Fail if the server's peak RSS exceeds this")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,79 @@
+"""
+Report the cache hit-rate uplift of meeting context canonicalization.
+
+Replays a corpus of meeting contexts in order against an exact-key cache and
+counts how many lookups would have been hits when keyed on:
+
+- the raw context string,
+- the lowercased, whitespace-trimmed context,
+- the canonical context from the MinHash/LSH canonicalizer.
+
+Runs offline and makes no LLM calls.
+
+Usage:
+    uv run python benchmarks/replay_context_cache.py --corpus benchmarks/data/meeting_contexts.txt
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Callable, List
+
+import structlog
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from app.core.context_normalizer import ContextCanonicalizer  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "meeting_contexts.txt")
+
+
+def load_corpus(path: str) -> List[str]:
+    """Load non-empty, non-comment lines from a corpus file."""
+    with open(path, encoding="utf-8") as corpus:
+        return [line.strip() for line in corpus if line.strip() and not line.startswith("#")]
+
+
+def replay(contexts: List[str], key: Callable[[str], str]) -> int:
+    """Replay contexts against an exact-key cache and return the number of hits."""
+    seen = set()
+    hits = 0
+    for context in contexts:
+        cache_key = key(context)
+        if cache_key in seen:
+            hits += 1
+        seen.add(cache_key)
+    return hits
+
+
+def main(corpus_path: str, threshold: float):
+    # Keep near-duplicate match logs out of the report
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    contexts = load_corpus(corpus_path)
+    canonicalizer = ContextCanonicalizer(threshold=threshold)
+
+    start = time.perf_counter()
+    canonical_hits = replay(contexts, canonicalizer.canonicalize)
+    per_context_us = (time.perf_counter() - start) / len(contexts) * 1_000_000
+
+    results = [
+        ("raw string", replay(contexts, lambda context: context)),
+        ("lowercased", replay(contexts, lambda context: context.strip().lower())),
+        ("canonicalized", canonical_hits),
+    ]
+
+    print(f"Replayed {len(contexts)} contexts ({len(canonicalizer)} canonical forms, {per_context_us:.1f} us/context)")
+    baseline = results[0][1] / len(contexts)
+    for name, hits in results:
+        rate = hits / len(contexts)
+        print(f"{name:<14} hits={hits:4d}  hit_rate={rate:6.1%}  uplift={rate - baseline:+6.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="File with one meeting context per line")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Near-duplicate Jaccard similarity threshold")
+    args = parser.parse_args()
+    main(args.corpus, args.threshold)
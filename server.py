@@ -1,55 +1,298 @@
 """
 MCP Server for Meeting Preparation Agent.
+
+With SERVER_LAZY_INIT the planner agent, and with it LangChain, the LLM
+clients and Langfuse, is only imported and built on first use or by a
+background warm-up once the server is starting, so the server listens
+sooner after a cold start.
+
+With MCP_WORKERS above one, uvicorn runs that many worker processes on
+MCP_PORT, each built by `create_worker_app` and serving stateless streamable
+HTTP, so any worker can answer any request. Each worker sends an upstream
+host its share of the host's rate limit, and notes warming requires the
+shared content store so that only one worker warms.
 """
 import asyncio
+import threading
+from contextlib import asynccontextmanager, nullcontext
 from fastmcp import FastMCP, Context
 from fastmcp.exceptions import ToolError
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
-from src.app.agents.meeting_planner_agent import MeetingPlannerAgent
+from src.app.agents.modes import PLANNER_MODES
+from src.app.core.admission import AdmissionRejected, admission_controller
+from src.app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, circuit_breakers
 from src.app.core.config import settings
+from src.app.core.deadline import deadline_scope
+from src.app.core.http_session import http_session_manager
+from src.app.core.progress import MCPProgressReporter
 from src.app.core.logging_config import setup_logging, get_logger
+from src.app.core.metrics import REQUEST_DURATION, metrics
 
 # Initialize logging first
 setup_logging()
 
 logger = get_logger(__name__)
 
-# Initialize the meeting planner agent
-planner_agent = MeetingPlannerAgent()
+# Serializes building the planner between synchronous callers and the warm-up
+# thread; the event loop never takes it, see `get_planner_agent_async`
+_init_lock = threading.Lock()
+_notes_warmer = None
+
+# Number of MCP sessions currently inside the server lifespan
+_active_sessions = 0
+
+
+def get_planner_agent():
+    """Return the shared meeting planner agent, building it on first use."""
+    agent = globals().get("planner_agent")
+    if agent is not None:
+        return agent
+    with _init_lock:
+        agent = globals().get("planner_agent")
+        if agent is None:
+            from src.app.agents.meeting_planner_agent import MeetingPlannerAgent
+            agent = MeetingPlannerAgent()
+            globals()["planner_agent"] = agent
+            logger.info("Meeting planner agent initialized")
+    return agent
+
+
+async def get_planner_agent_async():
+    """
+    Return the shared meeting planner agent without blocking the event loop.
+
+    If the agent is not built yet, for instance while the warm-up thread is
+    still importing LangChain, it is built or waited for on a worker thread,
+    so other requests keep being served meanwhile.
+    """
+    agent = globals().get("planner_agent")
+    if agent is not None:
+        return agent
+    return await asyncio.to_thread(get_planner_agent)
+
+
+def get_notes_warmer():
+    """Return the warmer that precomputes notes for recurring meeting contexts, building it on first use."""
+    global _notes_warmer
+    if _notes_warmer is None:
+        from src.app.core.notes_cache import MeetingNotesWarmer
+        _notes_warmer = MeetingNotesWarmer(
+            get_planner_agent(),
+            contexts=settings.MEETING_NOTES_WARM_CONTEXTS,
+            mode=settings.PLANNER_MODE,
+            interval=settings.MEETING_NOTES_WARM_INTERVAL,
+            spacing=settings.MEETING_NOTES_WARM_SPACING
+        )
+    return _notes_warmer
+
+
+def __getattr__(name: str):
+    """Build `planner_agent` and `notes_warmer` when first accessed as module attributes."""
+    if name == "planner_agent":
+        return get_planner_agent()
+    if name == "notes_warmer":
+        return get_notes_warmer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def start_warmup() -> threading.Thread:
+    """Build the planner agent on a background thread so the first request does not pay for it."""
+    thread = threading.Thread(target=get_planner_agent, name="planner-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+if not settings.SERVER_LAZY_INIT:
+    get_planner_agent()
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """
+    Manage shared resources for the lifetime of the server.
+    
+    FastMCP enters the lifespan once per client session, so shared resources
+    are only released when the last active session ends.
+    """
+    from src.app.services.fun_facts_service import FunFactsService
+    from src.app.services.tech_trivia_service import TechTriviaService
+    
+    global _active_sessions
+    _active_sessions += 1
+    if _active_sessions == 1:
+        TechTriviaService.prime_pool()
+        FunFactsService.prime_reservoir()
+        if settings.MEETING_NOTES_WARMING_ENABLED:
+            # Build the agent off the loop first; the warmer then finds it ready
+            await get_planner_agent_async()
+            get_notes_warmer().start()
+    try:
+        yield {}
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            if _notes_warmer is not None:
+                await _notes_warmer.stop()
+            await http_session_manager.close()
+
 
 # Initialize FastMCP server
 mcp = FastMCP(
     "Meeting Preparation Agent",
-    mask_error_details=settings.MCP_MASK_ERROR_DETAILS
+    mask_error_details=settings.MCP_MASK_ERROR_DETAILS,
+    lifespan=server_lifespan
 )
 
 logger.info("MCP server initialized with LangChain-based planner agent")
 
+ADMISSION_ACTIVE = metrics.gauge("meeting_agent_admission_active", "prepare_meeting requests currently running.")
+ADMISSION_QUEUE_DEPTH = metrics.gauge("meeting_agent_admission_queue_depth", "prepare_meeting requests waiting for a slot.")
+CIRCUIT_STATE = metrics.gauge(
+    "meeting_agent_circuit_state",
+    "Upstream circuit breaker state: 0 closed, 1 half-open, 2 open.",
+    ("endpoint",)
+)
+_CIRCUIT_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def _collect_server_metrics():
+    """Set the admission and circuit breaker gauges from their live state."""
+    stats = admission_controller.stats()
+    ADMISSION_ACTIVE.set(stats["active"])
+    ADMISSION_QUEUE_DEPTH.set(stats["queue_depth"])
+    for endpoint, state in circuit_breakers.states().items():
+        CIRCUIT_STATE.set(_CIRCUIT_STATE_VALUES[state], endpoint=endpoint)
+
+
+metrics.on_collect(_collect_server_metrics)
+
+
+if settings.METRICS_ENABLED:
+    @mcp.custom_route(settings.METRICS_PATH, methods=["GET"])
+    async def metrics_endpoint(request: Request) -> PlainTextResponse:
+        """Serve per-stage latency histograms and counters in the Prometheus text format."""
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+def _client_key(ctx: Context) -> str:
+    """Identify the calling client for per-client admission limits."""
+    try:
+        return str(ctx.client_id or ctx.session_id)
+    except Exception:
+        return "anonymous"
+
+
+def _admit(ctx: Context, deadline: float, observe: bool = True):
+    """Return the admission context for a prepare_meeting call, or a no-op when disabled."""
+    if not settings.ADMISSION_CONTROL_ENABLED:
+        return nullcontext()
+    return admission_controller.admit(_client_key(ctx), deadline, observe=observe)
+
+
+async def _plan_admitted(ctx: Context, deadline: float, meeting_context: str, mode: str, listener):
+    """
+    Plan the meeting, taking an admission slot only if this call starts a new planning run.
+
+    Calls answered from the notes cache or joining an identical run in flight
+    take no slot, so a burst of duplicates never fills the server.
+    """
+    planner = await get_planner_agent_async()
+    return await planner.plan_meeting(
+        meeting_context,
+        mode=mode or None,
+        listener=listener,
+        admission=lambda: _admit(ctx, deadline)
+    )
+
+
+def create_worker_app():
+    """
+    Build the ASGI app run by each worker process in multi-worker mode.
+
+    Stateless streamable HTTP enters the MCP lifespan once per request, so the
+    app's own lifespan holds the shared resources for the life of the worker
+    and per-request exits never close them.
+
+    Returns:
+        A Starlette app serving the MCP server over stateless streamable HTTP.
+    """
+    app = mcp.http_app(transport="http", stateless_http=True)
+    transport_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def worker_lifespan(app):
+        if settings.SERVER_LAZY_INIT and settings.SERVER_WARMUP_ENABLED:
+            start_warmup()
+        async with transport_lifespan(app), server_lifespan(mcp):
+            yield
+
+    app.router.lifespan_context = worker_lifespan
+    return app
+
+
+def run_workers():
+    """Serve MCP_PORT from MCP_WORKERS processes, each running `create_worker_app`."""
+    import uvicorn
+
+    if settings.MCP_TRANSPORT not in ("http", "streamable-http"):
+        raise ValueError(
+            f"MCP_WORKERS={settings.MCP_WORKERS} requires MCP_TRANSPORT=http; "
+            f"{settings.MCP_TRANSPORT} sessions cannot be shared between worker processes"
+        )
+    if settings.MEETING_NOTES_WARMING_ENABLED and not settings.SHARED_CONTENT_ENABLED:
+        raise ValueError(
+            f"MCP_WORKERS={settings.MCP_WORKERS} with MEETING_NOTES_WARMING_ENABLED requires "
+            "SHARED_CONTENT_ENABLED, so that only one worker warms notes"
+        )
+    uvicorn.run(
+        "server:create_worker_app",
+        factory=True,
+        host=settings.MCP_HOST,
+        port=settings.MCP_PORT,
+        workers=settings.MCP_WORKERS,
+        log_level="info",
+        lifespan="on",
+        # Let in-flight tool calls finish on shutdown
+        timeout_graceful_shutdown=max(settings.MCP_TOOL_TIMEOUT, settings.MEETING_BATCH_TIMEOUT)
+    )
+
 
 @mcp.tool
-async def prepare_meeting(ctx: Context, meeting_context: str = "") -> str:
+async def prepare_meeting(ctx: Context, meeting_context: str = "", mode: str = "", stream: bool = False) -> str:
     """
     Prepare comprehensive meeting notes with trivia, fun facts, and trending repositories.
     
     Args:
         ctx: MCP context for logging and LLM sampling
         meeting_context: Description of the meeting (type, audience, topic, etc.)
+        mode: "agent" or "pipeline" execution, defaults to the server's PLANNER_MODE
+        stream: Send progress notifications and each section as it becomes ready,
+            then the notes as they are generated, before returning the final notes
     
     Returns:
         Formatted meeting notes ready for the host
     """
+    if mode and mode not in PLANNER_MODES:
+        raise ToolError(f"Unsupported mode '{mode}'. Use one of: {', '.join(PLANNER_MODES)}.")
+    
     start_time = asyncio.get_event_loop().time()
     
     try:
-        ctx.info(f"Starting meeting preparation for: {meeting_context or 'general meeting'}")
+        await ctx.info(f"Starting meeting preparation for: {meeting_context or 'general meeting'}")
+        listener = MCPProgressReporter(ctx) if stream else None
         
-        # Add timeout to the tool execution
-        result = await asyncio.wait_for(
-            planner_agent.plan_meeting(meeting_context),
-            timeout=settings.MCP_TOOL_TIMEOUT
-        )
+        # Every layer below caps its own timeouts to this request deadline,
+        # which also covers any wait for an admission slot
+        with deadline_scope(settings.MCP_TOOL_TIMEOUT) as deadline:
+            result = await asyncio.wait_for(
+                _plan_admitted(ctx, deadline, meeting_context, mode, listener),
+                timeout=settings.MCP_TOOL_TIMEOUT
+            )
         
         execution_time = asyncio.get_event_loop().time() - start_time
+        REQUEST_DURATION.observe(execution_time, mode=mode or settings.PLANNER_MODE, outcome="success")
         logger.info(
             "Successfully prepared meeting notes",
             execution_time_seconds=round(execution_time, 2),
@@ -58,36 +301,136 @@ async def prepare_meeting(ctx: Context, meeting_context: str = "") -> str:
         
         return result
         
+    except AdmissionRejected as e:
+        REQUEST_DURATION.observe(
+            asyncio.get_event_loop().time() - start_time, mode=mode or settings.PLANNER_MODE, outcome="rejected"
+        )
+        logger.warning("Meeting preparation rejected", reason=e.reason, context=meeting_context)
+        await ctx.error(f"Meeting preparation rejected: {e}")
+        raise ToolError(f"Server is busy: {e}. Please try again later.") from e
+        
     except asyncio.TimeoutError:
         execution_time = asyncio.get_event_loop().time() - start_time
+        REQUEST_DURATION.observe(execution_time, mode=mode or settings.PLANNER_MODE, outcome="timeout")
         logger.error(
             "Meeting preparation timed out",
             execution_time_seconds=round(execution_time, 2),
             timeout_seconds=settings.MCP_TOOL_TIMEOUT,
             context=meeting_context
         )
-        ctx.error("Meeting preparation timed out")
+        await ctx.error("Meeting preparation timed out")
         raise ToolError("Meeting preparation timed out. Please try again.")
         
     except Exception as e:
         execution_time = asyncio.get_event_loop().time() - start_time
+        REQUEST_DURATION.observe(execution_time, mode=mode or settings.PLANNER_MODE, outcome="error")
         logger.error(
             "Error in meeting preparation",
             execution_time_seconds=round(execution_time, 2),
             error=str(e),
             context=meeting_context
         )
-        ctx.error("Failed to prepare meeting notes")
+        await ctx.error("Failed to prepare meeting notes")
         raise ToolError("Unable to prepare meeting notes at this time.")
 
 
-if __name__ == "__main__":
-    logger.info("Starting MCP server", host=settings.MCP_HOST, port=settings.MCP_PORT, transport=settings.MCP_TRANSPORT)
+@mcp.tool
+async def prepare_meetings(ctx: Context, contexts: list[str]) -> list[str]:
+    """
+    Prepare meeting notes for many meetings in one call, e.g. a whole day's calendar.
     
-    # Run the MCP server
-    mcp.run(
-        transport=settings.MCP_TRANSPORT,
+    Duplicate contexts are planned once, trivia and trending repositories are
+    fetched once for the batch, and meetings are enhanced and formatted with
+    bounded parallelism.
+    
+    Args:
+        ctx: MCP context for logging
+        contexts: Descriptions of the meetings (type, audience, topic, etc.)
+    
+    Returns:
+        Formatted meeting notes for each context, in the order given
+    """
+    if len(contexts) > settings.MEETING_BATCH_MAX_CONTEXTS:
+        raise ToolError(f"Too many meetings: at most {settings.MEETING_BATCH_MAX_CONTEXTS} contexts per call.")
+    if not contexts:
+        return []
+    
+    start_time = asyncio.get_event_loop().time()
+    
+    try:
+        await ctx.info(f"Starting batch meeting preparation for {len(contexts)} meetings")
+        
+        # The whole batch takes one admission slot and shares one deadline; its
+        # run time is not typical of a prepare_meeting call, so it is not observed
+        with deadline_scope(settings.MEETING_BATCH_TIMEOUT) as deadline:
+            async with _admit(ctx, deadline, observe=False):
+                planner = await get_planner_agent_async()
+                results = await asyncio.wait_for(
+                    planner.plan_meetings(contexts),
+                    timeout=settings.MEETING_BATCH_TIMEOUT
+                )
+        
+        execution_time = asyncio.get_event_loop().time() - start_time
+        REQUEST_DURATION.observe(execution_time, mode="batch", outcome="success")
+        logger.info(
+            "Successfully prepared batch meeting notes",
+            execution_time_seconds=round(execution_time, 2),
+            meetings=len(contexts)
+        )
+        
+        return results
+        
+    except AdmissionRejected as e:
+        REQUEST_DURATION.observe(asyncio.get_event_loop().time() - start_time, mode="batch", outcome="rejected")
+        logger.warning("Batch meeting preparation rejected", reason=e.reason, meetings=len(contexts))
+        await ctx.error(f"Batch meeting preparation rejected: {e}")
+        raise ToolError(f"Server is busy: {e}. Please try again later.") from e
+        
+    except asyncio.TimeoutError:
+        execution_time = asyncio.get_event_loop().time() - start_time
+        REQUEST_DURATION.observe(execution_time, mode="batch", outcome="timeout")
+        logger.error(
+            "Batch meeting preparation timed out",
+            execution_time_seconds=round(execution_time, 2),
+            timeout_seconds=settings.MEETING_BATCH_TIMEOUT,
+            meetings=len(contexts)
+        )
+        await ctx.error("Batch meeting preparation timed out")
+        raise ToolError("Batch meeting preparation timed out. Please try again with fewer meetings.")
+        
+    except Exception as e:
+        execution_time = asyncio.get_event_loop().time() - start_time
+        REQUEST_DURATION.observe(execution_time, mode="batch", outcome="error")
+        logger.error(
+            "Error in batch meeting preparation",
+            execution_time_seconds=round(execution_time, 2),
+            error=str(e),
+            meetings=len(contexts)
+        )
+        await ctx.error("Failed to prepare batch meeting notes")
+        raise ToolError("Unable to prepare meeting notes at this time.")
+
+
+if __name__ == "__main__":
+    logger.info(
+        "Starting MCP server",
         host=settings.MCP_HOST,
         port=settings.MCP_PORT,
-        log_level=settings.MCP_LOG_LEVEL if hasattr(settings, 'MCP_LOG_LEVEL') else "INFO"
-    )
\ No newline at end of file
+        transport=settings.MCP_TRANSPORT,
+        workers=settings.MCP_WORKERS
+    )
+    
+    if settings.MCP_WORKERS > 1:
+        # Each worker starts its own warm-up in its lifespan
+        run_workers()
+    else:
+        if settings.SERVER_LAZY_INIT and settings.SERVER_WARMUP_ENABLED:
+            start_warmup()
+        
+        # Run the MCP server
+        mcp.run(
+            transport=settings.MCP_TRANSPORT,
+            host=settings.MCP_HOST,
+            port=settings.MCP_PORT,
+            log_level=settings.MCP_LOG_LEVEL if hasattr(settings, 'MCP_LOG_LEVEL') else "INFO"
+        )
\ No newline at end of file
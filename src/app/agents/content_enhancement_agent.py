@@ -0,0 +1,108 @@
+"""
+An agent responsible for enhancing all meeting content in a single LLM request.
+"""
+import asyncio
+from typing import List, Optional
+
+from ..core.config import settings
+from ..core.context_normalizer import canonicalize_context
+from ..core.deadline import budget
+from ..core.llm_gateway import LLMGateway, get_llm_gateway
+from ..core.logging_config import get_logger
+from ..core.metrics import llm_prompt
+from ..prompts.agent_prompts import COMBINED_ENHANCEMENT_PROMPT
+from ..schemas.meeting_content import MeetingContent
+
+logger = get_logger(__name__)
+
+
+class ContentEnhancementAgent:
+    """
+    Enhances trivia, fun fact and trending repositories together.
+
+    Sends one structured-output request instead of one request per section, so
+    the meeting context is sent once and only one request overhead is paid.
+    """
+
+    def __init__(self, llm_gateway: Optional[LLMGateway] = None):
+        self.llm_gateway = llm_gateway or get_llm_gateway()
+
+    async def enhance(self, content: MeetingContent, meeting_context: str) -> MeetingContent:
+        """
+        Enhances all sections for the meeting context.
+
+        Args:
+            content: The basic section texts
+            meeting_context: Context about the meeting (type, audience, etc.)
+
+        Returns:
+            The enhanced sections, or the original content if enhancement fails.
+        """
+        start_time = asyncio.get_event_loop().time()
+        try:
+            prompt = self._prompt(content, meeting_context)
+            # Near-duplicate phrasings share cached enhancements
+            cache_prompt = self._prompt(content, canonicalize_context(meeting_context))
+            with llm_prompt("content_enhancement"):
+                enhanced = await asyncio.wait_for(
+                    self.llm_gateway.get_structured_response(prompt, MeetingContent, cache_prompt=cache_prompt),
+                    timeout=budget(settings.LLM_REQUEST_TIMEOUT)
+                )
+            logger.info(
+                "Combined content enhancement completed",
+                execution_time_seconds=round(asyncio.get_event_loop().time() - start_time, 2)
+            )
+            return enhanced
+        except Exception as e:
+            logger.warning("Combined content enhancement failed, using basic content", error=str(e))
+            return content
+
+    async def enhance_batch(self, contents: List[MeetingContent], meeting_contexts: List[str]) -> List[MeetingContent]:
+        """
+        Enhances the sections of many meetings, packing several meetings into each LLM request.
+
+        Args:
+            contents: The basic section texts of each meeting
+            meeting_contexts: The context of each meeting; meetings without one are left as is
+
+        Returns:
+            The enhanced sections of each meeting, or its original content where enhancement failed.
+        """
+        start_time = asyncio.get_event_loop().time()
+        indices = [i for i, meeting_context in enumerate(meeting_contexts) if meeting_context]
+        prompts = [self._prompt(contents[i], meeting_contexts[i]) for i in indices]
+        cache_prompts = [self._prompt(contents[i], canonicalize_context(meeting_contexts[i])) for i in indices]
+        enhanced = list(contents)
+        try:
+            with llm_prompt("content_enhancement"):
+                responses = await self.llm_gateway.get_structured_responses(
+                    prompts,
+                    MeetingContent,
+                    max_concurrency=settings.MEETING_BATCH_CONCURRENCY,
+                    cache_prompts=cache_prompts,
+                    reserve=settings.MEETING_BATCH_FALLBACK_RESERVE
+                )
+        except Exception as e:
+            logger.warning("Batch content enhancement failed, using basic content", error=str(e))
+            return enhanced
+
+        for i, response in zip(indices, responses):
+            if response is not None:
+                enhanced[i] = response
+        logger.info(
+            "Batch content enhancement completed",
+            meetings=len(indices),
+            enhanced=sum(response is not None for response in responses),
+            execution_time_seconds=round(asyncio.get_event_loop().time() - start_time, 2)
+        )
+        return enhanced
+
+    @staticmethod
+    def _prompt(content: MeetingContent, meeting_context: str) -> str:
+        """Build the enhancement prompt for one meeting."""
+        return COMBINED_ENHANCEMENT_PROMPT.format(
+            meeting_context=meeting_context,
+            trivia=content.trivia,
+            fun_fact=content.fun_fact,
+            trending_repos=content.trending_repos
+        )
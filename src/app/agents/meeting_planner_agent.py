@@ -3,14 +3,28 @@ LangChain-based meeting planner agent that uses agent tools for intelligent orch
 This agent provides context-aware improvement capabilities.
 """
 import asyncio
+from contextlib import nullcontext
+from typing import AsyncContextManager, Callable, Dict, List, Optional, Tuple
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 
 from ..tools.agent_tools import tech_trivia_agent, fun_facts_agent, github_trending_agent
-from ..core.llm_gateway import LLMGateway
+from .content_enhancement_agent import ContentEnhancementAgent
+from .modes import AGENT_MODE, PIPELINE_MODE, PLANNER_MODES
+from ..core.llm_gateway import LLMGateway, LLMMetricsCallback, get_llm_gateway
 from ..core.logging_config import setup_logging, get_logger
+from ..core.metrics import (
+    AGENT_ITERATIONS, FORMATTER_DURATION, PLANNER_FALLBACKS, PLANNING_DURATION, llm_prompt
+)
+from ..core.notes_cache import MeetingNotesCache
 from ..core.config import settings
+from ..core.context_normalizer import canonicalize_context
+from ..core.deadline import budget, deadline_scope
+from ..core.progress import BroadcastListener, PlanningListener, SECTION_TITLES, notify
+from ..core.single_flight import SingleFlight
 from ..formatters.meeting_notes_formatter import MeetingNotesFormatter
-from ..prompts.agent_prompts import MEETING_PLANNER_PROMPT
+from ..formatters.repository_formatter import RepositoryFormatter
+from ..prompts.agent_prompts import MEETING_PLANNER_PROMPT, MEETING_NOTES_FORMAT_PROMPT
+from ..schemas.meeting_content import MeetingContent
 
 # Initialize logging
 setup_logging()
@@ -24,8 +38,15 @@ class MeetingPlannerAgent:
     This agent provides intelligent orchestration with context-aware improvement capabilities.
     """
     
-    def __init__(self):
-        self.llm_gateway = LLMGateway()
+    def __init__(self, llm_gateway: Optional[LLMGateway] = None):
+        # Share the gateway (and its pooled HTTP client) with the agent tools
+        self.llm_gateway = llm_gateway or get_llm_gateway()
+        self.content_enhancer = ContentEnhancementAgent(self.llm_gateway)
+        # Concurrent identical requests share one planning run
+        self._flight = SingleFlight(timeout=settings.PLANNER_SINGLE_FLIGHT_TIMEOUT)
+        self._broadcasts: Dict[Tuple, BroadcastListener] = {}
+        # Finished notes for recurring contexts, kept fresh by a MeetingNotesWarmer
+        self.notes_cache = MeetingNotesCache(ttl=settings.MEETING_NOTES_CACHE_TTL)
         self.tools = [
             tech_trivia_agent,
             fun_facts_agent, 
@@ -40,12 +61,15 @@ class MeetingPlannerAgent:
             prompt=MEETING_PLANNER_PROMPT
         )
         
-        # Create the executor
+        # Create the executor; intermediate steps are returned to count agent iterations
         self.agent_executor = AgentExecutor(
             agent=self.agent,
             tools=self.tools,
-            verbose=True
+            verbose=True,
+            return_intermediate_steps=True
         )
+        # Times the agent's own LLM calls, which bypass the gateway
+        self._llm_metrics = LLMMetricsCallback(prompt="agent")
     
     def _log_execution_time(self, start_time: float, success: bool, **kwargs):
         """Log execution time with consistent formatting."""
@@ -67,60 +91,400 @@ class MeetingPlannerAgent:
         
         return execution_time_rounded
     
-    async def plan_meeting(self, meeting_context: str = "") -> str:
+    @staticmethod
+    def _observe_planning(start_time: float, mode: str, outcome: str):
+        """Record how long planning took before it succeeded or gave up."""
+        PLANNING_DURATION.observe(asyncio.get_event_loop().time() - start_time, mode=mode, outcome=outcome)
+    
+    async def plan_meeting(
+        self,
+        meeting_context: str = "",
+        mode: Optional[str] = None,
+        listener: Optional[PlanningListener] = None,
+        refresh: bool = False,
+        admission: Optional[Callable[[], AsyncContextManager]] = None
+    ) -> str:
         """
-        Plan a meeting using the LangChain agent framework.
+        Plan a meeting using the configured execution mode.
+        
+        In "agent" mode a LangChain tool-calling agent decides which tools to run
+        and formats the notes. In "pipeline" mode all agent tools run concurrently
+        and the notes are formatted in a single step, skipping the agent's
+        sequential LLM round-trips.
+        
+        The canonical form of the context keys the notes cache and single
+        flight, so near-duplicate phrasings share notes, while prompts and
+        tools get the context as the caller wrote it. Concurrent calls with
+        the same canonical context and mode share one planning run. A caller
+        that is cancelled or times out never cancels the shared run;
+        streaming callers joining late first receive the sections already
+        reported.
+        
+        Notes precomputed for a recurring context are returned straight from
+        the notes cache unless `refresh` is set.
+        
+        Only a caller that starts a new planning run enters `admission`, and
+        holds it for the run. Callers served from the notes cache or joining
+        a run in flight take no admission slot, and share the run's outcome,
+        including a rejection.
         
         Args:
             meeting_context: Context about the meeting (type, audience, etc.)
+            mode: "agent" or "pipeline", defaults to PLANNER_MODE
+            listener: Optional listener notified as sections become ready and
+                as the formatted notes stream in
+            refresh: Plan afresh even if precomputed notes are cached
+            admission: Optional factory of the context manager holding an
+                admission slot for a new planning run
+        
+        Raises:
+            ValueError: If the mode is not supported
+        """
+        mode = mode or settings.PLANNER_MODE
+        if mode not in PLANNER_MODES:
+            raise ValueError(f"Unsupported planner mode: {mode}")
+        
+        # Near-duplicate phrasings share cached notes and planning runs
+        cache_context = canonicalize_context(meeting_context)
+        
+        if not refresh:
+            cached = self.notes_cache.get(mode, cache_context)
+            if cached is not None:
+                logger.info("Serving precomputed meeting notes", context=meeting_context, mode=mode)
+                await notify(listener, "on_complete", cached)
+                return cached
+        
+        if not settings.PLANNER_SINGLE_FLIGHT_ENABLED:
+            async with admission() if admission else nullcontext():
+                return await self._plan_meeting(meeting_context, mode, listener)
+        
+        # Streaming and non-streaming requests coalesce separately
+        key = (mode, cache_context, listener is not None)
+        if self._flight.in_flight(key):
+            logger.info("Joining in-flight meeting planning", context=meeting_context, mode=mode)
+        elif listener is not None:
+            self._broadcasts[key] = BroadcastListener()
+        
+        broadcast = self._broadcasts.get(key) if listener is not None else None
+        task = self._flight.start(key, lambda: self._plan_shared(key, meeting_context, mode, broadcast, admission))
+        if broadcast is None:
+            return await self._flight.wait(task)
+        
+        await broadcast.subscribe(listener)
+        try:
+            return await self._flight.wait(task)
+        finally:
+            broadcast.unsubscribe(listener)
+    
+    async def _plan_shared(
+        self,
+        key: Tuple,
+        meeting_context: str,
+        mode: str,
+        broadcast: Optional[BroadcastListener],
+        admission: Optional[Callable[[], AsyncContextManager]] = None
+    ) -> str:
+        """Run one planning shared by every caller with the same key, holding the first caller's admission slot."""
+        try:
+            async with admission() if admission else nullcontext():
+                return await self._plan_meeting(meeting_context, mode, broadcast)
+        finally:
+            if self._broadcasts.get(key) is broadcast:
+                self._broadcasts.pop(key, None)
+    
+    async def _plan_meeting(self, meeting_context: str, mode: str, listener: Optional[PlanningListener]) -> str:
+        """
+        Plan a meeting in the given mode, falling back to direct service calls on failure.
+        
+        Planning gets the smaller of AGENT_EXECUTOR_TIMEOUT and the request's
+        remaining time less PLANNER_FALLBACK_RESERVE, so the fallback still has
+        time to run before the request deadline.
         """
         start_time = asyncio.get_event_loop().time()
+        timeout = budget(settings.AGENT_EXECUTOR_TIMEOUT, reserve=settings.PLANNER_FALLBACK_RESERVE)
         
         try:
-            logger.info(
-                "Starting LangChain-based meeting planning", 
-                context=meeting_context,
-                timeout_seconds=settings.AGENT_EXECUTOR_TIMEOUT
-            )
-            
-            # Prepare input with context for agent tools
-            if meeting_context:
-                input_text = f"Prepare meeting notes for: {meeting_context}. Use the agent tools to make content more relevant and engaging."
+            if mode == PIPELINE_MODE:
+                planning = self._pipeline_plan_meeting(meeting_context, listener)
             else:
-                input_text = f"Prepare meeting notes for: a general tech meeting"
-            
-            logger.info("Executing agent with input", input_text=input_text[:100] + "..." if len(input_text) > 100 else input_text)
+                planning = self._agent_plan_meeting(meeting_context, listener)
             
-            # Add timeout to the agent execution
-            result = await asyncio.wait_for(
-                self.agent_executor.ainvoke({
-                    "input": input_text,
-                    "chat_history": []
-                }),
-                timeout=settings.AGENT_EXECUTOR_TIMEOUT
-            )
+            # Add timeout to the planning execution
+            with deadline_scope(timeout):
+                output = await asyncio.wait_for(planning, timeout=timeout)
             
-            self._log_execution_time(start_time, True)
-            logger.info("Agent execution completed successfully", output_length=len(result.get("output", "")))
-            return result["output"]
+            self._log_execution_time(start_time, True, mode=mode)
+            self._observe_planning(start_time, mode, "success")
+            self.notes_cache.store(mode, canonicalize_context(meeting_context), output)
             
         except asyncio.TimeoutError:
             self._log_execution_time(
                 start_time, False,
-                timeout_seconds=settings.AGENT_EXECUTOR_TIMEOUT,
-                context=meeting_context
+                timeout_seconds=round(timeout, 2),
+                context=meeting_context,
+                mode=mode
             )
-            logger.warning("Agent execution timed out, falling back to direct service calls")
-            return await self._fallback_plan_meeting()
+            self._observe_planning(start_time, mode, "timeout")
+            PLANNER_FALLBACKS.inc(reason="timeout")
+            logger.warning("Meeting planning timed out, falling back to direct service calls", mode=mode)
+            output = await self._fallback_plan_meeting()
             
         except Exception as e:
             self._log_execution_time(
                 start_time, False,
                 error=str(e),
-                context=meeting_context
+                context=meeting_context,
+                mode=mode
+            )
+            self._observe_planning(start_time, mode, "error")
+            PLANNER_FALLBACKS.inc(reason="error")
+            logger.warning("Meeting planning failed, falling back to direct service calls", error=str(e), mode=mode)
+            output = await self._fallback_plan_meeting()
+        
+        await notify(listener, "on_complete", output)
+        return output
+    
+    async def _agent_plan_meeting(self, meeting_context: str, listener: Optional[PlanningListener] = None) -> str:
+        """Plan a meeting with the LangChain AgentExecutor loop."""
+        logger.info(
+            "Starting LangChain-based meeting planning", 
+            context=meeting_context,
+            timeout_seconds=settings.AGENT_EXECUTOR_TIMEOUT
+        )
+        
+        # Prepare input with context for agent tools
+        if meeting_context:
+            input_text = f"Prepare meeting notes for: {meeting_context}. Use the agent tools to make content more relevant and engaging."
+        else:
+            input_text = f"Prepare meeting notes for: a general tech meeting"
+        
+        logger.info("Executing agent with input", input_text=input_text[:100] + "..." if len(input_text) > 100 else input_text)
+        
+        agent_input = {
+            "input": input_text,
+            "chat_history": []
+        }
+        config = {"callbacks": [self._llm_metrics]}
+        with llm_prompt("agent"):
+            if listener is None:
+                result = await self.agent_executor.ainvoke(agent_input, config=config)
+                AGENT_ITERATIONS.observe(len(result.get("intermediate_steps", [])))
+            else:
+                result = await self._stream_agent(agent_input, listener, config)
+        
+        logger.info("Agent execution completed successfully", output_length=len(result.get("output", "")))
+        return result["output"]
+    
+    async def _stream_agent(self, agent_input: dict, listener: PlanningListener, config: Optional[dict] = None) -> dict:
+        """
+        Run the agent with event streaming, reporting each tool result as a
+        section and streaming the agent's own answer token by token.
+        
+        Tokens from LLM calls made inside the tools are not part of the notes
+        and are skipped.
+        """
+        tool_sections = {tool.name: section for section, tool in zip(SECTION_TITLES, self.tools)}
+        tool_runs = set()
+        result = {}
+        iterations = 0
+        async for event in self.agent_executor.astream_events(agent_input, config=config, version="v2"):
+            kind = event["event"]
+            parent_ids = event.get("parent_ids") or []
+            if kind == "on_tool_start":
+                tool_runs.add(event["run_id"])
+            elif kind == "on_tool_end":
+                iterations += 1
+                section = tool_sections.get(event["name"])
+                if section:
+                    await notify(listener, "on_section", section, str(event["data"].get("output", "")))
+            elif kind == "on_chat_model_stream" and not tool_runs.intersection(parent_ids):
+                text = event["data"]["chunk"].content
+                if isinstance(text, str) and text:
+                    await notify(listener, "on_token", text)
+            elif kind == "on_chain_end" and not parent_ids:
+                result = event["data"].get("output") or {}
+        AGENT_ITERATIONS.observe(iterations)
+        return result
+    
+    async def _pipeline_plan_meeting(self, meeting_context: str, listener: Optional[PlanningListener] = None) -> str:
+        """Run all agent tools concurrently, then format the notes in one step."""
+        logger.info(
+            "Starting pipeline meeting planning",
+            context=meeting_context,
+            llm_formatting=settings.PIPELINE_LLM_FORMATTING,
+            combined_enhancement=settings.PIPELINE_COMBINED_ENHANCEMENT
+        )
+        
+        async def run_tool(section: str, tool) -> str:
+            # Agent tools handle their own errors and always return section text
+            content = await tool.ainvoke({"meeting_context": meeting_context})
+            await notify(listener, "on_section", section, content)
+            return content
+        
+        trivia, fun_fact, trending_repos = await asyncio.gather(*(
+            run_tool(section, tool)
+            for section, tool in zip(SECTION_TITLES, self.tools)
+        ))
+        content = MeetingContent(trivia=trivia, fun_fact=fun_fact, trending_repos=trending_repos)
+        
+        # Enhance every section in one request rather than one request per tool
+        if settings.PIPELINE_COMBINED_ENHANCEMENT and meeting_context:
+            content = await self.content_enhancer.enhance(content, meeting_context)
+        
+        return await self._format_notes(meeting_context, content, listener)
+    
+    async def _format_notes(
+        self,
+        meeting_context: str,
+        content: MeetingContent,
+        listener: Optional[PlanningListener] = None
+    ) -> str:
+        """Format the sections with one LLM call, or the template formatter if that is disabled or fails."""
+        if settings.PIPELINE_LLM_FORMATTING:
+            try:
+                prompt = self._format_prompt(meeting_context, content)
+                cache_prompt = self._format_prompt(canonicalize_context(meeting_context), content)
+                with FORMATTER_DURATION.time(formatter="llm"), llm_prompt("meeting_notes_format"):
+                    if listener is None:
+                        formatting = self.llm_gateway.get_string_response(prompt, cache_prompt=cache_prompt)
+                    else:
+                        formatting = self._stream_formatting(prompt, listener, cache_prompt)
+                    output = await asyncio.wait_for(formatting, timeout=budget(settings.LLM_REQUEST_TIMEOUT))
+                logger.info("Pipeline formatting completed", output_length=len(output))
+                return output
+            except Exception as e:
+                logger.warning("LLM formatting failed, using template formatter", error=str(e))
+        
+        with FORMATTER_DURATION.time(formatter="template"):
+            return MeetingNotesFormatter.format_meeting_sections(
+                content.trivia, content.fun_fact, content.trending_repos
+            )
+    
+    @staticmethod
+    def _format_prompt(meeting_context: str, content: MeetingContent) -> str:
+        """Build the LLM formatting prompt for one meeting."""
+        return MEETING_NOTES_FORMAT_PROMPT.format(
+            meeting_context=meeting_context or "a general tech meeting",
+            trivia=content.trivia,
+            fun_fact=content.fun_fact,
+            trending_repos=content.trending_repos
+        )
+    
+    async def plan_meetings(self, meeting_contexts: List[str]) -> List[str]:
+        """
+        Plan notes for many meetings in one batch.
+        
+        Contexts are deduplicated by their canonical form, and precomputed
+        notes are served from the notes cache. Each distinct meeting is planned
+        with the first phrasing given for it. For the remaining meetings, trivia is
+        fetched in one batch (or drawn from the pool), fun facts with bounded
+        concurrency and trending repositories once. Meetings are then enhanced
+        with several packed into each LLM request, and formatted through the
+        gateway's batch API, at most MEETING_BATCH_CONCURRENCY requests at a time.
+        
+        Args:
+            meeting_contexts: Contexts of the meetings to plan
+        
+        Returns:
+            The meeting notes for each context, in the order given.
+        """
+        start_time = asyncio.get_event_loop().time()
+        canonical = [canonicalize_context(meeting_context) for meeting_context in meeting_contexts]
+        # The first phrasing of each canonical context is the one planned
+        phrasings: Dict[str, str] = {}
+        for cache_context, meeting_context in zip(canonical, meeting_contexts):
+            phrasings.setdefault(cache_context, meeting_context)
+        
+        notes: Dict[str, str] = {}
+        for cache_context in phrasings:
+            cached = self.notes_cache.get(PIPELINE_MODE, cache_context)
+            if cached is not None:
+                notes[cache_context] = cached
+        pending = [cache_context for cache_context in phrasings if cache_context not in notes]
+        logger.info(
+            "Starting batch meeting planning",
+            contexts=len(meeting_contexts),
+            unique_contexts=len(notes) + len(pending),
+            precomputed=len(notes)
+        )
+        
+        try:
+            if pending:
+                pending_phrasings = [phrasings[cache_context] for cache_context in pending]
+                contents = await self._fetch_batch_content(len(pending))
+                if settings.MEETING_BATCH_ENHANCEMENT:
+                    contents = await self.content_enhancer.enhance_batch(contents, pending_phrasings)
+                outputs = await self._format_notes_batch(pending_phrasings, contents)
+                for cache_context, output in zip(pending, outputs):
+                    self.notes_cache.store(PIPELINE_MODE, cache_context, output)
+                notes.update(zip(pending, outputs))
+        except BaseException:
+            self._observe_planning(start_time, "batch", "error")
+            raise
+        
+        self._log_execution_time(start_time, True, mode="batch", meetings=len(pending))
+        self._observe_planning(start_time, "batch", "success")
+        return [notes[cache_context] for cache_context in canonical]
+    
+    async def _format_notes_batch(self, meeting_contexts: List[str], contents: List[MeetingContent]) -> List[str]:
+        """Format many meetings through the gateway's batch API, using the template formatter for any that fail."""
+        outputs: List[Optional[str]] = [None] * len(contents)
+        if settings.PIPELINE_LLM_FORMATTING:
+            prompts = [
+                self._format_prompt(meeting_context, content)
+                for meeting_context, content in zip(meeting_contexts, contents)
+            ]
+            cache_prompts = [
+                self._format_prompt(canonicalize_context(meeting_context), content)
+                for meeting_context, content in zip(meeting_contexts, contents)
+            ]
+            try:
+                with llm_prompt("meeting_notes_format"):
+                    outputs = await self.llm_gateway.get_string_responses(
+                        prompts,
+                        max_concurrency=settings.MEETING_BATCH_CONCURRENCY,
+                        cache_prompts=cache_prompts,
+                        reserve=settings.MEETING_BATCH_FALLBACK_RESERVE
+                    )
+            except Exception as e:
+                logger.warning("Batch LLM formatting failed, using template formatter", error=str(e))
+        
+        return [
+            output if output is not None else MeetingNotesFormatter.format_meeting_sections(
+                content.trivia, content.fun_fact, content.trending_repos
             )
-            logger.warning("Agent execution failed, falling back to direct service calls", error=str(e))
-            return await self._fallback_plan_meeting()
+            for output, content in zip(outputs, contents)
+        ]
+    
+    async def _fetch_batch_content(self, count: int) -> List[MeetingContent]:
+        """Fetch basic sections for `count` meetings with one request per content type where the APIs allow it."""
+        from ..services.tech_trivia_service import TechTriviaService
+        from ..services.fun_facts_service import FunFactsService
+        from ..services.github_trending_service import GitHubTrendingService
+        
+        trivia, fun_facts, trending_repos = await asyncio.gather(
+            TechTriviaService().get_tech_trivia_batch(count),
+            FunFactsService().get_fun_facts(count, settings.MEETING_BATCH_CONCURRENCY),
+            GitHubTrendingService().get_trending_repos()
+        )
+        # Every meeting in the batch shares the same trending repositories
+        repos_text = RepositoryFormatter.format_trending_repos_for_llm(trending_repos)
+        return [
+            MeetingContent(
+                trivia=f"Question: {question.question}\nAnswer: {question.correct_answer}",
+                fun_fact=fun_fact.text,
+                trending_repos=repos_text
+            )
+            for question, fun_fact in zip(trivia, fun_facts)
+        ]
+    
+    async def _stream_formatting(self, prompt: str, listener: PlanningListener, cache_prompt: Optional[str] = None) -> str:
+        """Stream the formatting response to the listener and return the full text."""
+        parts = []
+        async for text in self.llm_gateway.stream_string_response(prompt, cache_prompt=cache_prompt):
+            parts.append(text)
+            await notify(listener, "on_token", text)
+        return "".join(parts)
     
     async def _fallback_plan_meeting(self) -> str:
         """Fallback method that uses the original formatter if LangChain agent fails."""
@@ -139,16 +503,20 @@ class MeetingPlannerAgent:
             fun_facts_service = FunFactsService()
             github_trending_service = GitHubTrendingService()
             
-            # Execute services with timeouts
-            trivia_task = asyncio.create_task(tech_trivia_service.get_tech_trivia())
-            fun_fact_task = asyncio.create_task(fun_facts_service.get_fun_fact())
-            trending_repos_task = asyncio.create_task(github_trending_service.get_trending_repos())
+            # Double the API timeout for multiple calls, within what is left of the request
+            timeout = budget(settings.API_TIMEOUT * 2)
+            
+            # Execute services with timeouts; the tasks inherit the fallback deadline
+            with deadline_scope(timeout):
+                trivia_task = asyncio.create_task(tech_trivia_service.get_tech_trivia())
+                fun_fact_task = asyncio.create_task(fun_facts_service.get_fun_fact())
+                trending_repos_task = asyncio.create_task(github_trending_service.get_trending_repos())
             
             # Wait for all tasks with timeout
             tasks = [trivia_task, fun_fact_task, trending_repos_task]
             results = await asyncio.wait_for(
                 asyncio.gather(*tasks, return_exceptions=True),
-                timeout=settings.API_TIMEOUT * 2  # Double the API timeout for multiple calls
+                timeout=timeout
             )
             
             # Extract results, handling any exceptions
@@ -0,0 +1,10 @@
+"""
+Execution modes of the meeting planner.
+
+Kept apart from the planner so callers can validate a mode without importing
+LangChain.
+"""
+
+AGENT_MODE = "agent"
+PIPELINE_MODE = "pipeline"
+PLANNER_MODES = (AGENT_MODE, PIPELINE_MODE)
@@ -0,0 +1,202 @@
+"""
+Provides admission control for expensive requests.
+
+Bounds how many requests run at once, globally and per client, and queues the
+rest in a bounded FIFO. Requests that cannot finish within their deadline are
+rejected up front instead of timing out after holding resources.
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from .config import settings
+from .logging_config import get_logger
+from .metrics import ADMISSION_REJECTIONS
+
+logger = get_logger(__name__)
+
+# Weight of the newest observation in the moving latency estimate
+LATENCY_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+@dataclass(eq=False)
+class _Waiter:
+    """A queued request waiting for a slot."""
+    client_id: str
+    future: asyncio.Future = field(repr=False)
+
+
+class AdmissionController:
+    """
+    Admits requests under global and per-client concurrency limits.
+
+    - Up to `max_concurrent` requests run at once, at most `max_per_client`
+      of them for one client.
+    - Other requests wait in FIFO order in a queue of at most `max_queue`;
+      a full queue rejects new requests immediately.
+    - A request whose remaining time cannot cover the expected queueing delay
+      plus the expected run time is rejected immediately, and a queued request
+      is rejected once too little time is left for it to run.
+
+    The expected run time starts at `expected_latency` and follows an
+    exponential moving average of observed run times.
+    """
+
+    def __init__(self, max_concurrent: int, max_per_client: int, max_queue: int, expected_latency: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_client = max(1, max_per_client)
+        self.max_queue = max(0, max_queue)
+        self.expected_latency = expected_latency
+        self._active = 0
+        self._active_by_client: Dict[str, int] = {}
+        self._queue: Deque[_Waiter] = deque()
+        self._max_queue_depth = 0
+        self._admitted = 0
+        self._rejected: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        client_id: str = "anonymous",
+        deadline: Optional[float] = None,
+        observe: bool = True
+    ) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        Args:
+            client_id: Identifies the client for per-client limits
+            deadline: Optional `time.monotonic()` time by which the request must finish
+            observe: Whether the run time updates the expected latency; disable
+                for requests unlike the usual one, such as batches
+
+        Raises:
+            AdmissionRejected: If the request is shed
+        """
+        await self._acquire(client_id, deadline)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(client_id, time.monotonic() - start if observe else None)
+
+    def stats(self) -> Dict[str, object]:
+        """Return current load, queue depth and admission counters."""
+        return {
+            "active": self._active,
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self._max_queue_depth,
+            "admitted": self._admitted,
+            "rejected": dict(self._rejected),
+            "expected_latency_seconds": round(self.expected_latency, 3),
+        }
+
+    def _can_run(self, client_id: str) -> bool:
+        """Return whether a request for the client fits within both limits."""
+        return (
+            self._active < self.max_concurrent
+            and self._active_by_client.get(client_id, 0) < self.max_per_client
+        )
+
+    def _reserve(self, client_id: str):
+        """Take a slot for the client."""
+        self._active += 1
+        self._active_by_client[client_id] = self._active_by_client.get(client_id, 0) + 1
+        self._admitted += 1
+
+    def _expected_wait(self) -> float:
+        """Estimate the queueing delay for a newly queued request."""
+        rounds = (len(self._queue) + 1) / self.max_concurrent
+        return rounds * self.expected_latency
+
+    def _reject(self, reason: str, message: str, client_id: str) -> AdmissionRejected:
+        """Count and log a rejection, returning the exception to raise."""
+        self._rejected[reason] = self._rejected.get(reason, 0) + 1
+        ADMISSION_REJECTIONS.inc(reason=reason)
+        logger.warning(
+            "Request rejected by admission control",
+            reason=reason,
+            client_id=client_id,
+            active=self._active,
+            queue_depth=len(self._queue)
+        )
+        return AdmissionRejected(reason, message)
+
+    async def _acquire(self, client_id: str, deadline: Optional[float]):
+        """Admit the request now, queue it, or reject it."""
+        remaining = None if deadline is None else deadline - time.monotonic()
+
+        if self._can_run(client_id):
+            if remaining is not None and remaining < self.expected_latency:
+                raise self._reject("deadline", "Not enough time left to prepare the meeting", client_id)
+            self._reserve(client_id)
+            return
+
+        if len(self._queue) >= self.max_queue:
+            raise self._reject("queue_full", "Too many meeting preparations are queued", client_id)
+        if remaining is not None and remaining < self._expected_wait() + self.expected_latency:
+            raise self._reject("deadline", "The queue is too long to finish before the deadline", client_id)
+
+        waiter = _Waiter(client_id, asyncio.get_running_loop().create_future())
+        self._queue.append(waiter)
+        self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+        logger.info("Request queued by admission control", client_id=client_id, queue_depth=len(self._queue))
+
+        # Stop waiting while there is still time to run
+        timeout = None if remaining is None else remaining - self.expected_latency
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            raise self._reject("deadline", "Timed out waiting for a free slot", client_id)
+        except asyncio.CancelledError:
+            # A slot granted just before cancellation must be handed back
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(client_id)
+            raise
+        finally:
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+
+    def _release(self, client_id: str, duration: Optional[float] = None):
+        """Free the client's slot, update the latency estimate and admit queued requests."""
+        self._active -= 1
+        count = self._active_by_client.get(client_id, 0) - 1
+        if count > 0:
+            self._active_by_client[client_id] = count
+        else:
+            self._active_by_client.pop(client_id, None)
+
+        if duration is not None:
+            self.expected_latency += LATENCY_SMOOTHING * (duration - self.expected_latency)
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        """Grant free slots to queued requests in FIFO order, skipping clients at their limit."""
+        for waiter in list(self._queue):
+            if self._active >= self.max_concurrent:
+                break
+            if waiter.future.done() or not self._can_run(waiter.client_id):
+                continue
+            self._queue.remove(waiter)
+            self._reserve(waiter.client_id)
+            waiter.future.set_result(None)
+
+
+# Shared controller for prepare_meeting requests
+admission_controller = AdmissionController(
+    max_concurrent=settings.ADMISSION_MAX_CONCURRENT,
+    max_per_client=settings.ADMISSION_MAX_PER_CLIENT,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    expected_latency=settings.ADMISSION_EXPECTED_LATENCY
+)
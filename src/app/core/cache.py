@@ -0,0 +1,110 @@
+"""
+Provides an in-memory TTL cache with stale-while-revalidate refresh.
+"""
+import asyncio
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from .logging_config import get_logger
+from .metrics import CACHE_LOOKUPS
+from .single_flight import SingleFlight
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """A cached value and the monotonic time it was stored."""
+    value: Any
+    stored_at: float
+
+
+class StaleWhileRevalidateCache:
+    """
+    Caches loader results with a freshness TTL and a stale grace period.
+
+    - Fresh entries (younger than `ttl`) are returned directly.
+    - Stale entries (within `stale_ttl` after expiry) are returned immediately
+      while a background refresh replaces them.
+    - Missing or fully expired entries are loaded inline.
+
+    Loads for the same key are single-flight, so concurrent callers during a
+    refresh share one upstream request. Loaders return None to signal that the
+    result must not be cached (e.g. fallback data).
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[Hashable, CacheEntry] = {}
+        self._flight = SingleFlight()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """Caching is disabled when the TTL is zero or negative."""
+        return self.ttl > 0
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        """
+        Return the cached value for the key, loading it if necessary.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument coroutine function fetching a fresh value
+
+        Returns:
+            The cached or freshly loaded value, or None if the loader produced nothing cacheable.
+        """
+        if not self.enabled:
+            return await loader()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if age < self.ttl:
+                logger.debug("Cache hit", cache=self.name, age_seconds=round(age, 2))
+                CACHE_LOOKUPS.inc(cache=self.name, result="hit")
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                logger.info("Serving stale cache entry while revalidating", cache=self.name, age_seconds=round(age, 2))
+                CACHE_LOOKUPS.inc(cache=self.name, result="stale")
+                self._schedule_refresh(key, loader)
+                return entry.value
+
+        logger.info("Cache miss", cache=self.name)
+        CACHE_LOOKUPS.inc(cache=self.name, result="miss")
+        return await self._flight.do(key, lambda: self._load(key, loader))
+
+    def clear(self):
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """Run the loader and store a non-None result."""
+        value = await loader()
+        if value is not None:
+            self._entries[key] = CacheEntry(value=value, stored_at=time.monotonic())
+        return value
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]):
+        """Start a background refresh for the key unless one is already running."""
+        if self._flight.in_flight(key):
+            return
+        task = asyncio.create_task(self._refresh(key, loader))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Optional[Any]]]):
+        """Refresh an entry in the background, keeping the stale value on failure."""
+        try:
+            await self._flight.do(key, lambda: self._load(key, loader))
+        except Exception as e:
+            logger.warning("Background cache refresh failed", cache=self.name, error=str(e))
@@ -0,0 +1,157 @@
+"""
+Circuit breakers for upstream HTTP endpoints.
+
+A breaker watches the outcomes of recent requests to one endpoint. Once too
+many of them fail it opens, and requests are refused instantly so callers can
+serve fallback data instead of waiting for a timeout. After a cool-down a few
+probe requests are let through; if they succeed the breaker closes again.
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator
+
+from .config import settings
+from .latency import endpoint_key
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the endpoint's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    A closed/open/half-open circuit breaker driven by a failure-rate window.
+
+    - Closed: requests pass; the breaker opens when at least `min_requests` of
+      the last `window_size` outcomes are recorded and the share of failures
+      reaches `failure_rate`.
+    - Open: requests are refused until `open_seconds` have passed.
+    - Half-open: up to `half_open_probes` requests probe the endpoint; a
+      success closes the breaker and a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        window_size: int = 20,
+        min_requests: int = 5,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """The current state, moving from open to half-open once the cool-down has passed."""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    @contextmanager
+    def guard(self, is_failure: Callable[[BaseException], bool] = lambda e: True) -> Iterator[None]:
+        """
+        Run a request under the breaker.
+
+        Completing the block counts as a success. An exception counts as a
+        failure if `is_failure` says so; other exceptions, including
+        cancellation, leave the failure rate unchanged.
+
+        Args:
+            is_failure: Decides whether an exception reflects an unhealthy endpoint
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all probe slots are taken
+        """
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_probes):
+            raise CircuitOpenError(f"Circuit for {self.name} is open")
+
+        probing = state == HALF_OPEN
+        if probing:
+            self._probes += 1
+        try:
+            yield
+        except BaseException as e:
+            if isinstance(e, Exception) and is_failure(e):
+                self._record(False, probing)
+            raise
+        else:
+            self._record(True, probing)
+        finally:
+            if probing:
+                self._probes -= 1
+
+    def _record(self, success: bool, probing: bool):
+        """Record one outcome and change state if needed."""
+        if probing:
+            self._transition(CLOSED if success else OPEN)
+            return
+        if self._state != CLOSED:
+            return
+
+        self._outcomes.append(success)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.failure_rate:
+            self._transition(OPEN)
+
+    def _transition(self, state: str):
+        """Move to a new state."""
+        if state == self._state:
+            return
+        logger.warning("Circuit breaker state changed", endpoint=self.name, old_state=self._state, new_state=state)
+        self._state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == CLOSED:
+            self._outcomes.clear()
+
+
+class CircuitBreakerRegistry:
+    """Holds one circuit breaker per endpoint, configured from settings."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, url: str) -> CircuitBreaker:
+        """Return the breaker for the URL's endpoint, creating it on first use."""
+        key = endpoint_key(url)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(
+                key,
+                failure_rate=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+                window_size=settings.CIRCUIT_BREAKER_WINDOW_SIZE,
+                min_requests=settings.CIRCUIT_BREAKER_MIN_REQUESTS,
+                open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+                half_open_probes=settings.CIRCUIT_BREAKER_HALF_OPEN_PROBES
+            )
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """Return the state of every tracked endpoint."""
+        return {key: breaker.state for key, breaker in self._breakers.items()}
+
+    def clear(self):
+        """Forget all breakers."""
+        self._breakers.clear()
+
+
+# Shared breakers for all upstream HTTP services
+circuit_breakers = CircuitBreakerRegistry()
@@ -4,7 +4,7 @@ Handles application configuration using Pydantic Settings.
 This module defines the `Settings` class, which loads configuration values
 from environment variables and a .env file.
 """
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from pydantic import SecretStr, ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -32,25 +32,139 @@ class Settings(BaseSettings):
     AGENT_EXECUTOR_TIMEOUT: int = 180  # Increased from 120 to 180 seconds (3 minutes) for agent execution
     MCP_TOOL_TIMEOUT: int = 240  # Increased from 150 to 240 seconds (4 minutes) for MCP tool execution
 
+    # HTTP Connection Pool Configuration
+    HTTP_POOL_LIMIT: int = 100  # Total simultaneous connections across all hosts
+    HTTP_POOL_LIMIT_PER_HOST: int = 10  # Simultaneous connections to a single upstream API
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0  # Seconds an idle connection is kept open for reuse
+    HTTP_DNS_CACHE_TTL: int = 300  # Seconds to cache DNS lookups
+
+    # Request Hedging Configuration
+    HTTP_HEDGING_ENABLED: bool = True  # Hedge upstream requests that are slower than the endpoint usually is
+    HTTP_HEDGE_STRATEGY: str = "request"  # "request" sends a second request and takes the first answer; "fallback" serves fallback data
+    HTTP_HEDGE_PERCENTILE: float = 95.0  # Latency percentile of the endpoint after which a request is hedged
+    HTTP_HEDGE_MIN_DELAY: float = 0.1  # Never hedge sooner than this many seconds
+    HTTP_HEDGE_MIN_SAMPLES: int = 20  # Responses observed per endpoint before hedging starts
+
+    # Circuit Breaker Configuration
+    CIRCUIT_BREAKER_ENABLED: bool = True  # Skip unhealthy upstream endpoints and serve fallback data instantly
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5  # Share of failed requests in the window that opens the circuit
+    CIRCUIT_BREAKER_WINDOW_SIZE: int = 20  # Recent requests per endpoint considered for the failure rate
+    CIRCUIT_BREAKER_MIN_REQUESTS: int = 5  # Requests in the window before the circuit can open
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = 30.0  # Seconds an open circuit refuses requests before probing the endpoint
+    CIRCUIT_BREAKER_HALF_OPEN_PROBES: int = 1  # Concurrent probe requests allowed while half-open
+
+    # Upstream Rate Limit Configuration
+    RATE_LIMIT_ENABLED: bool = True  # Keep requests under upstream quotas with a token bucket per host
+    RATE_LIMITS: Dict[str, float] = {"opentdb.com": 0.2}  # Requests per second allowed per host, split evenly between MCP_WORKERS (JSON in the environment)
+    RATE_LIMIT_BURST: int = 1  # Requests a host may receive back to back after being idle
+    RATE_LIMIT_MAX_WAIT: float = 1.0  # Seconds a request may wait for a token before local content is served instead (trivia pool refills wait a full token interval)
+
+    # Upstream Retry Configuration
+    RETRY_ENABLED: bool = True  # Retry upstream responses such as 429 and 503 before serving fallback data
+    RETRY_MAX_ATTEMPTS: int = 3  # Attempts per request, including the first
+    RETRY_BASE_DELAY: float = 0.2  # Backoff before the first retry, doubled for each further retry (full jitter)
+    RETRY_MAX_DELAY: float = 2.0  # Longest backoff between attempts
+    RETRY_MAX_WAIT: float = 5.0  # Longest wait for a Retry-After or the host's rate limit before fallback data is served instead
+    RETRY_STATUSES: List[int] = [429, 502, 503, 504]  # Response statuses that are retried
+    RETRY_POLICIES: Dict[str, Dict[str, Any]] = {}  # Per-service overrides of the settings above, e.g. {"TechTriviaService": {"max_attempts": 2}} (JSON in the environment)
+    RETRY_BUDGET_RATIO: float = 0.2  # Retries allowed per endpoint as a share of its requests in the window
+    RETRY_BUDGET_MIN_RETRIES: int = 3  # Retries per endpoint always allowed in the window
+    RETRY_BUDGET_WINDOW: float = 10.0  # Seconds of requests the retry budget looks back over
+
+    # Cache Configuration (in seconds)
+    GITHUB_TRENDING_CACHE_TTL: int = 900  # Trending repos are served fresh for 15 minutes (0 disables caching)
+    GITHUB_TRENDING_CACHE_STALE_TTL: int = 3600  # Stale repos are served for up to 1 hour more while refreshing
+
+    # Content Pool Configuration
+    TECH_TRIVIA_POOL_ENABLED: bool = False  # Serve trivia from a prefetched pool instead of one API call per question
+    TECH_TRIVIA_POOL_BATCH_SIZE: int = 50  # Questions fetched per API call (opentdb maximum is 50)
+    TECH_TRIVIA_POOL_CAPACITY: int = 100  # Maximum questions held in memory
+    TECH_TRIVIA_POOL_LOW_WATERMARK: int = 10  # Refill in the background when fewer questions remain
+    TECH_TRIVIA_POOL_SERVED_MEMORY: int = 1000  # Recently served questions remembered to avoid repeats
+    FUN_FACTS_RESERVOIR_ENABLED: bool = False  # Serve fun facts from a background-filled in-memory reservoir
+    FUN_FACTS_RESERVOIR_CAPACITY: int = 20  # Maximum fun facts held in memory
+    FUN_FACTS_RESERVOIR_LOW_WATERMARK: int = 5  # Refill in the background when fewer facts remain
+    FUN_FACTS_RESERVOIR_CONCURRENCY: int = 2  # Concurrent API calls while refilling
+    FUN_FACTS_RESERVOIR_REFILL_INTERVAL: float = 1.0  # Mean seconds between refill rounds (jittered)
+    FUN_FACTS_RESERVOIR_SERVED_MEMORY: int = 200  # Recently served facts remembered to avoid repeats
+    SHARED_CONTENT_ENABLED: bool = False  # Share fetched trivia and fun facts between worker processes through SQLite
+    SHARED_CONTENT_PATH: str = ".cache/shared_content.sqlite3"  # Database file shared by all workers
+    SHARED_CONTENT_MAX_ITEMS: int = 500  # Maximum unclaimed items stored per pool
+    SHARED_CONTENT_CLAIM_SIZE: int = 10  # Items a worker takes from the shared store per pool fetch
+    SHARED_CONTENT_LEASE_SECONDS: float = 30.0  # Longest a worker waits on, or holds, another pool fetch
+    SHARED_CONTENT_POLL_INTERVAL: float = 0.1  # Seconds between checks while another worker fetches
+
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_ENABLED: bool = True  # Render and write log records on a background thread instead of the event loop
+    LOG_QUEUE_MAX_SIZE: int = 10000  # Maximum log records waiting to be written before records are dropped
+    LOG_QUEUE_DROP_POLICY: str = "drop_new"  # When the queue is full: "drop_new" discards the new record, "drop_oldest" the oldest queued one
 
     # Server Configuration
     MCP_HOST: str = "127.0.0.1"
     MCP_PORT: int = 8000
     MCP_TRANSPORT: str = "sse"
+    SERVER_LAZY_INIT: bool = True  # Import LangChain and build the planner agent on first use instead of at startup
+    SERVER_WARMUP_ENABLED: bool = True  # With lazy init, build the planner on a background thread as the server starts
+    MCP_WORKERS: int = 1  # Worker processes serving MCP_PORT; above 1 requires MCP_TRANSPORT "http" (stateless), and SHARED_CONTENT_ENABLED for notes warming
 
     # LLM Configuration (for future use)
     LLM_API_KEY: Optional[SecretStr] = None
     LLM_API_BASE_URL: Optional[str] = None
     LLM_MODEL: Optional[str] = None
     LLM_TEMPERATURE: float = 0.0  # Use 0 for deterministic, structured output
+    LLM_HTTP_MAX_CONNECTIONS: int = 100  # Pooled connections to the LLM provider
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20  # Idle connections kept warm for reuse
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle LLM connection is kept open
+    LLM_CACHE_BACKEND: str = "memory"  # LLM response cache: "memory" (LRU), "sqlite" (on disk) or "none"
+    LLM_CACHE_TTL: int = 86400  # Seconds a cached LLM response stays valid, 0 disables the cache
+    LLM_CACHE_MAX_ENTRIES: int = 1000  # Least recently used responses are evicted beyond this size
+    LLM_CACHE_SQLITE_PATH: str = ".cache/llm_cache.sqlite3"  # Database file for the "sqlite" backend
+    LLM_BATCH_MAX_CONCURRENCY: int = 8  # LLM requests in flight for one batch call
+    LLM_BATCH_PACK_SIZE: int = 5  # Structured prompts packed into one LLM request by batch calls (1 disables packing)
+    LLM_BATCH_MAX_RETRIES: int = 2  # Times a batch call retries only the prompts that failed
 
     # Optional Langfuse settings
     LANGFUSE_SECRET_KEY: Optional[SecretStr] = None
     LANGFUSE_PUBLIC_KEY: Optional[str] = None
     LANGFUSE_HOST: Optional[str] = None
 
+    # Meeting Planner Configuration
+    PLANNER_MODE: str = "agent"  # "agent" (LLM tool-calling loop) or "pipeline" (parallel tools, one formatting step)
+    PIPELINE_LLM_FORMATTING: bool = True  # Pipeline mode formats notes with one LLM call; false uses the template formatter
+    PIPELINE_COMBINED_ENHANCEMENT: bool = False  # Pipeline mode enhances all sections for the meeting context in one structured LLM call
+    PLANNER_SINGLE_FLIGHT_ENABLED: bool = True  # Concurrent identical prepare_meeting requests share one planning run
+    PLANNER_SINGLE_FLIGHT_TIMEOUT: int = 300  # Seconds before a shared planning run is cancelled so the next request starts afresh
+    PLANNER_FALLBACK_RESERVE: float = 30.0  # Seconds of the request deadline kept back so the direct-service fallback can finish
+    MEETING_BATCH_FALLBACK_RESERVE: float = 5.0  # Seconds of a prepare_meetings deadline LLM batch rounds leave for basic content and template notes
+    MEETING_BATCH_MAX_CONTEXTS: int = 500  # Maximum meeting contexts accepted by one prepare_meetings call
+    MEETING_BATCH_CONCURRENCY: int = 8  # LLM requests and fun fact fetches in flight for one prepare_meetings call
+    MEETING_BATCH_ENHANCEMENT: bool = True  # prepare_meetings tailors each meeting's sections to its context, LLM_BATCH_PACK_SIZE meetings per LLM call
+    MEETING_BATCH_TIMEOUT: int = 900  # Seconds a prepare_meetings call may take, including any wait for an admission slot
+
+    # Meeting Notes Warming Configuration
+    MEETING_NOTES_CACHE_TTL: int = 1800  # Seconds precomputed notes for recurring contexts are served (0 disables)
+    MEETING_NOTES_WARMING_ENABLED: bool = False  # Precompute notes for recurring contexts in the background
+    MEETING_NOTES_WARM_CONTEXTS: List[str] = []  # Recurring meeting contexts to precompute, besides the general meeting (JSON in the environment)
+    MEETING_NOTES_WARM_INTERVAL: int = 900  # Seconds between warming rounds; keep below MEETING_NOTES_CACHE_TTL
+    MEETING_NOTES_WARM_SPACING: float = 5.0  # Seconds between warming two contexts, to stay within upstream rate limits
+
+    # Meeting Context Canonicalization
+    CONTEXT_CANONICALIZATION_ENABLED: bool = True  # Map near-duplicate meeting contexts onto one phrasing before cache lookups
+    CONTEXT_SIMILARITY_THRESHOLD: float = 0.8  # Minimum trigram Jaccard similarity for near-duplicate contexts
+    CONTEXT_INDEX_MAX_ENTRIES: int = 10000  # Maximum distinct contexts remembered by the canonicalizer
+
+    # Admission Control
+    ADMISSION_CONTROL_ENABLED: bool = True  # Bound concurrent prepare_meeting requests and shed load that cannot finish in time
+    ADMISSION_MAX_CONCURRENT: int = 32  # Maximum prepare_meeting requests running at once
+    ADMISSION_MAX_PER_CLIENT: int = 4  # Maximum prepare_meeting requests running at once for one client
+    ADMISSION_MAX_QUEUE: int = 64  # Maximum requests waiting for a slot before new ones are rejected
+    ADMISSION_EXPECTED_LATENCY: float = 10.0  # Initial estimate in seconds of one request's run time, refined from observed requests
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # Record per-stage latency histograms and counters and serve them on METRICS_PATH
+    METRICS_PATH: str = "/metrics"  # HTTP route serving metrics in the Prometheus text format (SSE and HTTP transports)
+
     # FastMCP Configuration
     MCP_MASK_ERROR_DETAILS: bool = True
     MCP_ENABLE_LOGGING: bool = True
@@ -0,0 +1,231 @@
+"""
+Canonicalizes meeting contexts so near-duplicate phrasings share cache entries.
+
+"Sprint Planning!!", "sprint planning meeting" and "our sprint planning" all
+become "sprint planning". Contexts are lowercased and stripped of punctuation
+and stopwords; the remaining token set identifies the context exactly, and a
+MinHash/LSH index over character trigrams maps near-duplicates (plurals,
+typos, extra words) onto the first phrasing seen, unless their numbers differ.
+Everything is pure Python and works offline.
+
+Canonical forms depend on the order in which a process sees contexts:
+near-duplicates map onto whichever phrasing it indexed first. With a cache
+shared between worker processes (LLM_CACHE_BACKEND "sqlite"), workers that
+saw contexts in a different order may key the same meeting differently and
+miss each other's entries.
+
+The canonical form is only a cache key: it drops and merges words, so
+prompts and tools always get the meeting context as the user wrote it.
+"""
+import random
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .config import settings
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Words that carry no meaning for content selection. Negations are deliberately kept.
+STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "of", "for", "to", "in", "on", "at", "by", "with", "about",
+    "our", "my", "your", "their", "we", "us", "i", "you", "they", "this", "that", "these", "those",
+    "is", "are", "be", "some", "please", "just", "meeting", "meetings"
+})
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_HYPHENATED_PATTERN = re.compile(r"(?<=[a-z0-9])-(?=[a-z0-9])")
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def tokenize(context: str) -> List[str]:
+    """
+    Split a meeting context into meaningful lowercase tokens.
+
+    Hyphenated words are joined ("stand-up" becomes "standup"). Words are
+    otherwise kept as written; plurals are matched as near-duplicates.
+
+    Args:
+        context: The raw meeting context
+
+    Returns:
+        Tokens in their original order, without punctuation or stopwords.
+    """
+    text = unicodedata.normalize("NFKD", context).encode("ascii", "ignore").decode("ascii").lower()
+    text = _HYPHENATED_PATTERN.sub("", text)
+    return [token for token in _TOKEN_PATTERN.findall(text) if token not in STOPWORDS]
+
+
+def numbers(tokens: List[str]) -> FrozenSet[str]:
+    """Return the numeric tokens, which must match exactly for contexts to be merged."""
+    return frozenset(token for token in tokens if token.isdigit())
+
+
+def shingles(tokens: List[str]) -> Set[str]:
+    """Return the character trigrams of each token, with word boundary markers."""
+    result = set()
+    for token in tokens:
+        padded = f"#{token}#"
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    """Return the Jaccard similarity of two sets."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class MinHasher:
+    """Computes MinHash signatures with seeded universal hash functions."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Set[str]) -> Tuple[int, ...]:
+        """
+        Compute the MinHash signature of a feature set.
+
+        Args:
+            features: Non-empty set of string features
+
+        Returns:
+            One minimum hash value per permutation.
+        """
+        values = [zlib.crc32(feature.encode("utf-8")) for feature in features]
+        return tuple(
+            min((a * value + b) % _MERSENNE_PRIME for value in values)
+            for a, b in self._params
+        )
+
+
+class ContextCanonicalizer:
+    """
+    Maps meeting contexts onto a canonical phrasing.
+
+    Contexts with the same token set share a canonical form directly. Otherwise
+    an LSH index over MinHash signatures finds candidate contexts, and the most
+    similar candidate whose trigram Jaccard similarity reaches `threshold` and
+    whose numbers are the same supplies the canonical form. New contexts become
+    canonical forms themselves, up to `max_entries` indexed contexts.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16, max_entries: int = 10000):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self._hasher = MinHasher(num_perm)
+        self._by_token_set: Dict[FrozenSet[str], str] = {}
+        self._shingles: Dict[str, Set[str]] = {}
+        self._numbers: Dict[str, FrozenSet[str]] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def canonicalize(self, context: str) -> str:
+        """
+        Return the canonical phrasing for a meeting context.
+
+        Args:
+            context: The raw meeting context
+
+        Returns:
+            The canonical context, or an empty string if nothing meaningful remains.
+        """
+        tokens = tokenize(context)
+        if not tokens:
+            return ""
+
+        token_set = frozenset(tokens)
+        canonical = self._by_token_set.get(token_set)
+        if canonical is not None:
+            return canonical
+
+        features = shingles(tokens)
+        signature = self._hasher.signature(features)
+        canonical = self._find_near_duplicate(features, numbers(tokens), signature)
+        if canonical is None:
+            canonical = " ".join(dict.fromkeys(tokens))
+            self._index(canonical, features, numbers(tokens), signature)
+
+        if len(self._by_token_set) < self.max_entries:
+            self._by_token_set[token_set] = canonical
+        return canonical
+
+    def clear(self):
+        """Forget all indexed contexts."""
+        self._by_token_set.clear()
+        self._shingles.clear()
+        self._numbers.clear()
+        self._buckets.clear()
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        """Split a signature into LSH band keys."""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def _find_near_duplicate(
+        self,
+        features: Set[str],
+        context_numbers: FrozenSet[str],
+        signature: Tuple[int, ...]
+    ) -> Optional[str]:
+        """Return the most similar indexed context at or above the threshold with the same numbers."""
+        candidates = dict.fromkeys(
+            canonical
+            for key in self._band_keys(signature)
+            for canonical in self._buckets.get(key, ())
+        )
+        best, best_similarity = None, self.threshold
+        for canonical in candidates:
+            # "team of 10" and "team of 100" are different meetings however similar they look
+            if self._numbers[canonical] != context_numbers:
+                continue
+            similarity = jaccard(features, self._shingles[canonical])
+            if similarity >= best_similarity:
+                best, best_similarity = canonical, similarity
+        if best is not None:
+            logger.debug("Matched near-duplicate meeting context", canonical=best, similarity=round(best_similarity, 2))
+        return best
+
+    def _index(self, canonical: str, features: Set[str], context_numbers: FrozenSet[str], signature: Tuple[int, ...]):
+        """Add a new canonical context to the LSH index, if there is room."""
+        if len(self._shingles) >= self.max_entries or canonical in self._shingles:
+            return
+        self._shingles[canonical] = features
+        self._numbers[canonical] = context_numbers
+        for key in self._band_keys(signature):
+            self._buckets[key].append(canonical)
+
+
+# Shared canonicalizer used by the planner and agent tools
+context_canonicalizer = ContextCanonicalizer(
+    threshold=settings.CONTEXT_SIMILARITY_THRESHOLD,
+    max_entries=settings.CONTEXT_INDEX_MAX_ENTRIES
+)
+
+
+def canonicalize_context(context: str) -> str:
+    """
+    Canonicalize a meeting context for use as a cache or single-flight key, never in prompts.
+
+    Returns the context unchanged when CONTEXT_CANONICALIZATION_ENABLED is false.
+    """
+    if not settings.CONTEXT_CANONICALIZATION_ENABLED or not context:
+        return context
+    return context_canonicalizer.canonicalize(context)
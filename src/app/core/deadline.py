@@ -0,0 +1,74 @@
+"""
+Propagates a request deadline through every layer of a meeting preparation.
+
+The server opens a deadline scope for each tool call. Nested layers (planner,
+agent tools, LLM gateway, HTTP services) read the remaining budget from a
+context variable and cap their own timeouts to it, so an inner step never
+outlives the request and time can be set aside for fallbacks. Tasks created
+inside a scope inherit its deadline.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the request deadline leaves no time to start a step."""
+
+
+def current_deadline() -> Optional[float]:
+    """Return the active deadline as a `time.monotonic()` time, or None if unbounded."""
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Return the seconds left before the active deadline (never negative), or None if unbounded."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def budget(timeout: float, reserve: float = 0.0) -> float:
+    """
+    Cap a layer's own timeout to the time left in the request.
+
+    Args:
+        timeout: The layer's configured timeout in seconds
+        reserve: Seconds to leave for work after this step, such as a fallback
+
+    Returns:
+        The smaller of `timeout` and the remaining time minus `reserve`, never negative.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    return max(0.0, min(timeout, left - reserve))
+
+
+@contextmanager
+def deadline_scope(timeout: float) -> Iterator[float]:
+    """
+    Run a block with a deadline `timeout` seconds from now.
+
+    An enclosing deadline that is earlier stays in force, so nested scopes
+    can only shorten the budget.
+
+    Args:
+        timeout: Seconds until the deadline
+
+    Yields:
+        The effective deadline as a `time.monotonic()` time.
+    """
+    deadline = time.monotonic() + timeout
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
@@ -0,0 +1,80 @@
+"""
+Provides a process-wide pooled HTTP session for external API interactions.
+"""
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+from .config import settings
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class HTTPSessionManager:
+    """
+    Owns a shared aiohttp ClientSession and its connection pool.
+
+    Services borrow the session instead of opening a new one per request, so
+    TCP/TLS connections and DNS lookups are reused across calls. The session is
+    bound to the event loop it was created on and is transparently recreated if
+    it has been closed or the loop has changed.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the shared session, creating it on first use.
+
+        Must be called from within a running event loop.
+
+        Returns:
+            A pooled aiohttp.ClientSession.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = self._create_session()
+            self._loop = loop
+        return self._session
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a new session with a keep-alive connector and DNS cache."""
+        logger.info(
+            "Creating pooled HTTP session",
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            dns_cache_ttl=settings.HTTP_DNS_CACHE_TTL
+        )
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            use_dns_cache=True,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    async def close(self):
+        """Close the shared session and release pooled connections."""
+        session, loop = self._session, self._loop
+        self._session = None
+        self._loop = None
+
+        if session is None or session.closed:
+            return
+
+        # A session can only be closed from the loop that owns it
+        if loop is asyncio.get_running_loop():
+            await session.close()
+            logger.info("Closed pooled HTTP session")
+        else:
+            logger.warning("Discarding pooled HTTP session bound to a different event loop")
+
+
+# Shared instance used by all services
+http_session_manager = HTTPSessionManager()
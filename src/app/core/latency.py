@@ -0,0 +1,120 @@
+"""
+Tracks upstream latency per endpoint.
+
+Each endpoint keeps a histogram of recent response times. The histograms
+drive request hedging: a request still unanswered after the endpoint's
+configured percentile latency is hedged.
+"""
+import bisect
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .config import settings
+
+# Bucket upper bounds in seconds, growing by 25% from 5 ms to roughly 2 minutes
+BUCKET_BOUNDS: List[float] = [0.005 * 1.25 ** i for i in range(46)]
+
+
+class HedgeTimeout(Exception):
+    """Raised when a request outlives its endpoint's hedge delay and fallback data is served instead."""
+
+
+def endpoint_key(url: str) -> str:
+    """Identify an endpoint by scheme, host and path, ignoring the query string."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class LatencyHistogram:
+    """
+    A bucketed latency histogram that favours recent observations.
+
+    Once `decay_after` observations have accumulated, every bucket count is
+    halved, so old latencies fade out as an endpoint's behaviour changes.
+    """
+
+    def __init__(self, decay_after: int = 1000):
+        self.decay_after = decay_after
+        self._counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+
+    def observe(self, seconds: float):
+        """Record one latency observation."""
+        self._counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        if self.count >= self.decay_after:
+            self._counts = [count // 2 for count in self._counts]
+            self.count = sum(self._counts)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a latency quantile.
+
+        Args:
+            q: The quantile, between 0 and 1
+
+        Returns:
+            The upper bound of the bucket holding the quantile, or None without observations.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                return BUCKET_BOUNDS[min(index, len(BUCKET_BOUNDS) - 1)]
+        return BUCKET_BOUNDS[-1]
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Return the observation count and p50/p95/p99 estimates."""
+        return {
+            "count": self.count,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class LatencyTracker:
+    """Keeps one latency histogram per endpoint and derives hedge delays from them."""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def histogram(self, url: str) -> LatencyHistogram:
+        """Return the histogram for the URL's endpoint, creating it on first use."""
+        key = endpoint_key(url)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram()
+        return histogram
+
+    def observe(self, url: str, seconds: float):
+        """Record a response time for the URL's endpoint."""
+        self.histogram(url).observe(seconds)
+
+    def hedge_delay(self, url: str) -> Optional[float]:
+        """
+        Return how long to wait before hedging a request to the URL.
+
+        Returns:
+            The endpoint's HTTP_HEDGE_PERCENTILE latency (at least HTTP_HEDGE_MIN_DELAY),
+            or None until HTTP_HEDGE_MIN_SAMPLES responses have been observed.
+        """
+        histogram = self._histograms.get(endpoint_key(url))
+        if histogram is None or histogram.count < settings.HTTP_HEDGE_MIN_SAMPLES:
+            return None
+        return max(settings.HTTP_HEDGE_MIN_DELAY, histogram.quantile(settings.HTTP_HEDGE_PERCENTILE / 100))
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Return latency estimates for every tracked endpoint."""
+        return {key: histogram.snapshot() for key, histogram in self._histograms.items()}
+
+    def clear(self):
+        """Forget all observations."""
+        self._histograms.clear()
+
+
+# Shared tracker for all upstream HTTP services
+latency_tracker = LatencyTracker()
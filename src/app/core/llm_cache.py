@@ -0,0 +1,249 @@
+"""
+Provides response caches for LLM calls.
+
+Responses are keyed on everything that determines them: the model, the
+temperature, the kind of response and a hash of the rendered prompt. Two
+backends are available: an in-memory LRU and an on-disk SQLite store that
+survives restarts and is shared by all server workers using the same file.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .config import settings
+from .logging_config import get_logger
+from .shared_store import open_shared_database
+
+logger = get_logger(__name__)
+
+
+def make_cache_key(model: Optional[str], temperature: float, prompt: str, kind: str = "text") -> str:
+    """
+    Build a cache key for an LLM response.
+
+    Args:
+        model: The model name
+        temperature: The sampling temperature
+        prompt: The fully rendered prompt
+        kind: The response type, e.g. "text" or a structured output schema name
+
+    Returns:
+        A hex digest identifying the response.
+    """
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = f"{model}|{temperature}|{kind}|{prompt_hash}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache(ABC):
+    """
+    Base class for LLM response caches.
+
+    Values are strings (structured responses are stored as JSON). Entries expire
+    after `ttl` seconds, and the least recently used entries are evicted once
+    more than `max_entries` are stored. Subclasses implement `_get`, `_set` and
+    `_clear`; hit and miss counters are kept here.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached response for the key.
+
+        Args:
+            key: Cache key from `make_cache_key`
+
+        Returns:
+            The cached response, or None on a miss.
+        """
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+            logger.debug("LLM cache miss", cache=self.name)
+        else:
+            self.hits += 1
+            logger.debug("LLM cache hit", cache=self.name)
+        return value
+
+    async def set(self, key: str, value: str):
+        """
+        Store a response, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key from `make_cache_key`
+            value: The response to cache
+        """
+        await self._set(key, value)
+
+    async def clear(self):
+        """Drop all entries and reset the counters."""
+        await self._clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[str]:
+        """Return the unexpired response for the key, or None. Must be implemented by subclasses."""
+
+    @abstractmethod
+    async def _set(self, key: str, value: str):
+        """Store a response, evicting entries beyond `max_entries`. Must be implemented by subclasses."""
+
+    @abstractmethod
+    async def _clear(self):
+        """Drop all entries. Must be implemented by subclasses."""
+
+
+class InMemoryLLMCache(LLMResponseCache):
+    """An in-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        super().__init__("memory", max_entries, ttl)
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def _set(self, key: str, value: str):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _clear(self):
+        self._entries.clear()
+
+
+class SQLiteLLMCache(LLMResponseCache):
+    """
+    An on-disk cache backed by SQLite.
+
+    Queries run in a worker thread so the event loop is never blocked on disk
+    I/O. Entries carry wall-clock timestamps so they stay valid across restarts.
+    The database runs in WAL mode, so several worker processes can share one file.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        super().__init__("sqlite", max_entries, ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = open_shared_database(path)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed_at ON llm_cache (accessed_at)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    async def _get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def _set(self, key: str, value: str):
+        await asyncio.to_thread(self._set_sync, key, value)
+
+    async def _clear(self):
+        await asyncio.to_thread(self._clear_sync)
+
+    def _get_sync(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, stored_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if now - stored_at >= self.ttl:
+                self._connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def _set_sync(self, key: str, value: str):
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            # Drop expired entries first, then the least recently used beyond the size limit
+            self._connection.execute("DELETE FROM llm_cache WHERE stored_at <= ?", (now - self.ttl,))
+            self._connection.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def _clear_sync(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM llm_cache")
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Return the process-wide LLM response cache configured in settings.
+
+    Returns:
+        The shared cache, or None if LLM_CACHE_BACKEND is "none" or the TTL is not positive.
+    """
+    global _llm_cache
+    backend = settings.LLM_CACHE_BACKEND.lower()
+    if backend == "none" or settings.LLM_CACHE_TTL <= 0:
+        return None
+    if _llm_cache is None:
+        if backend == "sqlite":
+            _llm_cache = SQLiteLLMCache(settings.LLM_CACHE_SQLITE_PATH, settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL)
+        else:
+            _llm_cache = InMemoryLLMCache(settings.LLM_CACHE_MAX_ENTRIES, settings.LLM_CACHE_TTL)
+        logger.info("Initialized LLM response cache", backend=_llm_cache.name, max_entries=settings.LLM_CACHE_MAX_ENTRIES)
+    return _llm_cache
+
+
+def reset_llm_cache():
+    """Forget the process-wide cache so the next lookup rebuilds it from settings."""
+    global _llm_cache
+    if isinstance(_llm_cache, SQLiteLLMCache):
+        _llm_cache.close()
+    _llm_cache = None
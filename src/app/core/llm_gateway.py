@@ -1,16 +1,29 @@
 """
 Provides a gateway for interacting with a Large Language Model (LLM).
 """
-from typing import Optional, Type, TypeVar
+import asyncio
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
+from uuid import UUID
 
-from langchain_core.callbacks import CallbackManager
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler, CallbackManager
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
-from langfuse.langchain import CallbackHandler
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, create_model
 
 from .config import settings
+from .deadline import budget
+from .llm_cache import LLMResponseCache, get_llm_cache, make_cache_key
 from .logging_config import get_logger
+from .metrics import CACHE_LOOKUPS, LLM_BATCH_ITEMS, LLM_DURATION, current_llm_prompt
+from ..prompts.agent_prompts import PACKED_TASKS_PROMPT
+
+if TYPE_CHECKING:
+    # Only used for annotations; importing Langfuse costs hundreds of milliseconds at startup
+    from langfuse.langchain import CallbackHandler
 
 T = TypeVar('T', bound=BaseModel)
 logger = get_logger(__name__)
@@ -18,17 +31,25 @@ logger = get_logger(__name__)
 class LLMGateway:
     """A gateway class for handling interactions with the configured LLM."""
     
-    def __init__(self, langfuse_callback: Optional[CallbackHandler] = None):
+    def __init__(
+        self,
+        langfuse_callback: Optional["CallbackHandler"] = None,
+        model: Optional[str] = None,
+        cache: Optional[LLMResponseCache] = None
+    ):
+        self.model = model or settings.LLM_MODEL
+        self.cache = cache
         logger.info(
             "Initializing LLMGateway",
-            model=settings.LLM_MODEL,
-            base_url=settings.LLM_API_BASE_URL
+            model=self.model,
+            base_url=settings.LLM_API_BASE_URL,
+            cache=cache.name if cache else None
         )
         
         # Create provider-agnostic chat model based on configuration
         self.chat_model = self._create_chat_model(langfuse_callback)
 
-    def _create_chat_model(self, langfuse_callback: Optional[CallbackHandler] = None) -> BaseChatModel:
+    def _create_chat_model(self, langfuse_callback: Optional["CallbackHandler"] = None) -> BaseChatModel:
         """
         Create a provider-agnostic chat model based on configuration.
         
@@ -48,7 +69,7 @@ class LLMGateway:
         }
         
         # Determine provider based on model name and base URL
-        model_name = settings.LLM_MODEL.lower() if settings.LLM_MODEL else ""
+        model_name = self.model.lower() if self.model else ""
         
         # Anthropic Claude models
         if model_name.startswith(("claude-", "claude")):
@@ -56,7 +77,7 @@ class LLMGateway:
             try:
                 from langchain_anthropic import ChatAnthropic
                 return ChatAnthropic(
-                    model=settings.LLM_MODEL,
+                    model=self.model,
                     api_key=settings.LLM_API_KEY.get_secret_value(),
                     **common_params
                 )
@@ -72,7 +93,7 @@ class LLMGateway:
             try:
                 from langchain_google_genai import ChatGoogleGenerativeAI
                 return ChatGoogleGenerativeAI(
-                    model=settings.LLM_MODEL,
+                    model=self.model,
                     google_api_key=settings.LLM_API_KEY.get_secret_value(),
                     **common_params
                 )
@@ -86,19 +107,39 @@ class LLMGateway:
         else:
             logger.info("Using OpenAI/OpenRouter or custom provider via base_url")
             return ChatOpenAI(
-                model=settings.LLM_MODEL,
+                model=self.model,
                 api_key=settings.LLM_API_KEY.get_secret_value(),
                 base_url=settings.LLM_API_BASE_URL,
+                http_async_client=self._create_http_client(),
                 **common_params
             )
 
-    async def get_string_response(self, prompt: str) -> str:
+    @staticmethod
+    def _create_http_client() -> httpx.AsyncClient:
+        """Create a long-lived pooled HTTP client so LLM calls reuse warm connections."""
+        return httpx.AsyncClient(
+            timeout=settings.LLM_REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+
+    async def get_string_response(self, prompt: str, cache_prompt: Optional[str] = None) -> str:
         """
         Sends a prompt to the LLM and returns a simple string response.
+        Responses are served from and stored in the response cache, if any,
+        keyed on `cache_prompt` when given so equivalent prompts share an entry.
         """
+        cache_key = self._cache_key(cache_prompt or prompt, "text")
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            result = await self.chat_model.ainvoke(prompt)
-            return result.content
+            with self._timed():
+                result = await asyncio.wait_for(self.chat_model.ainvoke(prompt), timeout=self._request_timeout())
         except Exception as e:
             logger.error(
                 "Error getting string response from LLM",
@@ -107,15 +148,59 @@ class LLMGateway:
             )
             raise ValueError(f"Failed to get a valid response from the LLM: {str(e)}")
 
-    async def get_structured_response(self, prompt: str, response_model: Type[T]) -> T:
+        if result.content:
+            await self._cache_set(cache_key, result.content)
+        return result.content
+
+    async def stream_string_response(self, prompt: str, cache_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Sends a prompt to the LLM and yields the response as it is generated.
+        A cached response is yielded in one piece; a completed stream is cached,
+        keyed on `cache_prompt` when given.
+        """
+        cache_key = self._cache_key(cache_prompt or prompt, "text")
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        try:
+            with self._timed():
+                async for chunk in self.chat_model.astream(prompt):
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        yield chunk.content
+        except Exception as e:
+            logger.error(
+                "Error streaming response from LLM",
+                error=str(e),
+                model=self.chat_model.model_name
+            )
+            raise ValueError(f"Failed to stream a valid response from the LLM: {str(e)}")
+
+        if parts:
+            await self._cache_set(cache_key, "".join(parts))
+
+    async def get_structured_response(self, prompt: str, response_model: Type[T], cache_prompt: Optional[str] = None) -> T:
         """
         Sends a prompt to the LLM and returns a validated Pydantic model using
         the recommended Pydantic v2 method.
+        Responses are served from and stored in the response cache, if any,
+        keyed on `cache_prompt` when given.
         """
+        cache_key = self._cache_key(cache_prompt or prompt, response_model.__name__)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            try:
+                return response_model.model_validate_json(cached)
+            except ValueError as e:
+                logger.warning("Discarding invalid cached structured response", error=str(e))
+
         try:
             structured_model = self.chat_model.with_structured_output(response_model)
-            result = await structured_model.ainvoke(prompt)
-            return result
+            with self._timed():
+                result = await asyncio.wait_for(structured_model.ainvoke(prompt), timeout=self._request_timeout())
         except Exception as e:
             logger.error(
                 "Error getting structured response from LLM",
@@ -123,3 +208,334 @@ class LLMGateway:
                 model=self.chat_model.model_name
             )
             raise ValueError(f"Failed to get a valid structured response from the LLM: {str(e)}")
+
+        if isinstance(result, BaseModel):
+            await self._cache_set(cache_key, result.model_dump_json())
+        return result
+
+    async def get_string_responses(
+        self,
+        prompts: List[str],
+        max_concurrency: Optional[int] = None,
+        cache_prompts: Optional[List[str]] = None,
+        reserve: float = 0.0
+    ) -> List[Optional[str]]:
+        """
+        Sends many prompts and returns their string responses in order.
+
+        Cached responses are served from the response cache. The rest are sent
+        with the chat model's `abatch`, at most `max_concurrency` at a time,
+        and only the prompts that failed are retried, up to
+        LLM_BATCH_MAX_RETRIES times. Each round is cut off at the request
+        deadline less `reserve`.
+
+        Args:
+            prompts: The prompts to send
+            max_concurrency: Maximum requests in flight, defaults to LLM_BATCH_MAX_CONCURRENCY
+            cache_prompts: Optional prompts to key the response cache on instead, one per prompt
+            reserve: Seconds of the request deadline left for the caller's fallbacks
+
+        Returns:
+            One response per prompt, or None for a prompt that failed every attempt.
+        """
+        keys = [self._cache_key(prompt, "text") for prompt in cache_prompts or prompts]
+        results: List[Optional[str]] = [await self._cache_get(key) for key in keys]
+
+        async def send(indices: List[int]):
+            outputs = await self.chat_model.abatch(
+                [prompts[i] for i in indices],
+                config=self._batch_config(max_concurrency),
+                return_exceptions=True
+            )
+            for i, output in zip(indices, outputs):
+                if isinstance(output, Exception):
+                    logger.warning("LLM batch item failed", error=str(output), model=self.model)
+                elif output.content:
+                    results[i] = output.content
+                    await self._cache_set(keys[i], output.content)
+
+        await self._run_batch([i for i, result in enumerate(results) if result is None], results, send, reserve)
+        return results
+
+    async def get_structured_responses(
+        self,
+        prompts: List[str],
+        response_model: Type[T],
+        pack_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        cache_prompts: Optional[List[str]] = None,
+        reserve: float = 0.0
+    ) -> List[Optional[T]]:
+        """
+        Sends many prompts and returns validated Pydantic models in order.
+
+        Up to `pack_size` prompts are packed into one request as numbered
+        tasks, answered in one structured response with a result per task
+        number, so each request pays its overhead once for several prompts.
+        Packed requests are sent with the chat model's `abatch`, at most
+        `max_concurrency` at a time. Prompts whose pack failed or whose result
+        is missing are repacked and retried, up to LLM_BATCH_MAX_RETRIES times.
+        Each round is cut off at the request deadline less `reserve`. Each
+        prompt is cached on its own, sharing entries with
+        `get_structured_response`.
+
+        Args:
+            prompts: The prompts to send
+            response_model: The Pydantic model of each prompt's response
+            pack_size: Prompts per request, defaults to LLM_BATCH_PACK_SIZE; 1 disables packing
+            max_concurrency: Maximum requests in flight, defaults to LLM_BATCH_MAX_CONCURRENCY
+            cache_prompts: Optional prompts to key the response cache on instead, one per prompt
+            reserve: Seconds of the request deadline left for the caller's fallbacks
+
+        Returns:
+            One response per prompt, or None for a prompt that failed every attempt.
+        """
+        pack_size = max(1, pack_size or settings.LLM_BATCH_PACK_SIZE)
+        keys = [self._cache_key(prompt, response_model.__name__) for prompt in cache_prompts or prompts]
+        results: List[Optional[T]] = []
+        for key in keys:
+            cached = await self._cache_get(key)
+            try:
+                results.append(response_model.model_validate_json(cached) if cached is not None else None)
+            except ValueError as e:
+                logger.warning("Discarding invalid cached structured response", error=str(e))
+                results.append(None)
+
+        if pack_size == 1:
+            structured_model = self.chat_model.with_structured_output(response_model)
+        else:
+            structured_model = self.chat_model.with_structured_output(packed_response_model(response_model))
+
+        async def send(indices: List[int]):
+            packs = [indices[start:start + pack_size] for start in range(0, len(indices), pack_size)]
+            outputs = await structured_model.abatch(
+                [prompts[pack[0]] if pack_size == 1 else pack_prompts([prompts[i] for i in pack]) for pack in packs],
+                config=self._batch_config(max_concurrency),
+                return_exceptions=True
+            )
+            for pack, output in zip(packs, outputs):
+                if isinstance(output, Exception):
+                    logger.warning("LLM batch request failed", error=str(output), prompts=len(pack), model=self.model)
+                    continue
+                answers = {1: output} if pack_size == 1 else {item.index: item.result for item in output.items}
+                for number, i in enumerate(pack, start=1):
+                    answer = answers.get(number)
+                    if isinstance(answer, BaseModel):
+                        results[i] = answer
+                        await self._cache_set(keys[i], answer.model_dump_json())
+
+        await self._run_batch([i for i, result in enumerate(results) if result is None], results, send, reserve)
+        return results
+
+    async def _run_batch(
+        self,
+        pending: List[int],
+        results: List[Any],
+        send: Callable[[List[int]], Awaitable[None]],
+        reserve: float = 0.0
+    ):
+        """
+        Send the pending prompts, then retry only those still without a result.
+
+        Like single requests, each round is capped to LLM_REQUEST_TIMEOUT and
+        the time left before the deadline, here less `reserve`; prompts still
+        unanswered when a round times out count as failed.
+        """
+        retries = 0
+        while pending:
+            try:
+                with self._timed():
+                    await asyncio.wait_for(send(pending), timeout=self._request_timeout(reserve))
+            except asyncio.TimeoutError:
+                logger.warning("LLM batch round timed out", pending=len(pending), model=self.model)
+            failed = [i for i in pending if results[i] is None]
+            LLM_BATCH_ITEMS.inc(len(pending) - len(failed), result="success")
+            if not failed:
+                return
+            if retries >= settings.LLM_BATCH_MAX_RETRIES or self._request_timeout(reserve) <= 0:
+                LLM_BATCH_ITEMS.inc(len(failed), result="failed")
+                logger.error("LLM batch items failed after retries", failed=len(failed), retries=retries, model=self.model)
+                return
+            retries += 1
+            LLM_BATCH_ITEMS.inc(len(failed), result="retried")
+            logger.warning("Retrying failed LLM batch items", failed=len(failed), retry=retries, model=self.model)
+            pending = failed
+
+    @staticmethod
+    def _batch_config(max_concurrency: Optional[int]) -> Dict[str, Any]:
+        """Build the runnable config capping a batch's requests in flight."""
+        return {"max_concurrency": max(1, max_concurrency or settings.LLM_BATCH_MAX_CONCURRENCY)}
+
+    @staticmethod
+    def _request_timeout(reserve: float = 0.0) -> float:
+        """Cap LLM_REQUEST_TIMEOUT to the time left before the request deadline, less `reserve`."""
+        return budget(settings.LLM_REQUEST_TIMEOUT, reserve=reserve)
+
+    @staticmethod
+    @contextmanager
+    def _timed() -> Iterator[None]:
+        """Record the duration of an LLM call, labelled with the current prompt type."""
+        start_time = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "success"
+        finally:
+            LLM_DURATION.observe(time.perf_counter() - start_time, prompt=current_llm_prompt(), outcome=outcome)
+
+    def _cache_key(self, prompt: str, kind: str) -> Optional[str]:
+        """Build the response cache key, or None when caching is disabled."""
+        if self.cache is None:
+            return None
+        return make_cache_key(self.model, settings.LLM_TEMPERATURE, prompt, kind)
+
+    async def _cache_get(self, key: Optional[str]) -> Optional[str]:
+        """Look up a cached response, treating cache failures as misses."""
+        if key is None:
+            return None
+        try:
+            value = await self.cache.get(key)
+        except Exception as e:
+            logger.warning("LLM cache lookup failed", error=str(e))
+            return None
+        CACHE_LOOKUPS.inc(cache="llm", result="miss" if value is None else "hit")
+        return value
+
+    async def _cache_set(self, key: Optional[str], value: str):
+        """Store a response, ignoring cache failures."""
+        if key is None:
+            return
+        try:
+            await self.cache.set(key, value)
+        except Exception as e:
+            logger.warning("LLM cache store failed", error=str(e))
+
+
+def pack_prompts(prompts: List[str]) -> str:
+    """
+    Pack prompts into one prompt of numbered tasks.
+
+    Args:
+        prompts: The prompts to pack, numbered from 1 in order
+
+    Returns:
+        A prompt asking for one result per task number.
+    """
+    tasks = "\n\n".join(f"### Task {number}\n{prompt}" for number, prompt in enumerate(prompts, start=1))
+    return PACKED_TASKS_PROMPT.format(count=len(prompts), tasks=tasks)
+
+
+@lru_cache(maxsize=None)
+def packed_response_model(response_model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Build the structured output schema for a packed request.
+
+    Args:
+        response_model: The model of each task's result
+
+    Returns:
+        A model with an `items` list of (task number, result) pairs.
+    """
+    item_model = create_model(
+        f"Packed{response_model.__name__}Item",
+        index=(int, Field(..., description="The number of the task this result answers")),
+        result=(response_model, Field(..., description="The result of the task"))
+    )
+    return create_model(
+        f"Packed{response_model.__name__}",
+        __doc__=f"One {response_model.__name__} result per numbered task.",
+        items=(List[item_model], Field(..., description="One result per task"))
+    )
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    Records the duration of chat model calls made outside the gateway, e.g. by the agent executor.
+
+    Only calls made while the current prompt type is `prompt` are recorded, so
+    gateway calls nested inside agent tools, which record themselves, are not
+    counted twice.
+    """
+
+    run_inline = True
+
+    def __init__(self, prompt: str):
+        self.prompt = prompt
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID, **kwargs: Any):
+        if current_llm_prompt() == self.prompt:
+            self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any):
+        self._finish(run_id, "success")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self._finish(run_id, "error")
+
+    def _finish(self, run_id: UUID, outcome: str):
+        start_time = self._started.pop(run_id, None)
+        if start_time is not None:
+            LLM_DURATION.observe(time.perf_counter() - start_time, prompt=self.prompt, outcome=outcome)
+
+
+class LLMGatewayRegistry:
+    """
+    Holds one shared LLMGateway per provider/model configuration.
+
+    Building a gateway creates a new chat model and API client, so callers
+    should look gateways up here instead of constructing them per call.
+    """
+
+    def __init__(self):
+        self._gateways: Dict[Tuple, LLMGateway] = {}
+
+    @staticmethod
+    def _key(model: Optional[str]) -> Tuple:
+        """Build the registry key from everything that shapes the chat model."""
+        return (
+            model or settings.LLM_MODEL,
+            settings.LLM_API_BASE_URL,
+            settings.LLM_TEMPERATURE,
+            settings.LLM_REQUEST_TIMEOUT
+        )
+
+    def get(self, model: Optional[str] = None) -> LLMGateway:
+        """
+        Return the shared gateway for a model, creating it on first use.
+
+        Args:
+            model: Optional model name, defaults to LLM_MODEL
+
+        Returns:
+            The shared LLMGateway instance.
+        """
+        key = self._key(model)
+        gateway = self._gateways.get(key)
+        if gateway is None:
+            gateway = LLMGateway(model=model, cache=get_llm_cache())
+            self._gateways[key] = gateway
+        return gateway
+
+    def register(self, gateway: LLMGateway, model: Optional[str] = None):
+        """
+        Inject a gateway to be returned for a model, e.g. a preconfigured or fake one.
+
+        Args:
+            gateway: The gateway to share
+            model: Optional model name, defaults to LLM_MODEL
+        """
+        self._gateways[self._key(model)] = gateway
+
+    def clear(self):
+        """Forget all shared gateways."""
+        self._gateways.clear()
+
+
+# Shared registry used by agents and tools
+llm_gateway_registry = LLMGatewayRegistry()
+
+
+def get_llm_gateway(model: Optional[str] = None) -> LLMGateway:
+    """Return the shared LLMGateway for the given or configured model."""
+    return llm_gateway_registry.get(model)
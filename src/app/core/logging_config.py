@@ -1,22 +1,105 @@
 """
 Configures structured logging for the application using structlog.
 """
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
 import sys
 import os
+from typing import Dict, Optional
 import structlog
 from structlog.types import Processor
 
 from .config import settings
+from .metrics import metrics
 
 SILENT_LOGGERS = ["pytest", "test"]
+LOG_QUEUE_DROP_POLICIES = ("drop_new", "drop_oldest")
 
-def setup_logging():
+LOG_RECORDS_DROPPED = metrics.counter(
+    "meeting_agent_log_records_dropped_total",
+    "Log records dropped because the log queue was full."
+)
+LOG_QUEUE_DEPTH = metrics.gauge("meeting_agent_log_queue_depth", "Log records waiting to be written.")
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands log records to a background thread through a bounded queue.
+
+    Records are enqueued as they are, so rendering and file I/O happen on the
+    listener thread instead of the event loop. Logging never blocks: when the
+    queue is full the newest record ("drop_new") or the oldest queued record
+    ("drop_oldest") is dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue, drop_policy: str = "drop_new"):
+        if drop_policy not in LOG_QUEUE_DROP_POLICIES:
+            raise ValueError(f"Unsupported log queue drop policy: {drop_policy}")
+        super().__init__(log_queue)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Enqueue the record unformatted; the listener's handlers render it."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """Enqueue a record without blocking, applying the drop policy when full."""
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        self._count_drop()
+        if self.drop_policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                self._count_drop()
+
+    def _count_drop(self):
+        self.dropped += 1
+        LOG_RECORDS_DROPPED.inc()
+
+
+class _BoundedQueueListener(logging.handlers.QueueListener):
+    """A QueueListener that can always be stopped, even while its queue is full."""
+
+    def enqueue_sentinel(self):
+        # Wait for room rather than fail: the listener thread is draining the queue
+        self.queue.put(self._sentinel)
+
+
+# The active queue handler and listener, when LOG_QUEUE_ENABLED
+_queue_handler: Optional[BoundedQueueHandler] = None
+_queue_listener: Optional[_BoundedQueueListener] = None
+_configured = False
+
+
+def setup_logging(force: bool = False):
     """
     Configures structlog for structured logging.
     Logs will be written to console and optionally to a local file.
+    
+    With LOG_QUEUE_ENABLED the root logger only enqueues records, and a
+    background thread renders and writes them.
+    
+    Every module may call this; logging is only configured once per process
+    unless `force` is set, e.g. after changing settings.
     """
+    global _configured
+    if _configured and not force:
+        return
+    _configured = True
+    
+    # Flush and stop the previous listener before its handlers are replaced
+    _stop_queue_listener()
+
     # Configure structlog
     timestamper = structlog.processors.TimeStamper(fmt="iso")
 
@@ -89,6 +172,57 @@ def setup_logging():
         }
     })
 
+    if settings.LOG_QUEUE_ENABLED:
+        _start_queue_listener()
+
+
+def _start_queue_listener():
+    """Move the root logger's handlers behind a bounded queue and a listener thread."""
+    global _queue_handler, _queue_listener
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+
+    _queue_handler = BoundedQueueHandler(
+        queue.Queue(maxsize=settings.LOG_QUEUE_MAX_SIZE),
+        drop_policy=settings.LOG_QUEUE_DROP_POLICY
+    )
+    root.addHandler(_queue_handler)
+    _queue_listener = _BoundedQueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def _stop_queue_listener():
+    """Write out all queued records and stop the listener thread, if running."""
+    global _queue_listener
+    listener, _queue_listener = _queue_listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def log_queue_stats() -> Dict[str, object]:
+    """Return the log queue's depth, capacity, drop policy and dropped record count."""
+    if _queue_handler is None or _queue_listener is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "queue_depth": _queue_handler.queue.qsize(),
+        "max_size": _queue_handler.queue.maxsize,
+        "drop_policy": _queue_handler.drop_policy,
+        "dropped": _queue_handler.dropped,
+    }
+
+
+def _collect_log_queue_metrics():
+    """Set the log queue depth gauge at scrape time."""
+    LOG_QUEUE_DEPTH.set(log_queue_stats().get("queue_depth", 0))
+
+
+metrics.on_collect(_collect_log_queue_metrics)
+atexit.register(_stop_queue_listener)
+
+
 def get_logger(name: str):
     """
     Returns a structlog logger instance for the given name.
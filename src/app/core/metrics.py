@@ -0,0 +1,345 @@
+"""
+Process-wide counters and latency histograms in the Prometheus text format.
+
+Every stage of meeting preparation records here: tool calls, planning,
+upstream fetches per service, LLM calls per prompt type, agent iterations,
+formatting, fallbacks and cache lookups. The server exposes the registry on
+its metrics route so slow stages can be found without searching the logs.
+"""
+import math
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from .config import settings
+
+# Upper bounds in seconds, from a cache hit to a slow agent run
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Prompt type used to label LLM calls made by the current task
+_llm_prompt: ContextVar[str] = ContextVar("llm_prompt", default="other")
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a label set, e.g. `{service="trivia",le="0.5"}`."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, using the format's spelling of infinity."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric(ABC):
+    """A named metric family with a fixed set of label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Return the label values in declaration order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        """Return the HELP and TYPE lines followed by every sample line."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Return the sample lines of every labelled series. Must be implemented by subclasses."""
+
+    @abstractmethod
+    def reset(self):
+        """Drop every recorded series. Must be implemented by subclasses."""
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        """Add to the count for a label set."""
+        if not settings.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the count for a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+    def reset(self):
+        self._values.clear()
+
+
+class Gauge(_Metric):
+    """A value per label set that is set at collection time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str):
+        """Set the value for a label set."""
+        self._values[self._key(labels)] = float(value)
+
+    def value(self, **labels: str) -> float:
+        """Return the value for a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+    def reset(self):
+        self._values.clear()
+
+
+class _HistogramSeries:
+    """Bucket counts, sum and count for one label set."""
+
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Counts observations into cumulative buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str):
+        """Record one observation for a label set."""
+        if not settings.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _HistogramSeries(len(self.bounds))
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                series.buckets[index] += 1
+                break
+        series.sum += value
+        series.count += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time spent inside the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        """Return the number of observations for a label set."""
+        series = self._series.get(self._key(labels))
+        return series.count if series else 0
+
+    def sum(self, **labels: str) -> float:
+        """Return the sum of observations for a label set."""
+        series = self._series.get(self._key(labels))
+        return series.sum if series else 0.0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.bounds, series.buckets):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{labels} {series.count}")
+        return lines
+
+    def reset(self):
+        self._series.clear()
+
+
+class MetricsRegistry:
+    """Holds metric families by name and renders them for scraping."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        """Return the registered metric with the same name, registering this one if new."""
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered differently")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Return the counter with this name, creating it on first use."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Return the gauge with this name, creating it on first use."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Return the histogram with this name, creating it on first use."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def on_collect(self, collector: Callable[[], None]):
+        """Run a callback before every render, e.g. to set gauges from live state."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Zero every metric, keeping the registered families and collectors."""
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+@contextmanager
+def llm_prompt(name: str) -> Iterator[None]:
+    """Label the LLM calls made inside the block with a prompt type."""
+    token = _llm_prompt.set(name)
+    try:
+        yield
+    finally:
+        _llm_prompt.reset(token)
+
+
+def current_llm_prompt() -> str:
+    """Return the prompt type for LLM calls made by the current task."""
+    return _llm_prompt.get()
+
+
+# Shared registry scraped by the server's metrics route
+metrics = MetricsRegistry()
+
+REQUEST_DURATION = metrics.histogram(
+    "meeting_agent_request_duration_seconds",
+    "Time to answer a prepare_meeting tool call.",
+    ("mode", "outcome")
+)
+PLANNING_DURATION = metrics.histogram(
+    "meeting_agent_planning_duration_seconds",
+    "Time spent planning meeting notes, excluding any fallback.",
+    ("mode", "outcome")
+)
+PLANNER_FALLBACKS = metrics.counter(
+    "meeting_agent_planner_fallbacks_total",
+    "Plannings that fell back to direct service calls.",
+    ("reason",)
+)
+UPSTREAM_DURATION = metrics.histogram(
+    "meeting_agent_upstream_request_duration_seconds",
+    "Time to get upstream API data, including hedging and rate-limit waits.",
+    ("service", "outcome")
+)
+UPSTREAM_RETRIES = metrics.counter(
+    "meeting_agent_upstream_retries_total",
+    "Retry decisions for failed upstream requests: retried, or why not (attempts, max_wait, deadline, budget).",
+    ("service", "decision")
+)
+SERVICE_FALLBACKS = metrics.counter(
+    "meeting_agent_service_fallbacks_total",
+    "Upstream requests answered with fallback data.",
+    ("service", "reason")
+)
+LLM_DURATION = metrics.histogram(
+    "meeting_agent_llm_request_duration_seconds",
+    "Time spent in LLM calls that were not served from cache.",
+    ("prompt", "outcome")
+)
+AGENT_TOOL_DURATION = metrics.histogram(
+    "meeting_agent_tool_duration_seconds",
+    "Time spent in each agent tool.",
+    ("tool",)
+)
+AGENT_ITERATIONS = metrics.histogram(
+    "meeting_agent_agent_iterations",
+    "Tool calls made by the agent per planning run.",
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15)
+)
+FORMATTER_DURATION = metrics.histogram(
+    "meeting_agent_formatter_duration_seconds",
+    "Time spent formatting meeting notes.",
+    ("formatter",)
+)
+CACHE_LOOKUPS = metrics.counter(
+    "meeting_agent_cache_lookups_total",
+    "Cache lookups by cache and result.",
+    ("cache", "result")
+)
+ADMISSION_REJECTIONS = metrics.counter(
+    "meeting_agent_admission_rejected_total",
+    "Requests rejected by admission control.",
+    ("reason",)
+)
+LLM_BATCH_ITEMS = metrics.counter(
+    "meeting_agent_llm_batch_items_total",
+    "Prompts sent through the LLM batch API by result: success, retried or failed.",
+    ("result",)
+)
@@ -0,0 +1,164 @@
+"""
+Precomputed meeting notes for recurring meeting contexts.
+
+`MeetingNotesCache` holds complete meeting notes for a set of tracked
+(mode, context) pairs, so the planner can answer those requests from memory.
+`MeetingNotesWarmer` keeps the tracked entries fresh by re-planning them on a
+schedule in the background; with a shared content store, only the worker
+process holding the warming lease does so.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .config import settings
+from .context_normalizer import canonicalize_context
+from .logging_config import get_logger
+from .metrics import CACHE_LOOKUPS
+from .shared_store import get_shared_store
+
+logger = get_logger(__name__)
+
+# Shared-store lease held by the one worker process that warms notes
+WARMING_LEASE = "meeting_notes_warming"
+
+
+class MeetingNotesCache:
+    """
+    Caches finished meeting notes for tracked meeting contexts.
+
+    Only tracked (mode, context) pairs are ever stored, so ad-hoc meetings
+    keep getting freshly planned notes. Entries expire after `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._tracked: Set[Tuple[str, str]] = set()
+        self._entries: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def track(self, mode: str, meeting_context: str):
+        """Allow notes for a canonical meeting context and mode to be cached."""
+        self._tracked.add((mode, meeting_context))
+
+    def tracked(self) -> List[Tuple[str, str]]:
+        """Return the tracked (mode, context) pairs."""
+        return sorted(self._tracked)
+
+    def get(self, mode: str, meeting_context: str) -> Optional[str]:
+        """
+        Return cached notes for the canonical meeting context.
+
+        Returns:
+            The notes, or None if missing or expired.
+        """
+        key = (mode, meeting_context)
+        if key not in self._tracked:
+            return None
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] >= self.ttl:
+            CACHE_LOOKUPS.inc(cache="meeting_notes", result="miss")
+            return None
+        CACHE_LOOKUPS.inc(cache="meeting_notes", result="hit")
+        return entry[0]
+
+    def store(self, mode: str, meeting_context: str, notes: str):
+        """Cache notes if the meeting context is tracked."""
+        key = (mode, meeting_context)
+        if self.ttl > 0 and key in self._tracked:
+            self._entries[key] = (notes, time.monotonic())
+
+    def clear(self):
+        """Drop all cached notes and tracked contexts."""
+        self._tracked.clear()
+        self._entries.clear()
+
+
+class MeetingNotesWarmer:
+    """
+    Precomputes meeting notes for recurring contexts in the background.
+
+    Every `interval` seconds each tracked context (always including the
+    general, empty context) is planned afresh through the planner, which
+    stores the result in its notes cache. Contexts are planned one at a time,
+    `spacing` seconds apart, so warming stays within upstream API rate limits
+    and leaves capacity for live requests. When worker processes share a
+    content store, a round only runs in the worker holding the warming lease,
+    so the upstream APIs see one warmer however many workers there are.
+    """
+
+    def __init__(self, planner: Any, contexts: Iterable[str], mode: str, interval: float, spacing: float = 0.0):
+        """
+        Args:
+            planner: The MeetingPlannerAgent whose notes cache is warmed
+            contexts: Recurring meeting contexts to precompute
+            mode: Planner mode used for warming
+            interval: Seconds between warming rounds
+            spacing: Seconds between planning two contexts within a round
+        """
+        self.planner = planner
+        self.mode = mode
+        self.interval = interval
+        self.spacing = spacing
+        # One phrasing per canonical context, planned as written
+        phrasings: Dict[str, str] = {"": ""}
+        for context in contexts:
+            phrasings.setdefault(canonicalize_context(context), context)
+        self.contexts = list(phrasings.values())
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Track the contexts and start warming in the background, if not already running."""
+        if self._task is not None and not self._task.done():
+            return
+        for context in self.contexts:
+            self.planner.notes_cache.track(self.mode, canonicalize_context(context))
+        self._task = asyncio.create_task(self._run())
+        logger.info("Started meeting notes warming", contexts=len(self.contexts), interval_seconds=self.interval)
+
+    async def stop(self):
+        """Stop background warming."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def warm_once(self) -> int:
+        """
+        Plan every context once and refresh its cached notes.
+
+        Returns:
+            The number of contexts warmed successfully.
+        """
+        warmed = 0
+        for index, context in enumerate(self.contexts):
+            if index and self.spacing:
+                await asyncio.sleep(self.spacing)
+            try:
+                await self.planner.plan_meeting(context, mode=self.mode, refresh=True)
+                warmed += 1
+            except Exception as e:
+                logger.warning("Failed to warm meeting notes", context=context, error=str(e))
+        logger.info("Warmed meeting notes", warmed=warmed, contexts=len(self.contexts))
+        return warmed
+
+    async def _run(self):
+        """Warm all contexts every interval until stopped, in one worker process at a time."""
+        store = get_shared_store()
+        try:
+            while True:
+                # The holder renews its lease every round; it lapses if the holder stops
+                if store is None or await store.acquire_lease(WARMING_LEASE, 2 * self.interval):
+                    await self.warm_once()
+                else:
+                    logger.debug("Meeting notes are warmed by another worker")
+                await asyncio.sleep(self.interval)
+        finally:
+            if store is not None:
+                await store.release_lease(WARMING_LEASE)
@@ -0,0 +1,156 @@
+"""
+Progress reporting for meeting planning.
+
+The planner reports each content section as soon as it is ready and streams
+the formatted notes token by token. `PlanningListener` ignores everything;
+`MCPProgressReporter` forwards it to an MCP client as progress and log
+notifications.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Section keys reported by the planner, with their display titles
+SECTION_TITLES: Dict[str, str] = {
+    "trivia": "Tech Trivia",
+    "fun_fact": "Fun Fact",
+    "trending_repos": "Trending Repositories",
+}
+
+
+class PlanningListener:
+    """Receives meeting planning progress. The default implementation ignores it."""
+
+    async def on_section(self, section: str, content: str):
+        """Called when a content section is ready."""
+
+    async def on_token(self, text: str):
+        """Called with each chunk of the streamed meeting notes."""
+
+    async def on_complete(self, notes: str):
+        """Called once with the final meeting notes."""
+
+
+class BroadcastListener(PlanningListener):
+    """
+    Fans planning events out to every caller sharing one planning run.
+
+    Events are recorded, and a listener subscribing part-way through first
+    receives the events it missed, in order, before any new ones.
+    """
+
+    def __init__(self):
+        self._listeners: List[PlanningListener] = []
+        self._events: List[Tuple[str, Tuple[Any, ...]]] = []
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, listener: PlanningListener):
+        """Replay past events to the listener and add it to the audience."""
+        async with self._lock:
+            for event, args in self._events:
+                await notify(listener, event, *args)
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: PlanningListener):
+        """Stop sending events to the listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def on_section(self, section: str, content: str):
+        await self._publish("on_section", section, content)
+
+    async def on_token(self, text: str):
+        await self._publish("on_token", text)
+
+    async def on_complete(self, notes: str):
+        await self._publish("on_complete", notes)
+
+    async def _publish(self, event: str, *args: Any):
+        """Record an event and deliver it to the current audience."""
+        async with self._lock:
+            self._events.append((event, args))
+            for listener in list(self._listeners):
+                await notify(listener, event, *args)
+
+
+class MCPProgressReporter(PlanningListener):
+    """
+    Streams meeting planning progress to an MCP client through its Context.
+
+    Sections are sent as info log messages (with the section key in `extra`)
+    and counted as progress steps. Streamed tokens are buffered and flushed
+    at line breaks or once `flush_chars` characters have accumulated, to
+    avoid one notification per token.
+    """
+
+    def __init__(self, ctx: Any, flush_chars: int = 200):
+        """
+        Args:
+            ctx: The MCP tool Context
+            flush_chars: Buffered characters that trigger a token flush
+        """
+        self.ctx = ctx
+        self.flush_chars = flush_chars
+        self.total_steps = len(SECTION_TITLES) + 1
+        self._completed_steps = 0
+        self._buffer = ""
+
+    async def on_section(self, section: str, content: str):
+        """Send a ready section and advance progress."""
+        title = SECTION_TITLES.get(section, section)
+        self._completed_steps = min(self._completed_steps + 1, self.total_steps - 1)
+        await self._send(
+            self.ctx.report_progress(self._completed_steps, self.total_steps, f"{title} ready")
+        )
+        await self._send(
+            self.ctx.info(f"{title}:\n{content}", logger_name="meeting_notes", extra={"section": section})
+        )
+
+    async def on_token(self, text: str):
+        """Buffer a streamed chunk, flushing complete lines or large buffers."""
+        self._buffer += text
+        if "\n" in text or len(self._buffer) >= self.flush_chars:
+            await self._flush()
+
+    async def on_complete(self, notes: str):
+        """Flush remaining streamed text and mark progress as complete."""
+        await self._flush()
+        await self._send(
+            self.ctx.report_progress(self.total_steps, self.total_steps, "Meeting notes ready")
+        )
+
+    async def _flush(self):
+        """Send buffered streamed text, if any."""
+        if not self._buffer:
+            return
+        text, self._buffer = self._buffer, ""
+        await self._send(
+            self.ctx.info(text, logger_name="meeting_notes", extra={"section": "notes", "partial": True})
+        )
+
+    async def _send(self, notification):
+        """Await a notification, never letting a client error break planning."""
+        try:
+            await notification
+        except Exception as e:
+            logger.warning("Failed to send progress notification", error=str(e))
+
+
+async def notify(listener: Optional[PlanningListener], event: str, *args: Any):
+    """
+    Call a listener event if there is a listener, logging instead of raising on failure.
+
+    Args:
+        listener: The listener, or None
+        event: The listener method name, e.g. "on_section"
+        *args: Arguments for the event
+    """
+    if listener is None:
+        return
+    try:
+        await getattr(listener, event)(*args)
+    except Exception as e:
+        logger.warning("Planning listener failed", listen_event=event, error=str(e))
@@ -0,0 +1,153 @@
+"""
+Client-side rate limiting for upstream APIs.
+
+Each rate-limited host has a token bucket refilled at its configured rate.
+Requests take a token, waiting briefly for one if necessary; a request that
+would have to wait too long is refused so the caller can serve local content
+instead of spending the request on a 429. With MCP_WORKERS above one, each
+worker process gets an equal share of a host's rate, so together they stay
+within its quota.
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from .config import settings
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request cannot be sent without exceeding the host's rate limit."""
+
+
+class TokenBucket:
+    """
+    A token bucket allowing `rate` requests per second with bursts of up to `burst`.
+
+    Waiting callers reserve their token up front (the balance may go negative),
+    so concurrent waiters are spaced out in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+
+    def _refill(self):
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def available(self) -> bool:
+        """Return whether a token is available right now, without taking it."""
+        self._refill()
+        return self._tokens >= 1
+
+    def wait_time(self) -> float:
+        """Return the seconds until a token is available, zero if one is available now."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self, max_wait: float) -> bool:
+        """
+        Take a token, waiting for it if it becomes available within `max_wait` seconds.
+
+        Args:
+            max_wait: The longest acceptable wait in seconds
+
+        Returns:
+            True once a token is taken, False (without waiting) if it would take too long.
+        """
+        if self.try_acquire():
+            return True
+        wait = (1 - self._tokens) / self.rate
+        if wait > max_wait:
+            return False
+
+        self._tokens -= 1
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            # Hand the reserved token to the next caller
+            self._tokens += 1
+            raise
+        return True
+
+
+class RateLimiterRegistry:
+    """Holds one token bucket per rate-limited host, configured from RATE_LIMITS."""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, url: str) -> Optional[TokenBucket]:
+        """Return the bucket for the URL's host, or None if the host is not rate limited."""
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        host = urlsplit(url).hostname or ""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = settings.RATE_LIMITS.get(host)
+            if not rate or rate <= 0:
+                return None
+            # Worker processes do not share buckets, so each takes its share of the quota
+            rate /= max(1, settings.MCP_WORKERS)
+            bucket = self._buckets[host] = TokenBucket(rate, settings.RATE_LIMIT_BURST)
+        return bucket
+
+    async def acquire(self, url: str, max_wait: float):
+        """
+        Wait for permission to send a request to the URL.
+
+        Args:
+            url: The request URL
+            max_wait: The longest acceptable wait in seconds
+
+        Raises:
+            RateLimitExceeded: If no token becomes available within `max_wait`
+        """
+        bucket = self.bucket(url)
+        if bucket is not None and not await bucket.acquire(max_wait):
+            logger.info("Upstream rate limit reached", url=url, rate=bucket.rate)
+            raise RateLimitExceeded(f"Rate limit reached for {url}")
+
+    def available(self, url: str) -> bool:
+        """Return whether a request to the URL could be sent right now without waiting."""
+        bucket = self.bucket(url)
+        return bucket is None or bucket.available()
+
+    def wait_time(self, url: str) -> float:
+        """Return the seconds until a request to the URL could be sent without exceeding its host's rate limit."""
+        bucket = self.bucket(url)
+        return 0.0 if bucket is None else bucket.wait_time()
+
+    def interval(self, url: str) -> float:
+        """Return the seconds between two tokens for the URL's host, zero if the host is not rate limited."""
+        bucket = self.bucket(url)
+        return 0.0 if bucket is None else 1 / bucket.rate
+
+    def try_acquire(self, url: str) -> bool:
+        """Take a token for the URL's host if one is available right now."""
+        bucket = self.bucket(url)
+        return bucket is None or bucket.try_acquire()
+
+    def clear(self):
+        """Forget all buckets so they are rebuilt from settings."""
+        self._buckets.clear()
+
+
+# Shared limiters for all upstream HTTP services
+rate_limiters = RateLimiterRegistry()
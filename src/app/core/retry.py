@@ -0,0 +1,163 @@
+"""
+Retry policies and retry budgets for upstream HTTP endpoints.
+
+A retry policy decides how a service retries a response such as a 429 or 503:
+how many attempts it makes, and how long it waits between them (exponential
+backoff with full jitter, or longer if the response's Retry-After asks for
+it). A retry budget per endpoint caps retries at a share of recent requests,
+so an endpoint that is failing for everyone does not get a retry storm on
+top of its normal load.
+"""
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Optional, Tuple
+
+from .config import settings
+from .latency import endpoint_key
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How one service retries failed upstream requests."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 2.0
+    max_wait: float = 5.0
+    statuses: Tuple[int, ...] = (429, 502, 503, 504)
+
+    def retries(self, status: int) -> bool:
+        """Return whether a response with this status is worth retrying."""
+        return self.max_attempts > 1 and status in self.statuses
+
+    def backoff(self, retry: int) -> float:
+        """
+        Return a random delay before a retry, using exponential backoff with full jitter.
+
+        Args:
+            retry: The number of the retry about to be made, starting at 1
+
+        Returns:
+            A delay between zero and `base_delay * 2 ** (retry - 1)`, capped at `max_delay`.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+
+def retry_policy(service: str) -> RetryPolicy:
+    """
+    Return the retry policy for a service, from the RETRY_* defaults and its RETRY_POLICIES entry.
+
+    Args:
+        service: Service name, e.g. "TechTriviaService"
+
+    Returns:
+        The service's RetryPolicy; retries are disabled if RETRY_ENABLED is not set.
+    """
+    if not settings.RETRY_ENABLED:
+        return RetryPolicy(max_attempts=1)
+    overrides = dict(settings.RETRY_POLICIES.get(service, {}))
+    if "statuses" in overrides:
+        overrides["statuses"] = tuple(overrides["statuses"])
+    return RetryPolicy(
+        **{
+            "max_attempts": settings.RETRY_MAX_ATTEMPTS,
+            "base_delay": settings.RETRY_BASE_DELAY,
+            "max_delay": settings.RETRY_MAX_DELAY,
+            "max_wait": settings.RETRY_MAX_WAIT,
+            "statuses": tuple(settings.RETRY_STATUSES),
+            **overrides,
+        }
+    )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Args:
+        value: The header value, if the response had one
+
+    Returns:
+        Seconds to wait (never negative), or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """
+    Limits retries to an endpoint to a share of its recent requests.
+
+    Within the last `window` seconds, retries may make up at most `ratio` of
+    the requests sent, with at least `min_retries` allowed so that a quiet
+    endpoint can still be retried.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window: float = 10.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+
+    def _expire(self, now: float):
+        """Forget requests and retries older than the window."""
+        for times in (self._requests, self._retries):
+            while times and now - times[0] > self.window:
+                times.popleft()
+
+    def record_request(self):
+        """Count a first attempt at a request."""
+        now = time.monotonic()
+        self._expire(now)
+        self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        """Count a retry if the budget allows one right now."""
+        now = time.monotonic()
+        self._expire(now)
+        if len(self._retries) >= max(self.min_retries, self.ratio * len(self._requests)):
+            return False
+        self._retries.append(now)
+        return True
+
+
+class RetryBudgetRegistry:
+    """Holds one retry budget per endpoint, configured from settings."""
+
+    def __init__(self):
+        self._budgets: Dict[str, RetryBudget] = {}
+
+    def get(self, url: str) -> RetryBudget:
+        """Return the retry budget for the URL's endpoint, creating it on first use."""
+        key = endpoint_key(url)
+        retry_budget = self._budgets.get(key)
+        if retry_budget is None:
+            retry_budget = self._budgets[key] = RetryBudget(
+                ratio=settings.RETRY_BUDGET_RATIO,
+                min_retries=settings.RETRY_BUDGET_MIN_RETRIES,
+                window=settings.RETRY_BUDGET_WINDOW
+            )
+        return retry_budget
+
+    def clear(self):
+        """Forget all retry budgets."""
+        self._budgets.clear()
+
+
+# Shared retry budgets for all upstream HTTP services
+retry_budgets = RetryBudgetRegistry()
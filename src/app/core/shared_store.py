@@ -0,0 +1,273 @@
+"""
+Provides a SQLite store for content shared between server worker processes.
+
+With MCP_WORKERS above one, every worker would otherwise fetch its own
+batches from the upstream APIs. Instead, a worker that needs content first
+claims items another worker fetched but did not keep, and only one worker at
+a time fetches a new batch for a pool, holding a short lease while it does.
+The database runs in WAL mode so readers never block the writer.
+"""
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Hashable
+from typing import Awaitable, Callable, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .config import settings
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+M = TypeVar('M', bound=BaseModel)
+
+# Seconds a writer waits for another process's lock before failing
+BUSY_TIMEOUT = 5.0
+
+
+def open_shared_database(path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database that several processes read and write concurrently.
+
+    Args:
+        path: Database file, created along with its directory if missing
+
+    Returns:
+        A connection in WAL mode with a busy timeout, usable from any thread.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class SharedContentStore:
+    """
+    Content items and fetch leases shared by all worker processes.
+
+    Items are stored as JSON per pool and claimed atomically, so an item is
+    handed to exactly one worker. Queries run in a worker thread so the event
+    loop is never blocked on disk I/O.
+    """
+
+    def __init__(self, path: str, max_items_per_pool: int):
+        self.path = path
+        self.max_items_per_pool = max_items_per_pool
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self._connection = open_shared_database(path)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS shared_items ("
+                "pool TEXT NOT NULL, key TEXT NOT NULL, payload TEXT NOT NULL, added_at REAL NOT NULL, "
+                "PRIMARY KEY (pool, key))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fetch_leases (pool TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def size(self, pool: str) -> int:
+        """Return the number of unclaimed items in a pool."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM shared_items WHERE pool = ?", (pool,)).fetchone()[0]
+
+    async def put(self, pool: str, items: List[Tuple[str, str]]) -> int:
+        """
+        Add items that are not already queued, up to the per-pool limit.
+
+        Args:
+            pool: Pool name
+            items: (key, JSON payload) pairs
+
+        Returns:
+            The number of items added.
+        """
+        return await asyncio.to_thread(self._put_sync, pool, items)
+
+    async def claim(self, pool: str, limit: int) -> List[str]:
+        """
+        Remove and return up to `limit` of the oldest items in a pool.
+
+        Args:
+            pool: Pool name
+            limit: Maximum number of items to claim
+
+        Returns:
+            The JSON payloads of the claimed items.
+        """
+        return await asyncio.to_thread(self._claim_sync, pool, limit)
+
+    async def acquire_lease(self, pool: str, seconds: float) -> bool:
+        """
+        Take the fetch lease for a pool unless another process holds an unexpired one.
+
+        Args:
+            pool: Pool name
+            seconds: Lease duration, after which another process may take over
+
+        Returns:
+            Whether this process now holds the lease.
+        """
+        return await asyncio.to_thread(self._acquire_lease_sync, pool, seconds)
+
+    async def release_lease(self, pool: str):
+        """Release this process's fetch lease for a pool."""
+        await asyncio.to_thread(self._release_lease_sync, pool)
+
+    async def lease_held(self, pool: str) -> bool:
+        """Return whether another process holds an unexpired fetch lease for a pool."""
+        return await asyncio.to_thread(self._lease_held_sync, pool)
+
+    def clear(self, pool: Optional[str] = None):
+        """Drop the items and leases of one pool, or of every pool."""
+        with self._lock, self._connection:
+            if pool is None:
+                self._connection.execute("DELETE FROM shared_items")
+                self._connection.execute("DELETE FROM fetch_leases")
+            else:
+                self._connection.execute("DELETE FROM shared_items WHERE pool = ?", (pool,))
+                self._connection.execute("DELETE FROM fetch_leases WHERE pool = ?", (pool,))
+
+    def _put_sync(self, pool: str, items: List[Tuple[str, str]]) -> int:
+        now = time.time()
+        with self._lock, self._connection:
+            size = self._connection.execute("SELECT COUNT(*) FROM shared_items WHERE pool = ?", (pool,)).fetchone()[0]
+            added = 0
+            for key, payload in items:
+                if size + added >= self.max_items_per_pool:
+                    break
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO shared_items (pool, key, payload, added_at) VALUES (?, ?, ?, ?)",
+                    (pool, key, payload, now)
+                )
+                added += cursor.rowcount
+            return added
+
+    def _claim_sync(self, pool: str, limit: int) -> List[str]:
+        with self._lock, self._connection:
+            # A single DELETE ... RETURNING is atomic across processes
+            rows = self._connection.execute(
+                "DELETE FROM shared_items WHERE rowid IN ("
+                "SELECT rowid FROM shared_items WHERE pool = ? ORDER BY added_at, rowid LIMIT ?) "
+                "RETURNING payload",
+                (pool, limit)
+            ).fetchall()
+            return [row[0] for row in rows]
+
+    def _acquire_lease_sync(self, pool: str, seconds: float) -> bool:
+        now = time.time()
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO fetch_leases (pool, holder, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (pool) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+                "WHERE fetch_leases.expires_at <= ? OR fetch_leases.holder = excluded.holder",
+                (pool, self.holder, now + seconds, now)
+            )
+            return cursor.rowcount == 1
+
+    def _release_lease_sync(self, pool: str):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM fetch_leases WHERE pool = ? AND holder = ?", (pool, self.holder))
+
+    def _lease_held_sync(self, pool: str) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM fetch_leases WHERE pool = ? AND holder != ? AND expires_at > ?",
+                (pool, self.holder, time.time())
+            ).fetchone()
+            return row is not None
+
+
+_shared_store: Optional[SharedContentStore] = None
+
+
+def get_shared_store() -> Optional[SharedContentStore]:
+    """
+    Return the process-wide shared content store configured in settings.
+
+    Returns:
+        The shared store, or None if SHARED_CONTENT_ENABLED is not set.
+    """
+    global _shared_store
+    if not settings.SHARED_CONTENT_ENABLED:
+        return None
+    if _shared_store is None:
+        _shared_store = SharedContentStore(settings.SHARED_CONTENT_PATH, settings.SHARED_CONTENT_MAX_ITEMS)
+        logger.info("Initialized shared content store", path=settings.SHARED_CONTENT_PATH)
+    return _shared_store
+
+
+def reset_shared_store():
+    """Forget the process-wide store so the next lookup reopens it from settings."""
+    global _shared_store
+    if _shared_store is not None:
+        _shared_store.close()
+    _shared_store = None
+
+
+def shared_fetch(
+    pool: str,
+    fetch_batch: Callable[[], Awaitable[List[M]]],
+    model: Type[M],
+    key: Callable[[M], Hashable],
+    claim_size: int
+) -> Callable[[], Awaitable[List[M]]]:
+    """
+    Wrap a content pool's fetch so workers share fetched batches through the shared store.
+
+    Each call first claims up to `claim_size` items left by any worker. When
+    none are left, the worker holding the pool's fetch lease fetches a batch,
+    stores it and claims its share, while the others wait for that batch
+    instead of calling the upstream API themselves. Without a shared store,
+    `fetch_batch` is called directly.
+
+    Args:
+        pool: Pool name, shared by all workers
+        fetch_batch: Coroutine function returning a list of fresh items
+        model: Pydantic model of the items, used to (de)serialize them
+        key: Returns the deduplication key for an item
+        claim_size: Maximum items handed to this worker per call
+
+    Returns:
+        A coroutine function returning a list of items.
+    """
+    async def fetch() -> List[M]:
+        store = get_shared_store()
+        if store is None:
+            return await fetch_batch()
+
+        deadline = time.monotonic() + settings.SHARED_CONTENT_LEASE_SECONDS
+        while True:
+            payloads = await store.claim(pool, claim_size)
+            if payloads:
+                return [model.model_validate_json(payload) for payload in payloads]
+
+            if await store.acquire_lease(pool, settings.SHARED_CONTENT_LEASE_SECONDS):
+                try:
+                    batch = await fetch_batch()
+                    added = await store.put(pool, [(str(key(item)), item.model_dump_json()) for item in batch])
+                    logger.info("Stored fetched batch in shared content store", pool=pool, fetched=len(batch), added=added)
+                finally:
+                    await store.release_lease(pool)
+                payloads = await store.claim(pool, claim_size)
+                return [model.model_validate_json(payload) for payload in payloads]
+
+            # Another worker is fetching; wait for its batch rather than fetching again
+            while await store.lease_held(pool) and time.monotonic() < deadline:
+                await asyncio.sleep(settings.SHARED_CONTENT_POLL_INTERVAL)
+            if time.monotonic() >= deadline:
+                return []
+
+    return fetch
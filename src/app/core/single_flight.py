@@ -0,0 +1,83 @@
+"""
+Provides request coalescing so concurrent callers share one in-flight call.
+"""
+import asyncio
+from collections.abc import Hashable
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single execution.
+
+    The first caller for a key starts the work as a task; callers arriving while
+    it is in flight await the same task. Waiters are shielded, so a cancelled or
+    timed-out caller never cancels the shared work for everybody else.
+
+    An optional per-key `timeout` bounds the shared work itself, so a stuck call
+    is cancelled and the next caller for that key starts afresh.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Return whether a call for the given key is currently running."""
+        task = self._inflight.get(key)
+        return task is not None and not task.done()
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        """
+        Return the in-flight task for the key, starting `fn` if there is none.
+
+        Args:
+            key: Identifies calls that can share a result
+            fn: Zero-argument coroutine function performing the work
+
+        Returns:
+            The shared task.
+        """
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            work = fn() if self.timeout is None else asyncio.wait_for(fn(), self.timeout)
+            task = asyncio.create_task(work)
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return task
+
+    async def wait(self, task: asyncio.Task, timeout: Optional[float] = None) -> T:
+        """
+        Wait for a shared task without letting cancellation reach it.
+
+        Args:
+            task: A task returned by `start`
+            timeout: Optional limit on how long this caller waits
+
+        Raises:
+            asyncio.TimeoutError: If this caller's timeout expires first
+        """
+        if timeout is None:
+            return await asyncio.shield(task)
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """
+        Run `fn` for the key, or join the call already in flight.
+
+        Args:
+            key: Identifies calls that can share a result
+            fn: Zero-argument coroutine function performing the work
+            timeout: Optional limit on how long this caller waits
+
+        Returns:
+            The result of the shared call.
+        """
+        return await self.wait(self.start(key, fn), timeout)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        """Drop a finished task, unless a newer call has replaced it."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
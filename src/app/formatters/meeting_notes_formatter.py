@@ -29,18 +29,36 @@ class MeetingNotesFormatter:
         """
         trending_repos_text = RepositoryFormatter.format_trending_repos_for_notes(trending_repos)
 
+        return MeetingNotesFormatter.format_meeting_sections(
+            f"Q: {trivia_question.question}\nA: {trivia_question.correct_answer}",
+            fun_fact.text,
+            trending_repos_text
+        )
+
+    @staticmethod
+    def format_meeting_sections(trivia: str, fun_fact: str, trending_repos: str) -> str:
+        """
+        Formats meeting notes from already rendered section texts.
+
+        Args:
+            trivia: The tech trivia section text
+            fun_fact: The fun fact text
+            trending_repos: The trending repositories section text
+
+        Returns:
+            Formatted meeting notes as a string
+        """
         meeting_notes = [
             "Meeting Notes for Host",
             "",
             "Ice Breaker - Tech Trivia:",
-            f"Q: {trivia_question.question}",
-            f"A: {trivia_question.correct_answer}",
+            trivia,
             "",
             "Fun Fact to Share:",
-            fun_fact.text,
+            fun_fact,
             "",
             "Trending Tech Topics:",
-            trending_repos_text,
+            trending_repos,
             "",
             "Use these notes to:",
             "1. Start with the trivia question to engage the team",
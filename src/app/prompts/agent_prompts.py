@@ -72,3 +72,45 @@ Please enhance this list to make it more relevant and engaging for this specific
 4. Which ones would be most interesting to discuss
 
 Return a curated list of the most relevant repositories with brief explanations of why they're interesting for this meeting context. Focus on quality over quantity."""
+
+COMBINED_ENHANCEMENT_PROMPT = """You are an expert at making meeting content engaging and relevant.
+
+Meeting context: {meeting_context}
+
+Original tech trivia:
+{trivia}
+
+Original fun fact:
+{fun_fact}
+
+Current trending repositories:
+{trending_repos}
+
+Enhance all three items for this specific meeting:
+1. Trivia: frame the question to be more interesting, connect it to the meeting context, and add a brief explanation. Keep the "Question: ..." and "Answer: ..." lines.
+2. Fun fact: connect it to the meeting context or to work/tech and make it memorable and conversation-starting.
+3. Trending repositories: keep the most relevant ones with a brief explanation of why each is interesting for this meeting. Focus on quality over quantity.
+
+Some content may be fallback text because an upstream source was unavailable. This is expected; enhance it as is.
+Return each enhanced item in its own field."""
+
+MEETING_NOTES_FORMAT_PROMPT = """You are a meeting preparation assistant. Format the content below into professional meeting notes for the host.
+
+Meeting context: {meeting_context}
+
+Tech trivia:
+{trivia}
+
+Fun fact:
+{fun_fact}
+
+Trending repositories:
+{trending_repos}
+
+Some content may be fallback text because an upstream source was unavailable. This is expected; use it as is.
+Start with the title "Meeting Notes for Host" and include clear sections for the ice breaker trivia, the fun fact and the trending tech topics, followed by brief tips on how to use them in the meeting."""
+
+PACKED_TASKS_PROMPT = """Complete each of the {count} numbered tasks below independently, as if each were a separate request. The tasks do not share context.
+Return one result per task in `items`, with `index` set to the task's number.
+
+{tasks}"""
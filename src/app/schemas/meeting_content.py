@@ -0,0 +1,15 @@
+"""
+Defines the Pydantic model for the content sections of a meeting.
+"""
+from pydantic import BaseModel, Field
+
+class MeetingContent(BaseModel):
+    """
+    A Pydantic model holding the text of each meeting notes section.
+
+    Also used as the structured output schema when all sections are enhanced
+    in a single LLM request.
+    """
+    trivia: str = Field(..., description="The tech trivia question and answer, with an optional short explanation")
+    fun_fact: str = Field(..., description="The fun fact, with any connection to the meeting context")
+    trending_repos: str = Field(..., description="The curated trending repositories with brief explanations")
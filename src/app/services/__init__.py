@@ -1,83 +1,307 @@
 """
 Services package for handling external API interactions.
 """
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 import aiohttp
 from pydantic import ValidationError, TypeAdapter
 
+from ..core.circuit_breaker import CircuitOpenError, circuit_breakers
 from ..core.config import settings
+from ..core.deadline import DeadlineExceeded, budget
+from ..core.http_session import http_session_manager
+from ..core.latency import HedgeTimeout, latency_tracker
 from ..core.logging_config import get_logger
+from ..core.metrics import SERVICE_FALLBACKS, UPSTREAM_DURATION, UPSTREAM_RETRIES
+from ..core.rate_limiter import RateLimitExceeded, rate_limiters
+from ..core.retry import RetryBudget, RetryPolicy, parse_retry_after, retry_budgets, retry_policy
 
 logger = get_logger(__name__)
 
 
+def _is_upstream_failure(error: BaseException) -> bool:
+    """Return whether an error means the endpoint is unhealthy, rather than the response being unusable."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError, HedgeTimeout))
+
+
 class BaseService(ABC):
     """Base service class providing common HTTP client functionality and error handling."""
     
-    def __init__(self, api_url: str, timeout: Optional[int] = None):
+    def __init__(self, api_url: str, timeout: Optional[int] = None, rate_limit_wait: Optional[float] = None):
+        """
+        Args:
+            api_url: Default URL requested by the service
+            timeout: Request timeout in seconds, API_TIMEOUT by default
+            rate_limit_wait: Longest wait for a rate-limit token in seconds, RATE_LIMIT_MAX_WAIT by default
+        """
         self.api_url = api_url
         self.timeout = timeout or settings.API_TIMEOUT
+        self.rate_limit_wait = rate_limit_wait
     
-    async def _make_request(self, response_model: Optional[Any] = None) -> Any:
+    async def _make_request(self, response_model: Optional[Any] = None, url: Optional[str] = None) -> Any:
         """
         Make an HTTP GET request with common error handling and validation.
         
+        Requests go through the process-wide pooled session so connections
+        are reused across calls, and time out by the request deadline at the latest.
+        Requests slower than the endpoint usually is are hedged, and requests
+        to an endpoint whose circuit breaker is open get fallback data at once.
+        Requests are kept within the host's rate limit; one that cannot get a
+        token in time gets fallback data instead of risking a 429. Responses
+        such as a 429 or 503 are retried as the service's retry policy allows,
+        as long as the wait fits in the request deadline.
+        
         Args:
             response_model: Optional Pydantic model to validate the response against
+            url: Optional URL overriding the service's api_url for this request
             
         Returns:
             The validated response data or fallback data
         """
-        async with aiohttp.ClientSession() as client:
+        url = url or self.api_url
+        # Never wait longer than the request deadline allows
+        timeout = budget(self.timeout)
+        if timeout <= 0:
+            logger.warning(f"No time left to fetch from {url}, using fallback", url=url)
+            return self._fallback("no_time")
+        
+        start_time = asyncio.get_event_loop().time()
+        try:
+            result = await self._retrying_fetch(url, response_model, timeout)
+            UPSTREAM_DURATION.observe(asyncio.get_event_loop().time() - start_time, service=self._service_name(), outcome="success")
+            return result
+            
+        except CircuitOpenError:
+            logger.info(f"Circuit open for {url}, using fallback", url=url)
+            return self._failed(start_time, "circuit_open")
+            
+        except DeadlineExceeded:
+            logger.warning(f"No time left to fetch from {url}, using fallback", url=url)
+            return self._failed(start_time, "no_time")
+            
+        except HedgeTimeout:
+            logger.info(f"Slow response from {url}, using fallback", url=url)
+            return self._failed(start_time, "hedge")
+            
+        except RateLimitExceeded:
+            logger.info(f"Rate limit reached for {url}, using fallback", url=url)
+            return self._failed(start_time, "rate_limited")
+            
+        except aiohttp.ClientResponseError as e:
+            if e.status == 429:  # Rate limited, even after any retries
+                logger.warning(f"API rate limited for {url}, using fallback")
+                return self._failed(start_time, "upstream_429")
+                
+            logger.error(
+                f"HTTP error fetching from {url}",
+                error=str(e),
+                status_code=e.status,
+                url=url
+            )
+            return self._failed(start_time, "http_error")
+            
+        except (aiohttp.ClientError, ValidationError) as e:
+            logger.error(
+                f"Error fetching or validating data from {url}",
+                error=str(e),
+                url=url
+            )
+            return self._failed(start_time, "invalid_response")
+            
+        except Exception as e:
+            logger.error(
+                f"Unexpected error while fetching from {url}",
+                error=str(e),
+                url=url
+            )
+            return self._failed(start_time, "error")
+    
+    def _service_name(self) -> str:
+        """Name the service in metrics, e.g. "TechTriviaService"."""
+        return type(self).__name__
+    
+    def _fallback(self, reason: str) -> Any:
+        """Return fallback data, counting why it was needed."""
+        SERVICE_FALLBACKS.inc(service=self._service_name(), reason=reason)
+        return self._get_fallback_data()
+    
+    def _failed(self, start_time: float, reason: str) -> Any:
+        """Record a request that ended in fallback data and return that data."""
+        UPSTREAM_DURATION.observe(asyncio.get_event_loop().time() - start_time, service=self._service_name(), outcome="fallback")
+        return self._fallback(reason)
+    
+    async def _retrying_fetch(self, url: str, response_model: Optional[Any], timeout: float) -> Any:
+        """
+        Fetch a URL, retrying responses that the service's retry policy covers.
+        
+        Raises the last error once no further retry is allowed.
+        """
+        policy = retry_policy(self._service_name())
+        retry_budget = retry_budgets.get(url)
+        retry_budget.record_request()
+        attempt = 1
+        while True:
             try:
-                async with client.get(
-                    self.api_url,
-                    timeout=aiohttp.ClientTimeout(total=self.timeout)
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    
-                    # Validate against Pydantic model if provided
-                    if response_model:
-                        ta = TypeAdapter(response_model)
-                        validated_data = ta.validate_python(data)
-                        logger.info(f"Successfully fetched data from {self.api_url}")
-                        return validated_data
-                    
-                    logger.info(f"Successfully fetched data from {self.api_url}")
-                    return data
-                    
+                return await self._guarded_fetch(url, response_model, timeout)
             except aiohttp.ClientResponseError as e:
-                if e.status == 429:  # Rate limited
-                    logger.warning(f"API rate limited for {self.api_url}, using fallback")
-                    return self._get_fallback_data()
-                    
-                logger.error(
-                    f"HTTP error fetching from {self.api_url}",
-                    error=str(e),
+                if not policy.retries(e.status):
+                    raise
+                delay = self._retry_delay(url, e, policy, retry_budget, attempt)
+                if delay is None:
+                    raise
+                logger.info(
+                    f"Retrying request to {url}",
+                    url=url,
                     status_code=e.status,
-                    url=self.api_url
-                )
-                return self._get_fallback_data()
-                
-            except (aiohttp.ClientError, ValidationError) as e:
-                logger.error(
-                    f"Error fetching or validating data from {self.api_url}",
-                    error=str(e),
-                    url=self.api_url
+                    attempt=attempt + 1,
+                    delay_seconds=round(delay, 3)
                 )
-                return self._get_fallback_data()
-                
-            except Exception as e:
-                logger.error(
-                    f"Unexpected error while fetching from {self.api_url}",
-                    error=str(e),
-                    url=self.api_url
-                )
-                return self._get_fallback_data()
+            await asyncio.sleep(delay)
+            attempt += 1
+            timeout = budget(self.timeout)
+    
+    def _retry_delay(
+        self,
+        url: str,
+        error: aiohttp.ClientResponseError,
+        policy: RetryPolicy,
+        retry_budget: RetryBudget,
+        attempt: int
+    ) -> Optional[float]:
+        """
+        Decide whether to retry a failed attempt and how long to wait first.
+        
+        The wait is the jittered backoff, or longer if the response's
+        Retry-After or the host's rate limit requires it. No retry is made
+        after the last attempt, when the wait exceeds the policy's max_wait,
+        when the wait and a typical response would not fit in the request
+        deadline, or when the endpoint's retry budget is spent.
+        
+        Args:
+            url: The request URL
+            error: The retryable error response
+            policy: The service's retry policy
+            retry_budget: The endpoint's retry budget
+            attempt: The number of the attempt that failed, starting at 1
+            
+        Returns:
+            Seconds to wait before retrying, or None to give up.
+        """
+        retry_after = parse_retry_after(error.headers.get("Retry-After") if error.headers else None)
+        delay = max(policy.backoff(attempt), retry_after or 0.0, rate_limiters.wait_time(url))
+        expected = latency_tracker.histogram(url).quantile(0.5) or 0.0
+        
+        if attempt >= policy.max_attempts:
+            decision = "attempts"
+        elif delay > policy.max_wait:
+            decision = "max_wait"
+        elif delay + expected >= budget(self.timeout):
+            decision = "deadline"
+        elif not retry_budget.try_spend():
+            decision = "budget"
+        else:
+            decision = "retried"
+        UPSTREAM_RETRIES.inc(service=self._service_name(), decision=decision)
+        return delay if decision == "retried" else None
+    
+    async def _guarded_fetch(self, url: str, response_model: Optional[Any], timeout: float) -> Any:
+        """Fetch a URL through its endpoint's circuit breaker, if enabled."""
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return await self._hedged_fetch(url, response_model, timeout)
+        with circuit_breakers.get(url).guard(is_failure=_is_upstream_failure):
+            return await self._hedged_fetch(url, response_model, timeout)
+    
+    async def _hedged_fetch(self, url: str, response_model: Optional[Any], timeout: float) -> Any:
+        """
+        Fetch a URL, hedging if it takes longer than the endpoint's hedge delay.
+        
+        With the "request" strategy a second identical request is sent and the
+        first successful response wins; with "fallback" the request is given
+        up so the caller serves fallback data, and the circuit breaker counts
+        it as a failure. Requests still running are cancelled either way, and
+        the time they ran is recorded as a lower bound of the endpoint's
+        latency. A second request is only sent if the host's rate limit
+        allows it. Each request's timeout is what is left of the deadline
+        when it starts.
+        
+        Raises:
+            DeadlineExceeded: If waiting for the rate limit used up the deadline
+            HedgeTimeout: If the "fallback" strategy gave up on a slow request
+        """
+        max_wait = settings.RATE_LIMIT_MAX_WAIT if self.rate_limit_wait is None else self.rate_limit_wait
+        await rate_limiters.acquire(url, max_wait=min(max_wait, timeout))
+        # The wait for a token came out of the request's time
+        timeout = budget(self.timeout)
+        if timeout <= 0:
+            raise DeadlineExceeded(f"No time left to fetch from {url}")
+        delay = latency_tracker.hedge_delay(url) if settings.HTTP_HEDGING_ENABLED else None
+        if delay is None or delay >= timeout:
+            return await self._fetch(url, response_model, timeout)
+        
+        primary = asyncio.create_task(self._fetch(url, response_model, timeout))
+        tasks = {primary}
+        started_at = {primary: asyncio.get_event_loop().time()}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+            
+            logger.info(
+                f"Hedging slow request to {url}",
+                url=url,
+                hedge_delay_seconds=round(delay, 3),
+                strategy=settings.HTTP_HEDGE_STRATEGY
+            )
+            if settings.HTTP_HEDGE_STRATEGY == "fallback":
+                raise HedgeTimeout(f"No response from {url} within {delay:.3f}s")
+            hedge_timeout = budget(self.timeout)
+            if hedge_timeout <= 0 or not rate_limiters.try_acquire(url):
+                return await primary
+            hedge = asyncio.create_task(self._fetch(url, response_model, hedge_timeout))
+            tasks.add(hedge)
+            started_at[hedge] = asyncio.get_event_loop().time()
+            
+            # Take the first success; if both fail, raise the last error
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    # Leaving out abandoned requests would make the endpoint look faster than it is
+                    latency_tracker.observe(url, asyncio.get_event_loop().time() - started_at[task])
+    
+    async def _fetch(self, url: str, response_model: Optional[Any], timeout: float) -> Any:
+        """Fetch and validate one response, recording its latency for the endpoint."""
+        client = http_session_manager.get_session()
+        start_time = asyncio.get_event_loop().time()
+        async with client.get(
+            url,
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        latency_tracker.observe(url, asyncio.get_event_loop().time() - start_time)
+        
+        # Validate against Pydantic model if provided
+        if response_model:
+            ta = TypeAdapter(response_model)
+            validated_data = ta.validate_python(data)
+            logger.info(f"Successfully fetched data from {url}")
+            return validated_data
+        
+        logger.info(f"Successfully fetched data from {url}")
+        return data
     
     @abstractmethod
     def _get_fallback_data(self) -> Any:
         """Return fallback data when the API is unavailable. Must be implemented by subclasses."""
-        pass
@@ -0,0 +1,229 @@
+"""
+Provides an in-memory pool of prefetched content items.
+"""
+import asyncio
+import random
+from collections import deque
+from collections.abc import Hashable
+from typing import Awaitable, Callable, Deque, Generic, List, Optional, Set, TypeVar
+
+from ..core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar('T')
+
+
+class ContentPool(Generic[T]):
+    """
+    A bounded FIFO of prefetched content that is served from memory.
+
+    Items are fetched in the background and handed out in O(1). When the pool
+    drops below its low watermark a refill is scheduled, so callers only wait on
+    the network when the pool is completely empty, and then only until the first
+    new item arrives. Items are deduplicated by key against both queued items and
+    a window of recently served ones.
+
+    A refill performs up to `max_fetches_per_refill` fetches, running at most
+    `refill_concurrency` at a time with a jittered `refill_interval` pause
+    between rounds. Batch APIs use a single fetch per refill; single-item APIs
+    use many small ones.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch_batch: Callable[[], Awaitable[List[T]]],
+        key: Callable[[T], Hashable],
+        capacity: int,
+        low_watermark: int,
+        served_memory: int = 1000,
+        refill_concurrency: int = 1,
+        max_fetches_per_refill: int = 1,
+        refill_interval: float = 0.0
+    ):
+        """
+        Args:
+            name: Pool name used in logs
+            fetch_batch: Coroutine function returning a list of fresh items
+            key: Returns the deduplication key for an item
+            capacity: Maximum number of queued items
+            low_watermark: Queue size below which a background refill starts
+            served_memory: Number of recently served keys remembered for deduplication
+            refill_concurrency: Maximum fetches in flight during a refill
+            max_fetches_per_refill: Maximum fetches performed by one refill
+            refill_interval: Mean pause in seconds between fetch rounds (jittered)
+        """
+        self.name = name
+        self.capacity = capacity
+        self.low_watermark = low_watermark
+        self.refill_concurrency = max(1, refill_concurrency)
+        self.max_fetches_per_refill = max(1, max_fetches_per_refill)
+        self.refill_interval = refill_interval
+        self._fetch_batch = fetch_batch
+        self._key = key
+        self._items: Deque[T] = deque()
+        self._queued_keys: Set[Hashable] = set()
+        self._served_order: Deque[Hashable] = deque(maxlen=served_memory)
+        self._served_keys: Set[Hashable] = set()
+        self._refill_task: Optional[asyncio.Task] = None
+        self._refill_pending = False
+        self._waiters: List[asyncio.Future] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def take(self) -> Optional[T]:
+        """
+        Take the next item from the pool.
+
+        Blocks on the network only when the pool is empty.
+
+        Returns:
+            An unserved item, or None if none could be fetched.
+        """
+        if not self._items:
+            await self._wait_for_refill()
+        if not self._items:
+            return None
+
+        item = self._items.popleft()
+        key = self._key(item)
+        self._queued_keys.discard(key)
+        self._remember_served(key)
+
+        self.ensure_filled()
+        return item
+
+    def ensure_filled(self):
+        """Schedule a background refill if the pool is below its low watermark."""
+        if len(self._items) >= self.low_watermark:
+            return
+        if self._refill_running():
+            # Re-check once the current refill finishes
+            self._refill_pending = True
+        else:
+            self._start_refill()
+
+    async def refill(self) -> int:
+        """
+        Refill the pool, sharing a refill already in flight.
+
+        Returns:
+            The number of items added by the refill.
+        """
+        return await asyncio.shield(self._start_refill())
+
+    def clear(self):
+        """Drop all queued items and the served history."""
+        self._items.clear()
+        self._queued_keys.clear()
+        self._served_order.clear()
+        self._served_keys.clear()
+        self._refill_task = None
+        self._refill_pending = False
+
+    def _refill_running(self) -> bool:
+        """Return whether a refill is in flight on the current event loop."""
+        task = self._refill_task
+        return task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop()
+
+    def _start_refill(self) -> asyncio.Task:
+        """Return the running refill task, starting one if needed."""
+        if not self._refill_running():
+            self._refill_pending = False
+            self._refill_task = asyncio.create_task(self._refill())
+            self._refill_task.add_done_callback(self._on_refill_done)
+        return self._refill_task
+
+    def _on_refill_done(self, task: asyncio.Task):
+        """Honour a refill requested while this one was running, if it made progress."""
+        if self._refill_pending and task is self._refill_task and not task.cancelled() and task.result():
+            self.ensure_filled()
+
+    async def _wait_for_refill(self):
+        """Wait for a refill to deliver an item, retrying once if a joined refill ends empty."""
+        while not self._items:
+            joined = self._refill_running()
+            refill = self._start_refill()
+            while not self._items and not refill.done():
+                await self._wait_for_item(refill)
+            if not joined:
+                return
+
+    async def _wait_for_item(self, refill: asyncio.Task):
+        """Wait until an item is enqueued or the refill finishes."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait({waiter, refill}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            waiter.cancel()
+
+    async def _refill(self) -> int:
+        """Fetch in paced rounds until full, out of fetches, or a round adds nothing."""
+        added = 0
+        fetches = 0
+        try:
+            while len(self._items) < self.capacity and fetches < self.max_fetches_per_refill:
+                if fetches:
+                    await asyncio.sleep(self.refill_interval * random.uniform(0.5, 1.5))
+
+                round_size = min(self.refill_concurrency, self.max_fetches_per_refill - fetches)
+                fetches += round_size
+                results = await asyncio.gather(*(self._fetch_and_enqueue() for _ in range(round_size)))
+                if not sum(results):
+                    break
+                added += sum(results)
+        except Exception as e:
+            logger.warning("Content pool refill failed", pool=self.name, error=str(e))
+
+        logger.info("Refilled content pool", pool=self.name, fetches=fetches, added=added, size=len(self._items))
+        return added
+
+    async def _fetch_and_enqueue(self) -> int:
+        """Run one fetch and enqueue its unseen items, waking any waiters."""
+        try:
+            batch = await self._fetch_batch()
+        except Exception as e:
+            logger.warning("Content pool fetch failed", pool=self.name, error=str(e))
+            return 0
+
+        added = self._enqueue(batch)
+        if batch and not added and not self._items:
+            # Every fetched item has been served recently; recycle rather than starve
+            logger.info("Content pool exhausted unique items, recycling served history", pool=self.name)
+            self._served_order.clear()
+            self._served_keys.clear()
+            added = self._enqueue(batch)
+
+        if added:
+            for waiter in self._waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+        return added
+
+    def _enqueue(self, batch: List[T]) -> int:
+        """Append items whose keys are neither queued nor recently served."""
+        added = 0
+        for item in batch:
+            if len(self._items) >= self.capacity:
+                break
+            key = self._key(item)
+            if key in self._queued_keys or key in self._served_keys:
+                continue
+            self._items.append(item)
+            self._queued_keys.add(key)
+            added += 1
+        return added
+
+    def _remember_served(self, key: Hashable):
+        """Record a served key, forgetting the oldest once the window is full."""
+        if not self._served_order.maxlen:
+            return
+        if len(self._served_order) == self._served_order.maxlen:
+            self._served_keys.discard(self._served_order[0])
+        self._served_order.append(key)
+        self._served_keys.add(key)
@@ -1,13 +1,24 @@
 """
 Provides a service for interacting with the Fun Facts API.
 """
+import asyncio
+from typing import List, Set
+
 from ..schemas.fun_facts import FunFact
 from . import BaseService
+from .content_pool import ContentPool
 from ..core.logging_config import get_logger
 from ..core.config import settings
+from ..core.rate_limiter import rate_limiters
+from ..core.shared_store import shared_fetch
 
 logger = get_logger(__name__)
 
+FALLBACK_FUN_FACT_ID = "fallback"
+
+# Rounds of fetches made for a batch of distinct fun facts before facts are reused
+DISTINCT_FETCH_ROUNDS = 3
+
 
 class FunFactsService(BaseService):
     """A service class for handling Fun Facts API interactions."""
@@ -15,13 +26,36 @@ class FunFactsService(BaseService):
     def __init__(self):
         super().__init__(settings.FUN_FACTS_API_URL)
 
+    @staticmethod
+    def prime_reservoir():
+        """Start filling the fun fact reservoir in the background if it is enabled."""
+        if settings.FUN_FACTS_RESERVOIR_ENABLED:
+            _fun_fact_reservoir.ensure_filled()
+
+    @staticmethod
+    def clear_reservoir():
+        """Drop buffered fun facts and the served history."""
+        _fun_fact_reservoir.clear()
+
     async def get_fun_fact(self) -> FunFact:
         """
         Fetches and validates a fun fact from the API.
 
+        When FUN_FACTS_RESERVOIR_ENABLED is set, facts are drawn from an
+        in-memory reservoir that is filled in the background, so the network is
+        only used when the reservoir is empty. The reservoir is also used
+        whenever the API's rate limit would be exceeded.
+
         Returns:
             A FunFact object.
         """
+        if settings.FUN_FACTS_RESERVOIR_ENABLED or not rate_limiters.available(self.api_url):
+            fun_fact = await _fun_fact_reservoir.take()
+            if fun_fact is not None:
+                return fun_fact
+            logger.warning("Fun fact reservoir is empty, using fallback")
+            return self._get_fallback_data()
+
         response = await self._make_request(FunFact)
         
         # Handle the response structure
@@ -34,9 +68,89 @@ class FunFactsService(BaseService):
             logger.warning("Invalid fun fact response structure, using fallback")
             return self._get_fallback_data()
 
+    async def get_fun_facts(self, count: int, concurrency: int) -> List[FunFact]:
+        """
+        Fetches fun facts for several meetings at once.
+
+        The API serves one random fact per call, so facts are fetched like
+        `get_fun_fact`, from the reservoir or the API, with at most
+        `concurrency` calls in flight. Facts whose text was already fetched
+        are fetched again, for up to DISTINCT_FETCH_ROUNDS rounds; when fewer
+        distinct facts are available than requested, they are reused in turn.
+
+        Args:
+            count: Number of facts wanted
+            concurrency: Maximum concurrent fetches
+
+        Returns:
+            A list of `count` FunFact objects.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one() -> FunFact:
+            async with semaphore:
+                return await self.get_fun_fact()
+
+        fun_facts: List[FunFact] = []
+        seen: Set[str] = set()
+        for _ in range(DISTINCT_FETCH_ROUNDS):
+            missing = count - len(fun_facts)
+            if missing <= 0:
+                break
+            added = 0
+            for fun_fact in await asyncio.gather(*(fetch_one() for _ in range(missing))):
+                if fun_fact.text not in seen:
+                    seen.add(fun_fact.text)
+                    fun_facts.append(fun_fact)
+                    added += 1
+            if not added:
+                # Nothing new is coming, e.g. the API is down and serving fallback data
+                break
+
+        if len(fun_facts) < count:
+            logger.warning("Not enough distinct fun facts for batch, reusing some", count=count, distinct=len(fun_facts))
+        return [fun_facts[i % len(fun_facts)] for i in range(count)]
+
+    async def fetch_validated_fun_facts(self) -> List[FunFact]:
+        """
+        Fetches a single fun fact for the reservoir.
+
+        Returns:
+            A list with the validated FunFact, empty if the API is unavailable.
+        """
+        response = await self._make_request(FunFact)
+        if isinstance(response, FunFact) and response.id != FALLBACK_FUN_FACT_ID:
+            return [response]
+        return []
+
     def _get_fallback_data(self) -> FunFact:
         """Returns a fallback fun fact when the API is unavailable."""
         logger.info("Using fallback fun fact")
         return FunFact(
-            text="The average person spends 6 months of their life waiting for red lights."
+            id=FALLBACK_FUN_FACT_ID,
+            text="The average person spends 6 months of their life waiting for red lights.",
+            source="fallback",
+            source_url="",
+            language="en",
+            permalink=""
         )
+
+
+# Shared across service instances, since agents create a new service per call
+_fun_fact_reservoir: ContentPool[FunFact] = ContentPool(
+    "fun_facts",
+    fetch_batch=shared_fetch(
+        "fun_facts",
+        lambda: FunFactsService().fetch_validated_fun_facts(),
+        model=FunFact,
+        key=lambda fun_fact: fun_fact.id,
+        claim_size=settings.SHARED_CONTENT_CLAIM_SIZE
+    ),
+    key=lambda fun_fact: fun_fact.id,
+    capacity=settings.FUN_FACTS_RESERVOIR_CAPACITY,
+    low_watermark=settings.FUN_FACTS_RESERVOIR_LOW_WATERMARK,
+    served_memory=settings.FUN_FACTS_RESERVOIR_SERVED_MEMORY,
+    refill_concurrency=settings.FUN_FACTS_RESERVOIR_CONCURRENCY,
+    max_fetches_per_refill=settings.FUN_FACTS_RESERVOIR_CAPACITY,
+    refill_interval=settings.FUN_FACTS_RESERVOIR_REFILL_INTERVAL
+)
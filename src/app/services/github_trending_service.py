@@ -1,13 +1,21 @@
 """
 Provides a service for interacting with the GitHub Trending API.
 """
-from typing import List
+from typing import List, Optional
 from . import BaseService
+from ..core.cache import StaleWhileRevalidateCache
 from ..core.logging_config import get_logger
 from ..core.config import settings
 
 logger = get_logger(__name__)
 
+# Shared across service instances, since agents create a new service per call
+_trending_cache = StaleWhileRevalidateCache(
+    "github_trending",
+    ttl=settings.GITHUB_TRENDING_CACHE_TTL,
+    stale_ttl=settings.GITHUB_TRENDING_CACHE_STALE_TTL
+)
+
 
 class GitHubTrendingService(BaseService):
     """A service class for handling GitHub Trending API interactions."""
@@ -15,13 +23,36 @@ class GitHubTrendingService(BaseService):
     def __init__(self):
         super().__init__(settings.GITHUB_TRENDING_URL)
 
+    @staticmethod
+    def clear_cache():
+        """Drop cached trending repositories so the next call hits the API."""
+        _trending_cache.clear()
+
     async def get_trending_repos(self) -> List[dict]:
         """
-        Fetches trending repositories from the GitHub Trending API.
+        Fetches trending repositories, served from cache when available.
+
+        The trending list changes on the scale of hours, so results are cached
+        with a TTL and refreshed in the background once stale. Fallback data is
+        never cached.
 
         Returns:
             A list of trending repository dictionaries.
         """
+        repos = await _trending_cache.get_or_load(self.api_url, self._fetch_trending_repos)
+        if repos:
+            return list(repos)
+
+        logger.warning("No trending repositories found in API response")
+        return self._get_fallback_data()
+
+    async def _fetch_trending_repos(self) -> Optional[List[dict]]:
+        """
+        Fetches trending repositories from the GitHub Trending API.
+
+        Returns:
+            A list of trending repository dictionaries, or None if the response had none.
+        """
         data = await self._make_request()  # No validation model for this API
         
         # Extract repository data from the response
@@ -41,9 +72,7 @@ class GitHubTrendingService(BaseService):
         if repos:
             logger.info(f"Successfully fetched {len(repos)} trending repos from API")
             return repos
-        else:
-            logger.warning("No trending repositories found in API response")
-            return self._get_fallback_data()
+        return None
 
     def _get_fallback_data(self) -> List[dict]:
         """Returns fallback trending repositories when the API is unavailable."""
@@ -1,12 +1,16 @@
 """
 Provides a service for interacting with the Tech Trivia API.
 """
-from typing import List
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from ..schemas.tech_trivia import TechTriviaResponse, TechTriviaQuestion
 from . import BaseService
+from .content_pool import ContentPool
 from ..core.logging_config import get_logger
 from ..core.config import settings
+from ..core.rate_limiter import rate_limiters
+from ..core.shared_store import shared_fetch
 
 logger = get_logger(__name__)
 
@@ -14,16 +18,39 @@ logger = get_logger(__name__)
 class TechTriviaService(BaseService):
     """A service class for handling Tech Trivia API interactions."""
 
-    def __init__(self):
-        super().__init__(settings.TECH_TRIVIA_API_URL)
+    def __init__(self, rate_limit_wait: Optional[float] = None):
+        super().__init__(settings.TECH_TRIVIA_API_URL, rate_limit_wait=rate_limit_wait)
+
+    @staticmethod
+    def prime_pool():
+        """Start filling the trivia pool in the background if pooling is enabled."""
+        if settings.TECH_TRIVIA_POOL_ENABLED:
+            _trivia_pool.ensure_filled()
+
+    @staticmethod
+    def clear_pool():
+        """Drop pooled trivia questions and the served history."""
+        _trivia_pool.clear()
 
     async def get_tech_trivia(self) -> TechTriviaQuestion:
         """
         Fetches and validates a tech trivia question from the API.
 
+        When TECH_TRIVIA_POOL_ENABLED is set, questions are drawn from a
+        prefetched in-memory pool instead of one API call per question. The
+        pool is also used whenever the API's rate limit would be exceeded, as
+        it fetches a whole batch of questions per request.
+
         Returns:
             A TechTriviaQuestion object.
         """
+        if settings.TECH_TRIVIA_POOL_ENABLED or not rate_limiters.available(self.api_url):
+            question = await _trivia_pool.take()
+            if question is not None:
+                return question
+            logger.warning("Trivia pool is empty, using fallback")
+            return self._get_fallback_data()
+
         response = await self._make_request(TechTriviaResponse)
         
         # Handle the response structure
@@ -36,6 +63,55 @@ class TechTriviaService(BaseService):
             logger.warning("No trivia questions found in response, using fallback")
             return self._get_fallback_data()
 
+    async def get_tech_trivia_batch(self, count: int) -> List[TechTriviaQuestion]:
+        """
+        Fetches trivia questions for several meetings at once.
+
+        Questions are drawn from the pool when it is enabled or the rate limit
+        would be exceeded, and otherwise come from a single batch API call.
+        When fewer distinct questions are available than requested, they are
+        reused in turn.
+
+        Args:
+            count: Number of questions wanted
+
+        Returns:
+            A list of `count` TechTriviaQuestion objects.
+        """
+        questions: List[TechTriviaQuestion] = []
+        if settings.TECH_TRIVIA_POOL_ENABLED or not rate_limiters.available(self.api_url):
+            while len(questions) < count:
+                question = await _trivia_pool.take()
+                if question is None:
+                    break
+                questions.append(question)
+        else:
+            questions = (await self.fetch_trivia_batch())[:count]
+
+        if not questions:
+            logger.warning("No trivia questions available for batch, using fallback", count=count)
+            questions = [self._get_fallback_data()]
+        return [questions[i % len(questions)] for i in range(count)]
+
+    async def fetch_trivia_batch(self) -> List[TechTriviaQuestion]:
+        """
+        Fetches a batch of trivia questions in a single API call.
+
+        Returns:
+            A list of TechTriviaQuestion objects, empty if the API is unavailable.
+        """
+        response = await self._make_request(TechTriviaResponse, url=self._batch_url())
+        if isinstance(response, TechTriviaResponse):
+            return response.results
+        return []
+
+    def _batch_url(self) -> str:
+        """Returns the API URL with `amount` set to the configured batch size."""
+        parts = urlsplit(self.api_url)
+        query = dict(parse_qsl(parts.query))
+        query['amount'] = str(settings.TECH_TRIVIA_POOL_BATCH_SIZE)
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
     def _get_fallback_data(self) -> TechTriviaQuestion:
         """Returns a fallback trivia question when the API is unavailable."""
         logger.info("Using fallback tech trivia question")
@@ -47,3 +123,32 @@ class TechTriviaService(BaseService):
             correct_answer="Python",
             incorrect_answers=["Java", "C++", "JavaScript"]
         )
+
+
+async def _fetch_pool_batch() -> List[TechTriviaQuestion]:
+    """
+    Fetch a batch of questions for the pool.
+
+    The pool is what serves trivia while the API is throttled, so its refill
+    waits up to a full token interval for the rate limit rather than
+    RATE_LIMIT_MAX_WAIT, which is shorter than the interval for slow hosts.
+    """
+    rate_limit_wait = max(settings.RATE_LIMIT_MAX_WAIT, rate_limiters.interval(settings.TECH_TRIVIA_API_URL))
+    return await TechTriviaService(rate_limit_wait=rate_limit_wait).fetch_trivia_batch()
+
+
+# Shared across service instances, since agents create a new service per call
+_trivia_pool: ContentPool[TechTriviaQuestion] = ContentPool(
+    "tech_trivia",
+    fetch_batch=shared_fetch(
+        "tech_trivia",
+        _fetch_pool_batch,
+        model=TechTriviaQuestion,
+        key=lambda question: question.question,
+        claim_size=settings.SHARED_CONTENT_CLAIM_SIZE
+    ),
+    key=lambda question: question.question,
+    capacity=settings.TECH_TRIVIA_POOL_CAPACITY,
+    low_watermark=settings.TECH_TRIVIA_POOL_LOW_WATERMARK,
+    served_memory=settings.TECH_TRIVIA_POOL_SERVED_MEMORY
+)
@@ -6,8 +6,11 @@ from langchain.tools import tool
 from ..agents.tech_trivia_agent import TechTriviaAgent
 from ..agents.fun_facts_agent import FunFactsAgent
 from ..agents.github_trending_agent import GitHubTrendingAgent
-from ..core.llm_gateway import LLMGateway
+from ..core.context_normalizer import canonicalize_context
+from ..core.deadline import budget
+from ..core.llm_gateway import get_llm_gateway
 from ..core.logging_config import setup_logging, get_logger
+from ..core.metrics import AGENT_TOOL_DURATION, llm_prompt
 from ..prompts.agent_prompts import TECH_TRIVIA_PROMPT, FUN_FACT_PROMPT, TRENDING_PROMPT
 import asyncio
 from ..core.config import settings
@@ -37,19 +40,26 @@ async def tech_trivia_agent(ctx=None, meeting_context: str = "") -> str:
         if ctx and meeting_context:
             try:
                 logger.info("Improving trivia with LLM reasoning")
-                llm = LLMGateway().chat_model
                 prompt = TECH_TRIVIA_PROMPT.format(
                     question=trivia.question,
                     answer=trivia.correct_answer,
                     meeting_context=meeting_context
                 )
-                
-                response = await asyncio.wait_for(
-                    llm.ainvoke([{"role": "user", "content": prompt}]),
-                    timeout=settings.LLM_REQUEST_TIMEOUT
+                cache_prompt = TECH_TRIVIA_PROMPT.format(
+                    question=trivia.question,
+                    answer=trivia.correct_answer,
+                    meeting_context=canonicalize_context(meeting_context)
                 )
-                logger.info("LLM improvement completed", response_length=len(response.content))
-                return response.content
+                
+                # Goes through the gateway so repeated enhancements, including
+                # near-duplicate phrasings of the context, are served from its cache
+                with llm_prompt("tech_trivia"):
+                    response = await asyncio.wait_for(
+                        get_llm_gateway().get_string_response(prompt, cache_prompt=cache_prompt),
+                        timeout=budget(settings.LLM_REQUEST_TIMEOUT)
+                    )
+                logger.info("LLM improvement completed", response_length=len(response))
+                return response
             except Exception as e:
                 logger.warning(f"Failed to improve trivia with LLM: {e}")
         
@@ -64,6 +74,7 @@ async def tech_trivia_agent(ctx=None, meeting_context: str = "") -> str:
     finally:
         execution_time = asyncio.get_event_loop().time() - start_time
         logger.info("Tech trivia agent completed", execution_time_seconds=round(execution_time, 2))
+        AGENT_TOOL_DURATION.observe(execution_time, tool="tech_trivia_agent")
 
 
 @tool
@@ -85,18 +96,22 @@ async def fun_facts_agent(ctx=None, meeting_context: str = "") -> str:
         if ctx and meeting_context:
             try:
                 logger.info("Improving fun fact with LLM reasoning")
-                llm = LLMGateway().chat_model
                 prompt = FUN_FACT_PROMPT.format(
                     fun_fact=fun_fact.text,
                     meeting_context=meeting_context
                 )
-                
-                response = await asyncio.wait_for(
-                    llm.ainvoke([{"role": "user", "content": prompt}]),
-                    timeout=settings.LLM_REQUEST_TIMEOUT
+                cache_prompt = FUN_FACT_PROMPT.format(
+                    fun_fact=fun_fact.text,
+                    meeting_context=canonicalize_context(meeting_context)
                 )
-                logger.info("LLM improvement completed", response_length=len(response.content))
-                return response.content
+                
+                with llm_prompt("fun_fact"):
+                    response = await asyncio.wait_for(
+                        get_llm_gateway().get_string_response(prompt, cache_prompt=cache_prompt),
+                        timeout=budget(settings.LLM_REQUEST_TIMEOUT)
+                    )
+                logger.info("LLM improvement completed", response_length=len(response))
+                return response
             except Exception as e:
                 logger.warning(f"Failed to improve fun fact with LLM: {e}")
         
@@ -110,6 +125,7 @@ async def fun_facts_agent(ctx=None, meeting_context: str = "") -> str:
     finally:
         execution_time = asyncio.get_event_loop().time() - start_time
         logger.info("Fun facts agent completed", execution_time_seconds=round(execution_time, 2))
+        AGENT_TOOL_DURATION.observe(execution_time, tool="fun_facts_agent")
 
 
 @tool
@@ -131,8 +147,6 @@ async def github_trending_agent(ctx=None, meeting_context: str = "") -> str:
         if ctx and meeting_context:
             try:
                 logger.info("Improving trending repos with LLM reasoning")
-                llm = LLMGateway().chat_model
-                
                 # Format repos for LLM processing
                 repos_text = "\n".join([
                     f"• {repo['name']}: {repo['description']} ({repo['language']}, {repo['stars']} stars)"
@@ -143,13 +157,18 @@ async def github_trending_agent(ctx=None, meeting_context: str = "") -> str:
                     trending_repos=repos_text,
                     meeting_context=meeting_context
                 )
-                
-                response = await asyncio.wait_for(
-                    llm.ainvoke([{"role": "user", "content": prompt}]),
-                    timeout=settings.LLM_REQUEST_TIMEOUT
+                cache_prompt = TRENDING_PROMPT.format(
+                    trending_repos=repos_text,
+                    meeting_context=canonicalize_context(meeting_context)
                 )
-                logger.info("LLM improvement completed", response_length=len(response.content))
-                return response.content
+                
+                with llm_prompt("trending_repos"):
+                    response = await asyncio.wait_for(
+                        get_llm_gateway().get_string_response(prompt, cache_prompt=cache_prompt),
+                        timeout=budget(settings.LLM_REQUEST_TIMEOUT)
+                    )
+                logger.info("LLM improvement completed", response_length=len(response))
+                return response
             except Exception as e:
                 logger.warning(f"Failed to improve trending repos with LLM: {e}")
         
@@ -165,3 +184,4 @@ async def github_trending_agent(ctx=None, meeting_context: str = "") -> str:
     finally:
         execution_time = asyncio.get_event_loop().time() - start_time
         logger.info("GitHub trending agent completed", execution_time_seconds=round(execution_time, 2))
+        AGENT_TOOL_DURATION.observe(execution_time, tool="github_trending_agent")
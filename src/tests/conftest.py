@@ -0,0 +1,43 @@
+"""
+Shared pytest fixtures.
+"""
+import pytest
+
+from app.core.circuit_breaker import circuit_breakers
+from app.core.context_normalizer import context_canonicalizer
+from app.core.http_session import http_session_manager
+from app.core.latency import latency_tracker
+from app.core.llm_cache import reset_llm_cache
+from app.core.llm_gateway import llm_gateway_registry
+from app.core.metrics import metrics
+from app.core.rate_limiter import rate_limiters
+from app.core.retry import retry_budgets
+from app.core.shared_store import reset_shared_store
+from app.services.fun_facts_service import FunFactsService
+from app.services.github_trending_service import GitHubTrendingService
+from app.services.tech_trivia_service import TechTriviaService
+
+
+@pytest.fixture(autouse=True)
+def clear_service_caches():
+    """Reset process-wide caches, pools and metrics between tests."""
+    llm_gateway_registry.clear()
+    reset_llm_cache()
+    reset_shared_store()
+    context_canonicalizer.clear()
+    latency_tracker.clear()
+    circuit_breakers.clear()
+    rate_limiters.clear()
+    retry_budgets.clear()
+    metrics.reset()
+    GitHubTrendingService.clear_cache()
+    TechTriviaService.clear_pool()
+    FunFactsService.clear_reservoir()
+    yield
+
+
+@pytest.fixture(autouse=True)
+async def close_http_session():
+    """Close the pooled HTTP session after each test so it never outlives its event loop."""
+    yield
+    await http_session_manager.close()
@@ -0,0 +1,176 @@
+"""
+Tests for admission control.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core.admission import AdmissionController, AdmissionRejected
+from app.core.metrics import ADMISSION_REJECTIONS, metrics
+
+
+def make_controller(**overrides) -> AdmissionController:
+    """Build a controller with small limits for tests."""
+    options = {"max_concurrent": 2, "max_per_client": 2, "max_queue": 2, "expected_latency": 0.01}
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+async def hold(controller: AdmissionController, client_id: str, release: asyncio.Event, log: list = None):
+    """Hold a slot until released, recording the order of admission."""
+    async with controller.admit(client_id):
+        if log is not None:
+            log.append(client_id)
+        await release.wait()
+
+
+class TestAdmissionController:
+    """Test cases for AdmissionController."""
+
+    async def test_admits_immediately_under_limit(self):
+        """Test that requests within the limits run without queueing."""
+        controller = make_controller()
+
+        async with controller.admit("a"):
+            assert controller.stats()["active"] == 1
+
+        stats = controller.stats()
+        assert stats["active"] == 0
+        assert stats["admitted"] == 1
+        assert stats["queue_depth"] == 0
+
+    async def test_queues_beyond_global_limit_in_fifo_order(self):
+        """Test that excess requests wait and are admitted in arrival order."""
+        controller = make_controller(max_concurrent=1, max_per_client=5, max_queue=5)
+        release = asyncio.Event()
+        log = []
+
+        tasks = [asyncio.create_task(hold(controller, name, release, log)) for name in ("a", "b", "c")]
+        await asyncio.sleep(0)
+        assert controller.stats()["queue_depth"] == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert log == ["a", "b", "c"]
+        stats = controller.stats()
+        assert stats["max_queue_depth"] == 2
+        assert stats["admitted"] == 3
+        assert stats["active"] == 0
+
+    async def test_per_client_limit_lets_other_clients_through(self):
+        """Test that a busy client queues without blocking other clients."""
+        controller = make_controller(max_concurrent=3, max_per_client=1)
+        release = asyncio.Event()
+        log = []
+
+        first = asyncio.create_task(hold(controller, "busy", release, log))
+        second = asyncio.create_task(hold(controller, "busy", release, log))
+        other = asyncio.create_task(hold(controller, "other", release, log))
+        await asyncio.sleep(0)
+
+        assert log == ["busy", "other"]
+        assert controller.stats()["queue_depth"] == 1
+
+        release.set()
+        await asyncio.gather(first, second, other)
+        assert log == ["busy", "other", "busy"]
+
+    async def test_rejects_when_queue_is_full(self):
+        """Test that requests beyond the queue bound are rejected immediately."""
+        controller = make_controller(max_concurrent=1, max_queue=1)
+        release = asyncio.Event()
+
+        tasks = [asyncio.create_task(hold(controller, "a", release)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.admit("b"):
+                pass
+        assert exc_info.value.reason == "queue_full"
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert controller.stats()["rejected"] == {"queue_full": 1}
+        assert ADMISSION_REJECTIONS.value(reason="queue_full") == 1
+        assert "# TYPE meeting_agent_admission_rejected_total counter" in metrics.render()
+
+    async def test_rejects_when_deadline_cannot_cover_expected_latency(self):
+        """Test that a request with too little time left is rejected without running."""
+        controller = make_controller(expected_latency=5.0)
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.admit("a", deadline=time.monotonic() + 1.0):
+                pytest.fail("request should not run")
+
+        assert exc_info.value.reason == "deadline"
+        assert controller.stats()["active"] == 0
+
+    async def test_rejects_when_queue_wait_exceeds_deadline(self):
+        """Test that the expected queueing delay counts against the deadline."""
+        controller = make_controller(max_concurrent=1, expected_latency=1.0)
+        release = asyncio.Event()
+        task = asyncio.create_task(hold(controller, "a", release))
+        await asyncio.sleep(0)
+
+        # 1.5 seconds covers running but not waiting for the running request first
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.admit("b", deadline=time.monotonic() + 1.5):
+                pass
+        assert exc_info.value.reason == "deadline"
+        assert controller.stats()["queue_depth"] == 0
+
+        release.set()
+        await task
+
+    async def test_queued_request_gives_up_before_its_deadline(self):
+        """Test that a waiter is rejected and dequeued once too little time remains to run."""
+        controller = make_controller(max_concurrent=1, expected_latency=0.05)
+        release = asyncio.Event()
+        task = asyncio.create_task(hold(controller, "a", release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected):
+            async with controller.admit("b", deadline=time.monotonic() + 0.2):
+                pass
+        assert controller.stats()["queue_depth"] == 0
+
+        release.set()
+        await task
+        assert controller.stats()["active"] == 0
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test that cancelling a queued request frees its queue position."""
+        controller = make_controller(max_concurrent=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(controller, "a", release))
+        waiter = asyncio.create_task(hold(controller, "b", release))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert controller.stats()["queue_depth"] == 0
+        release.set()
+        await holder
+        assert controller.stats()["active"] == 0
+
+    async def test_expected_latency_tracks_observed_run_time(self):
+        """Test that the latency estimate moves toward observed run times."""
+        controller = make_controller(expected_latency=10.0)
+
+        async with controller.admit("a"):
+            pass
+
+        assert controller.expected_latency < 10.0
+
+    async def test_unobserved_run_time_keeps_estimate(self):
+        """Test that requests admitted with observe=False leave the latency estimate alone."""
+        controller = make_controller(expected_latency=10.0)
+
+        async with controller.admit("a", observe=False):
+            pass
+
+        assert controller.expected_latency == 10.0
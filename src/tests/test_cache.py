@@ -0,0 +1,192 @@
+"""
+Tests for the stale-while-revalidate cache and single-flight helper.
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core.cache import StaleWhileRevalidateCache
+from app.core.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent callers for one key run the work once."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert not flight.in_flight("key")
+
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        """Test that cancelling one caller leaves the shared task running."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", work))
+        second = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    async def test_waiter_timeout_does_not_cancel_shared_call(self):
+        """Test that one caller timing out leaves the shared task for the others."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        patient = asyncio.create_task(flight.do("key", work))
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do("key", work, timeout=0.01)
+        release.set()
+
+        assert await patient == "done"
+
+    async def test_key_timeout_cancels_stuck_call(self):
+        """Test that a shared call exceeding the per-key timeout is dropped so the next caller restarts."""
+        flight = SingleFlight(timeout=0.01)
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(1)
+            return "done"
+
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do("key", work)
+
+        assert not flight.in_flight("key")
+        assert await flight.do("key", work) == "done"
+        assert calls == 2
+
+    async def test_failure_is_shared_and_not_remembered(self):
+        """Test that every waiter sees a failure and the next call starts afresh."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            if calls == 1:
+                raise RuntimeError("upstream error")
+            return "done"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await flight.do("key", work) == "done"
+
+
+class TestStaleWhileRevalidateCache:
+    """Test cases for StaleWhileRevalidateCache."""
+
+    async def test_fresh_entry_is_served_from_cache(self):
+        """Test that a fresh entry does not call the loader again."""
+        cache = StaleWhileRevalidateCache("test", ttl=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await cache.get_or_load("key", loader) == 1
+        assert await cache.get_or_load("key", loader) == 1
+        assert calls == 1
+
+    async def test_stale_entry_is_served_while_refreshing(self):
+        """Test that a stale entry is returned immediately and refreshed in the background."""
+        cache = StaleWhileRevalidateCache("test", ttl=10, stale_ttl=60)
+        values = iter(["old", "new"])
+
+        async def loader():
+            return next(values)
+
+        with patch('app.core.cache.time.monotonic', return_value=100.0):
+            assert await cache.get_or_load("key", loader) == "old"
+
+        with patch('app.core.cache.time.monotonic', return_value=115.0):
+            assert await cache.get_or_load("key", loader) == "old"
+            await asyncio.gather(*cache._refresh_tasks)
+            assert await cache.get_or_load("key", loader) == "new"
+
+    async def test_expired_entry_is_loaded_inline(self):
+        """Test that an entry past the stale window is reloaded before returning."""
+        cache = StaleWhileRevalidateCache("test", ttl=10, stale_ttl=5)
+        values = iter(["old", "new"])
+
+        async def loader():
+            return next(values)
+
+        with patch('app.core.cache.time.monotonic', return_value=100.0):
+            await cache.get_or_load("key", loader)
+
+        with patch('app.core.cache.time.monotonic', return_value=120.0):
+            assert await cache.get_or_load("key", loader) == "new"
+
+    async def test_concurrent_misses_share_one_load(self):
+        """Test that concurrent cache misses trigger a single upstream load."""
+        cache = StaleWhileRevalidateCache("test", ttl=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(10)))
+
+        assert results == ["value"] * 10
+        assert calls == 1
+
+    async def test_none_is_not_cached(self):
+        """Test that a None result is returned but not stored."""
+        cache = StaleWhileRevalidateCache("test", ttl=60)
+        values = iter([None, "value"])
+
+        async def loader():
+            return next(values)
+
+        assert await cache.get_or_load("key", loader) is None
+        assert await cache.get_or_load("key", loader) == "value"
+
+    async def test_zero_ttl_disables_cache(self):
+        """Test that a zero TTL always calls the loader."""
+        cache = StaleWhileRevalidateCache("test", ttl=0)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        await cache.get_or_load("key", loader)
+        await cache.get_or_load("key", loader)
+        assert calls == 2
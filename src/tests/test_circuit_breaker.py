@@ -0,0 +1,151 @@
+"""
+Tests for upstream circuit breakers.
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, circuit_breakers
+from app.core.config import settings
+from app.services.tech_trivia_service import TechTriviaService
+
+URL = "https://api.example.com/items?amount=1"
+
+
+def fail(breaker: CircuitBreaker, times: int = 1):
+    """Record failed requests through the breaker."""
+    for _ in range(times):
+        with pytest.raises(RuntimeError):
+            with breaker.guard():
+                raise RuntimeError("upstream down")
+
+
+def succeed(breaker: CircuitBreaker, times: int = 1):
+    """Record successful requests through the breaker."""
+    for _ in range(times):
+        with breaker.guard():
+            pass
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker state transitions."""
+
+    def test_opens_when_failure_rate_reached(self):
+        """Test that the circuit opens once the window's failure rate reaches the threshold."""
+        breaker = CircuitBreaker("api", failure_rate=0.5, window_size=10, min_requests=4)
+        succeed(breaker, 2)
+        fail(breaker, 1)
+        assert breaker.state == CLOSED
+
+        fail(breaker, 1)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pytest.fail("open circuit must not run the request")
+
+    def test_needs_minimum_requests_before_opening(self):
+        """Test that a few early failures do not open the circuit."""
+        breaker = CircuitBreaker("api", min_requests=5)
+        fail(breaker, 4)
+
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_success_closes(self):
+        """Test that a successful probe after the cool-down closes the circuit."""
+        breaker = CircuitBreaker("api", min_requests=1, open_seconds=10)
+        with patch('app.core.circuit_breaker.time.monotonic', side_effect=[100.0, 100.0, 111.0, 111.0]):
+            fail(breaker)
+            assert breaker.state == OPEN
+            assert breaker.state == HALF_OPEN
+            succeed(breaker)
+
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_failure_reopens(self):
+        """Test that a failed probe opens the circuit again."""
+        breaker = CircuitBreaker("api", min_requests=1, open_seconds=0)
+        fail(breaker)
+        assert breaker.state == HALF_OPEN
+
+        breaker.open_seconds = 60
+        fail(breaker)
+        assert breaker.state == OPEN
+
+    def test_half_open_limits_concurrent_probes(self):
+        """Test that only the configured number of probes run while half-open."""
+        breaker = CircuitBreaker("api", min_requests=1, open_seconds=0, half_open_probes=1)
+        fail(breaker)
+
+        with breaker.guard():
+            with pytest.raises(CircuitOpenError):
+                with breaker.guard():
+                    pass
+        assert breaker.state == CLOSED
+
+    def test_ignored_errors_do_not_count(self):
+        """Test that errors not classified as failures leave the circuit closed."""
+        breaker = CircuitBreaker("api", min_requests=1)
+        with pytest.raises(ValueError):
+            with breaker.guard(is_failure=lambda e: False):
+                raise ValueError("bad payload")
+
+        assert breaker.state == CLOSED
+
+
+class TestServiceCircuitBreaker:
+    """Test cases for circuit breaking in BaseService."""
+
+    @pytest.fixture(autouse=True)
+    def breaker_settings(self):
+        """Open the circuit after a couple of failures."""
+        with patch.object(settings, 'CIRCUIT_BREAKER_MIN_REQUESTS', 2), \
+             patch.object(settings, 'CIRCUIT_BREAKER_OPEN_SECONDS', 60):
+            yield
+
+    async def test_open_circuit_serves_fallback_without_request(self):
+        """Test that an endpoint failing repeatedly is skipped instantly."""
+        calls = 0
+
+        async def fetch(url, response_model, timeout):
+            nonlocal calls
+            calls += 1
+            raise asyncio.TimeoutError()
+
+        service = TechTriviaService()
+        with patch.object(service, '_fetch', fetch):
+            for _ in range(5):
+                assert await service._make_request(url=URL) == service._get_fallback_data()
+
+        assert calls == 2
+        assert circuit_breakers.states() == {"https://api.example.com/items": OPEN}
+
+    async def test_client_errors_do_not_open_circuit(self):
+        """Test that 404 responses are not treated as an unhealthy endpoint."""
+        async def fetch(url, response_model, timeout):
+            raise aiohttp.ClientResponseError(MagicMock(real_url=URL), (), status=404)
+
+        service = TechTriviaService()
+        with patch.object(service, '_fetch', fetch):
+            for _ in range(3):
+                await service._make_request(url=URL)
+
+        assert circuit_breakers.get(URL).state == CLOSED
+
+    async def test_circuit_breaker_can_be_disabled(self):
+        """Test that every request reaches the endpoint when circuit breaking is disabled."""
+        calls = 0
+
+        async def fetch(url, response_model, timeout):
+            nonlocal calls
+            calls += 1
+            raise aiohttp.ClientConnectionError("connection refused")
+
+        service = TechTriviaService()
+        with patch.object(settings, 'CIRCUIT_BREAKER_ENABLED', False), \
+             patch.object(service, '_fetch', fetch):
+            for _ in range(4):
+                await service._make_request(url=URL)
+
+        assert calls == 4
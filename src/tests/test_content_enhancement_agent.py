@@ -0,0 +1,81 @@
+"""
+Tests for the ContentEnhancementAgent.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.agents.content_enhancement_agent import ContentEnhancementAgent
+from app.core.deadline import deadline_scope
+from app.schemas.meeting_content import MeetingContent
+
+
+class TestContentEnhancementAgent:
+    """Test cases for ContentEnhancementAgent."""
+
+    @pytest.fixture
+    def content(self):
+        """Basic section texts as returned by the agent tools."""
+        return MeetingContent(
+            trivia="Question: What is Python?\nAnswer: A programming language",
+            fun_fact="Honey never spoils.",
+            trending_repos="• test/repo - A test repository"
+        )
+
+    async def test_enhance_uses_single_structured_request(self, content):
+        """Test that all sections are enhanced with one structured-output request."""
+        enhanced = MeetingContent(trivia="Enhanced trivia", fun_fact="Enhanced fact", trending_repos="Enhanced repos")
+        gateway = MagicMock()
+        gateway.get_structured_response = AsyncMock(return_value=enhanced)
+
+        result = await ContentEnhancementAgent(gateway).enhance(content, "sprint planning")
+
+        assert result == enhanced
+        gateway.get_structured_response.assert_called_once()
+        prompt, response_model = gateway.get_structured_response.call_args[0]
+        assert response_model is MeetingContent
+        assert prompt.count("sprint planning") == 1
+        assert "What is Python?" in prompt
+        assert "Honey never spoils." in prompt
+        assert "test/repo" in prompt
+
+    async def test_enhance_failure_returns_original_content(self, content):
+        """Test that the basic content is kept when the LLM request fails."""
+        gateway = MagicMock()
+        gateway.get_structured_response = AsyncMock(side_effect=ValueError("LLM error"))
+
+        result = await ContentEnhancementAgent(gateway).enhance(content, "sprint planning")
+
+        assert result == content
+
+    async def test_enhance_gives_up_at_the_request_deadline(self, content):
+        """Test that a slow LLM request is abandoned when the request deadline is reached."""
+        async def slow_response(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        gateway = MagicMock()
+        gateway.get_structured_response = slow_response
+
+        start = asyncio.get_event_loop().time()
+        with deadline_scope(0.1):
+            result = await ContentEnhancementAgent(gateway).enhance(content, "sprint planning")
+
+        assert result == content
+        assert asyncio.get_event_loop().time() - start < 1
+
+    async def test_enhance_batch_uses_batch_api_and_keeps_failures(self, content):
+        """Test that meetings are enhanced in one batch call, keeping basic content where it failed."""
+        enhanced = MeetingContent(trivia="Enhanced trivia", fun_fact="Enhanced fact", trending_repos="Enhanced repos")
+        gateway = MagicMock()
+        gateway.get_structured_responses = AsyncMock(return_value=[enhanced, None])
+
+        result = await ContentEnhancementAgent(gateway).enhance_batch(
+            [content, content, content], ["sprint planning", "", "retro"]
+        )
+
+        assert result == [enhanced, content, content]
+        prompts, response_model = gateway.get_structured_responses.call_args[0]
+        assert response_model is MeetingContent
+        assert len(prompts) == 2
+        assert "sprint planning" in prompts[0] and "retro" in prompts[1]
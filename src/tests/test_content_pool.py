@@ -0,0 +1,150 @@
+"""
+Tests for the prefetched content pool.
+"""
+import asyncio
+
+from app.services.content_pool import ContentPool
+
+
+def make_pool(batches, capacity=10, low_watermark=2, served_memory=100, **kwargs):
+    """Create a pool whose fetches return the given batches in order."""
+    batches = iter(batches)
+    calls = []
+
+    async def fetch_batch():
+        calls.append(1)
+        return next(batches, [])
+
+    pool = ContentPool(
+        "test",
+        fetch_batch=fetch_batch,
+        key=lambda item: item,
+        capacity=capacity,
+        low_watermark=low_watermark,
+        served_memory=served_memory,
+        **kwargs
+    )
+    return pool, calls
+
+
+class TestContentPool:
+    """Test cases for ContentPool."""
+
+    async def test_take_serves_batch_in_order_from_memory(self):
+        """Test that one batch fetch serves several takes."""
+        pool, calls = make_pool([["a", "b", "c", "d"]], low_watermark=0)
+
+        items = [await pool.take() for _ in range(4)]
+
+        assert items == ["a", "b", "c", "d"]
+        assert len(calls) == 1
+
+    async def test_duplicates_within_and_across_batches_are_dropped(self):
+        """Test that queued and served items are not enqueued twice."""
+        pool, _ = make_pool([["a", "a", "b"], ["b", "c"]], low_watermark=0)
+
+        assert await pool.refill() == 2
+        assert await pool.take() == "a"
+        assert await pool.refill() == 1
+        assert [await pool.take(), await pool.take()] == ["b", "c"]
+
+    async def test_served_items_are_not_requeued(self):
+        """Test that recently served items are skipped on refill."""
+        pool, _ = make_pool([["a"], ["a", "b"]], low_watermark=0)
+
+        assert await pool.take() == "a"
+        assert await pool.take() == "b"
+
+    async def test_capacity_is_respected(self):
+        """Test that the pool never holds more than its capacity."""
+        pool, _ = make_pool([["a", "b", "c", "d"]], capacity=2, low_watermark=0)
+
+        assert await pool.refill() == 2
+        assert len(pool) == 2
+
+    async def test_low_watermark_triggers_background_refill(self):
+        """Test that dropping below the low watermark refills in the background."""
+        pool, calls = make_pool([["a", "b", "c"], ["d", "e"]], low_watermark=3)
+
+        assert await pool.take() == "a"
+        first_refill = pool._refill_task
+        await first_refill
+        await asyncio.sleep(0)
+        await pool._refill_task
+
+        assert pool._refill_task is not first_refill
+        assert len(calls) == 2
+        assert len(pool) == 4
+
+    async def test_empty_fetch_returns_none(self):
+        """Test that take returns None when nothing can be fetched."""
+        pool, _ = make_pool([[]])
+
+        assert await pool.take() is None
+
+    async def test_exhausted_history_is_recycled(self):
+        """Test that the pool recycles served items rather than starving."""
+        pool, _ = make_pool([["a"], ["a"]], low_watermark=0)
+
+        assert await pool.take() == "a"
+        assert await pool.take() == "a"
+
+    async def test_served_window_forgets_oldest(self):
+        """Test that items outside the served window can be queued again."""
+        pool, _ = make_pool([["a"], ["b"], ["a"]], low_watermark=0, served_memory=1)
+
+        assert await pool.take() == "a"
+        assert await pool.take() == "b"
+        assert await pool.take() == "a"
+
+    async def test_multi_fetch_refill_respects_concurrency(self):
+        """Test that a multi-fetch refill never exceeds its concurrency limit."""
+        in_flight = 0
+        peak = 0
+        counter = iter(range(100))
+
+        async def fetch_one():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return [next(counter)]
+
+        pool = ContentPool(
+            "test",
+            fetch_batch=fetch_one,
+            key=lambda item: item,
+            capacity=6,
+            low_watermark=0,
+            refill_concurrency=2,
+            max_fetches_per_refill=6
+        )
+
+        assert await pool.refill() == 6
+        assert peak == 2
+
+    async def test_take_on_empty_returns_first_item_before_refill_completes(self):
+        """Test that a blocked caller is released by the first fetched item."""
+        release_second = asyncio.Event()
+        results = iter([["a"], ["b"]])
+
+        async def fetch_one():
+            item = next(results)
+            if item == ["b"]:
+                await release_second.wait()
+            return item
+
+        pool = ContentPool(
+            "test",
+            fetch_batch=fetch_one,
+            key=lambda item: item,
+            capacity=2,
+            low_watermark=0,
+            max_fetches_per_refill=2
+        )
+
+        assert await pool.take() == "a"
+        assert not pool._refill_task.done()
+        release_second.set()
+        await pool._refill_task
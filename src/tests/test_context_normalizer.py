@@ -0,0 +1,100 @@
+"""
+Tests for meeting context canonicalization.
+"""
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.core.context_normalizer import (
+    ContextCanonicalizer,
+    MinHasher,
+    canonicalize_context,
+    shingles,
+    tokenize,
+)
+
+
+class TestTokenize:
+    """Test cases for tokenize."""
+
+    def test_strips_case_punctuation_and_stopwords(self):
+        """Test that only meaningful lowercase tokens remain."""
+        assert tokenize("Our Sprint Planning meeting!!") == ["sprint", "planning"]
+
+    def test_joins_hyphens_and_keeps_words(self):
+        """Test that hyphenated words are joined and other words are not altered."""
+        assert tokenize("Daily stand-ups") == ["daily", "standups"]
+        assert tokenize("Kubernetes migration kickoff") == ["kubernetes", "migration", "kickoff"]
+
+    def test_keeps_negations(self):
+        """Test that negations are not treated as stopwords."""
+        assert tokenize("not a retro") == ["not", "retro"]
+
+
+class TestMinHasher:
+    """Test cases for MinHasher."""
+
+    def test_signature_is_deterministic(self):
+        """Test that signatures do not depend on the process or instance."""
+        features = shingles(["sprint", "planning"])
+
+        assert MinHasher(64).signature(features) == MinHasher(64).signature(features)
+        assert len(MinHasher(64).signature(features)) == 64
+
+
+class TestContextCanonicalizer:
+    """Test cases for ContextCanonicalizer."""
+
+    def test_equivalent_phrasings_share_canonical_form(self):
+        """Test that phrasings with the same meaningful tokens map to one form."""
+        canonicalizer = ContextCanonicalizer()
+
+        forms = {
+            canonicalizer.canonicalize(context)
+            for context in ["Sprint Planning!!", "sprint planning meeting", "our sprint planning", "Planning, sprint"]
+        }
+
+        assert forms == {"sprint planning"}
+
+    def test_near_duplicates_use_first_phrasing(self):
+        """Test that typos and plurals are matched through the LSH index."""
+        canonicalizer = ContextCanonicalizer()
+        canonicalizer.canonicalize("sprint planning")
+
+        assert canonicalizer.canonicalize("Sprint planing") == "sprint planning"
+        assert canonicalizer.canonicalize("sprint plannings") == "sprint planning"
+
+    def test_distinct_contexts_stay_distinct(self):
+        """Test that different meetings are not merged."""
+        canonicalizer = ContextCanonicalizer()
+
+        assert canonicalizer.canonicalize("sprint planning") == "sprint planning"
+        assert canonicalizer.canonicalize("sprint review") == "sprint review"
+        assert canonicalizer.canonicalize("frontend standup") == "frontend standup"
+        assert canonicalizer.canonicalize("backend standup") == "backend standup"
+
+    def test_different_numbers_stay_distinct(self):
+        """Test that contexts differing only in a number are never merged."""
+        canonicalizer = ContextCanonicalizer()
+
+        assert canonicalizer.canonicalize("team of 10 standup") == "team 10 standup"
+        assert canonicalizer.canonicalize("team of 100 standup") == "team 100 standup"
+
+    def test_empty_context(self):
+        """Test that contexts without meaningful tokens canonicalize to an empty string."""
+        assert ContextCanonicalizer().canonicalize("Our meeting!") == ""
+
+    def test_index_is_bounded(self):
+        """Test that no more than max_entries contexts are indexed."""
+        canonicalizer = ContextCanonicalizer(max_entries=2)
+
+        for context in ["sprint planning", "design review", "quarterly roadmap"]:
+            canonicalizer.canonicalize(context)
+
+        assert len(canonicalizer) == 2
+        assert canonicalizer.canonicalize("Quarterly Roadmap") == "quarterly roadmap"
+
+    def test_canonicalize_context_can_be_disabled(self):
+        """Test that the settings switch returns contexts unchanged."""
+        with patch.object(settings, 'CONTEXT_CANONICALIZATION_ENABLED', False):
+            assert canonicalize_context("Sprint Planning!!") == "Sprint Planning!!"
+        assert canonicalize_context("Sprint Planning!!") == "sprint planning"
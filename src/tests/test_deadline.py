@@ -0,0 +1,79 @@
+"""
+Tests for request deadline propagation.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.core.deadline import budget, current_deadline, deadline_scope, remaining
+from app.core.rate_limiter import rate_limiters
+from app.services.tech_trivia_service import TechTriviaService
+
+
+class TestDeadline:
+    """Test cases for deadline scopes and budgets."""
+
+    def test_unbounded_without_scope(self):
+        """Test that layers keep their own timeouts outside any deadline scope."""
+        assert current_deadline() is None
+        assert remaining() is None
+        assert budget(30) == 30
+
+    def test_budget_is_capped_by_remaining_time(self):
+        """Test that a layer's timeout shrinks to the time left in the request."""
+        with deadline_scope(5):
+            assert 4.5 < budget(30) <= 5
+            assert budget(1) == 1
+        assert current_deadline() is None
+
+    def test_budget_keeps_reserve_and_never_goes_negative(self):
+        """Test that reserved time is subtracted and exhausted budgets are zero."""
+        with deadline_scope(5):
+            assert 1.5 < budget(30, reserve=3) <= 2
+            assert budget(30, reserve=10) == 0
+
+    def test_nested_scope_cannot_extend_outer_deadline(self):
+        """Test that an inner scope only ever shortens the deadline."""
+        with deadline_scope(1) as outer:
+            with deadline_scope(60) as inner:
+                assert inner == outer
+            with deadline_scope(0.5) as shorter:
+                assert shorter < outer
+
+    async def test_tasks_inherit_deadline(self):
+        """Test that tasks created inside a scope see its deadline."""
+        with deadline_scope(5) as deadline:
+            seen = await asyncio.create_task(self._read_deadline())
+        assert seen == deadline
+
+    @staticmethod
+    async def _read_deadline():
+        return current_deadline()
+
+
+class TestServiceDeadline:
+    """Test that services honour the request deadline."""
+
+    async def test_service_skips_request_when_deadline_has_passed(self):
+        """Test that a service returns fallback data instead of starting a doomed request."""
+        service = TechTriviaService()
+        with patch('app.services.http_session_manager.get_session') as mock_get_session:
+            with deadline_scope(0):
+                result = await service._make_request()
+
+        mock_get_session.assert_not_called()
+        assert result == service._get_fallback_data()
+
+    async def test_rate_limit_wait_comes_out_of_the_request_timeout(self):
+        """Test that a request started after waiting for a rate-limit token only gets the time left."""
+        service = TechTriviaService()
+        fetch = AsyncMock(return_value={"ok": True})
+
+        with patch.object(settings, 'RATE_LIMITS', {"opentdb.com": 5}), \
+             patch.object(service, '_fetch', fetch):
+            rate_limiters.try_acquire(service.api_url)
+            with deadline_scope(0.5):
+                assert await service._make_request() == {"ok": True}
+
+        timeout = fetch.call_args[0][2]
+        assert timeout <= 0.31
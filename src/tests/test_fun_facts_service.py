@@ -0,0 +1,107 @@
+"""
+Tests for the Fun Facts Service.
+"""
+import asyncio
+from unittest.mock import patch, AsyncMock
+
+from app.schemas.fun_facts import FunFact
+from app.services.fun_facts_service import FunFactsService, FALLBACK_FUN_FACT_ID
+
+
+def make_fun_fact(fact_id: str) -> FunFact:
+    """Create a fun fact with the given id."""
+    return FunFact(
+        id=fact_id,
+        text=f"Fun fact {fact_id}",
+        source="Test Source",
+        source_url="https://test.com",
+        language="en",
+        permalink=f"https://test.com/fact/{fact_id}"
+    )
+
+
+class TestFunFactsService:
+    """Test cases for FunFactsService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = FunFactsService()
+
+    def test_fallback_is_valid_fun_fact(self):
+        """Test that the fallback fun fact passes validation."""
+        fallback = self.service._get_fallback_data()
+
+        assert isinstance(fallback, FunFact)
+        assert fallback.id == FALLBACK_FUN_FACT_ID
+        assert fallback.text
+
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_fetch_validated_fun_facts_skips_fallback(self, mock_make_request):
+        """Test that fallback data is never added to the reservoir."""
+        mock_make_request.return_value = self.service._get_fallback_data()
+
+        assert await self.service.fetch_validated_fun_facts() == []
+
+    @patch('app.services.fun_facts_service.settings.FUN_FACTS_RESERVOIR_ENABLED', True)
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_reservoir_deduplicates_by_id(self, mock_make_request):
+        """Test that the reservoir never serves the same fact id twice in a row."""
+        mock_make_request.side_effect = [make_fun_fact("1"), make_fun_fact("1"), make_fun_fact("2")] + [
+            self.service._get_fallback_data()
+        ] * 50
+
+        first = await self.service.get_fun_fact()
+        second = await self.service.get_fun_fact()
+
+        assert first.id == "1"
+        assert second.id == "2"
+
+    @patch('app.services.fun_facts_service.settings.FUN_FACTS_RESERVOIR_ENABLED', True)
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_reservoir_empty_uses_fallback(self, mock_make_request):
+        """Test that an empty reservoir falls back to the hardcoded fact."""
+        mock_make_request.return_value = self.service._get_fallback_data()
+
+        fun_fact = await self.service.get_fun_fact()
+
+        assert fun_fact.id == FALLBACK_FUN_FACT_ID
+
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_get_fun_facts_bounds_concurrency(self, mock_make_request):
+        """Test that batch fetches return one fact each with bounded concurrency."""
+        running = 0
+        peak = 0
+
+        async def fetch(*args, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return make_fun_fact(str(peak))
+
+        mock_make_request.side_effect = fetch
+
+        fun_facts = await self.service.get_fun_facts(5, concurrency=2)
+
+        assert len(fun_facts) == 5
+        assert peak == 2
+
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_get_fun_facts_refetches_duplicates(self, mock_make_request):
+        """Test that a fact fetched twice is replaced by another fetch."""
+        mock_make_request.side_effect = [make_fun_fact("1"), make_fun_fact("1"), make_fun_fact("2"), make_fun_fact("3")]
+
+        fun_facts = await self.service.get_fun_facts(3, concurrency=3)
+
+        assert [fun_fact.id for fun_fact in fun_facts] == ["1", "2", "3"]
+
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_get_fun_facts_reuses_facts_when_api_is_down(self, mock_make_request):
+        """Test that fallback data is fetched once per meeting and then reused, not refetched round after round."""
+        mock_make_request.return_value = self.service._get_fallback_data()
+
+        fun_facts = await self.service.get_fun_facts(3, concurrency=3)
+
+        assert [fun_fact.id for fun_fact in fun_facts] == [FALLBACK_FUN_FACT_ID] * 3
+        assert mock_make_request.await_count == 5
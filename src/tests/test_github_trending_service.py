@@ -2,7 +2,7 @@
 Tests for the GitHub Trending Service.
 """
 import pytest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 from app.services.github_trending_service import GitHubTrendingService
 
@@ -72,15 +72,13 @@ class TestGitHubTrendingService:
         assert len(repos) > 0
         assert all('name' in repo for repo in repos)
 
-    @patch('app.services.aiohttp.ClientSession')
-    async def test_get_trending_repos_api_error(self, mock_session_class):
+    @patch('app.services.http_session_manager.get_session')
+    async def test_get_trending_repos_api_error(self, mock_get_session):
         """Test handling of API errors."""
-        # Mock aiohttp to raise an exception
-        mock_session = AsyncMock()
-        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-        mock_session.__aexit__ = AsyncMock(return_value=None)
-        mock_session.get = AsyncMock(side_effect=Exception("API Error"))
-        mock_session_class.return_value = mock_session
+        # Mock the pooled session to raise an exception
+        mock_session = MagicMock()
+        mock_session.get = MagicMock(side_effect=Exception("API Error"))
+        mock_get_session.return_value = mock_session
 
         repos = await self.service.get_trending_repos()
 
@@ -88,6 +86,35 @@ class TestGitHubTrendingService:
         assert len(repos) > 0
         assert all('name' in repo for repo in repos)
 
+    @patch('app.services.BaseService._make_request')
+    async def test_get_trending_repos_served_from_cache(self, mock_make_request):
+        """Test that a second call within the TTL does not hit the API."""
+        mock_make_request.return_value = {
+            'data': [{'repo_name': 'test/repo1', 'description': 'Test', 'language': 'Python', 'stars': 10}]
+        }
+
+        first = await self.service.get_trending_repos()
+        second = await GitHubTrendingService().get_trending_repos()
+
+        assert first == second
+        assert second[0]['name'] == 'test/repo1'
+        mock_make_request.assert_called_once()
+
+    @patch('app.services.BaseService._make_request')
+    async def test_get_trending_repos_fallback_not_cached(self, mock_make_request):
+        """Test that fallback data is not cached and the API is retried."""
+        mock_make_request.side_effect = [
+            {'invalid': 'data'},
+            {'data': [{'repo_name': 'test/repo1', 'description': 'Test', 'language': 'Python', 'stars': 10}]}
+        ]
+
+        first = await self.service.get_trending_repos()
+        second = await self.service.get_trending_repos()
+
+        assert first == self.service._get_fallback_data()
+        assert second[0]['name'] == 'test/repo1'
+        assert mock_make_request.call_count == 2
+
     def test_get_fallback_data(self):
         """Test fallback repositories method."""
         fallback_repos = self.service._get_fallback_data()
@@ -0,0 +1,87 @@
+"""
+Tests for the pooled HTTP session manager.
+"""
+import pytest
+from aiohttp import web
+
+from app.core.config import settings
+from app.core.http_session import HTTPSessionManager, http_session_manager
+from app.services import BaseService
+
+
+class StubService(BaseService):
+    """Minimal service used to exercise BaseService against a local server."""
+
+    def _get_fallback_data(self):
+        return {"fallback": True}
+
+
+@pytest.fixture
+async def stub_url():
+    """Start a local HTTP server that returns a fixed JSON payload."""
+    async def handler(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/data", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/data"
+    await runner.cleanup()
+
+
+class TestHTTPSessionManager:
+    """Test cases for HTTPSessionManager."""
+
+    async def test_get_session_reuses_session(self):
+        """Test that the same session is returned within one event loop."""
+        manager = HTTPSessionManager()
+        first = manager.get_session()
+        second = manager.get_session()
+
+        assert first is second
+        await manager.close()
+
+    async def test_connector_uses_pool_settings(self):
+        """Test that the connector is configured from settings."""
+        manager = HTTPSessionManager()
+        session = manager.get_session()
+
+        assert session.connector.limit == settings.HTTP_POOL_LIMIT
+        assert session.connector.limit_per_host == settings.HTTP_POOL_LIMIT_PER_HOST
+        await manager.close()
+
+    async def test_session_recreated_after_close(self):
+        """Test that a closed session is replaced on next use."""
+        manager = HTTPSessionManager()
+        first = manager.get_session()
+        await manager.close()
+
+        assert first.closed
+        second = manager.get_session()
+        assert second is not first
+        assert not second.closed
+        await manager.close()
+
+    async def test_close_is_idempotent(self):
+        """Test that closing twice or before first use is safe."""
+        manager = HTTPSessionManager()
+        await manager.close()
+        manager.get_session()
+        await manager.close()
+        await manager.close()
+
+    async def test_services_share_pooled_session(self, stub_url):
+        """Test that consecutive service requests go through one pooled session."""
+        service = StubService(stub_url)
+
+        first = await service._make_request()
+        session = http_session_manager.get_session()
+        second = await service._make_request()
+
+        assert first == {"ok": True}
+        assert second == {"ok": True}
+        assert http_session_manager.get_session() is session
@@ -0,0 +1,184 @@
+"""
+Tests for per-endpoint latency tracking and request hedging.
+"""
+import asyncio
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from app.core.circuit_breaker import OPEN, circuit_breakers
+from app.core.config import settings
+from app.core.latency import LatencyHistogram, LatencyTracker, endpoint_key, latency_tracker
+from app.services.tech_trivia_service import TechTriviaService
+
+URL = "https://api.example.com/items?amount=1"
+
+
+def warm_up(url: str = URL, seconds: float = 0.01, samples: int = 50):
+    """Record enough fast responses for an endpoint to enable hedging."""
+    for _ in range(samples):
+        latency_tracker.observe(url, seconds)
+
+
+class TestLatencyHistogram:
+    """Test cases for LatencyHistogram and LatencyTracker."""
+
+    def test_quantiles_follow_observations(self):
+        """Test that quantile estimates bound the observed latencies."""
+        histogram = LatencyHistogram()
+        for _ in range(95):
+            histogram.observe(0.1)
+        for _ in range(5):
+            histogram.observe(5.0)
+
+        assert 0.1 <= histogram.quantile(0.5) < 0.13
+        assert histogram.quantile(0.99) >= 5.0
+        assert histogram.snapshot()["count"] == 100
+
+    def test_empty_histogram_has_no_quantile(self):
+        """Test that no estimate is made without observations."""
+        assert LatencyHistogram().quantile(0.95) is None
+
+    def test_old_observations_decay(self):
+        """Test that counts are halved once the decay threshold is reached."""
+        histogram = LatencyHistogram(decay_after=10)
+        for _ in range(10):
+            histogram.observe(0.1)
+
+        assert histogram.count == 5
+
+    def test_endpoint_key_ignores_query(self):
+        """Test that requests differing only in query parameters share an endpoint."""
+        assert endpoint_key(URL) == endpoint_key("https://api.example.com/items?amount=50") == "https://api.example.com/items"
+
+    def test_hedge_delay_requires_samples(self):
+        """Test that hedging waits for enough observations and respects the minimum delay."""
+        tracker = LatencyTracker()
+        tracker.observe(URL, 0.001)
+        assert tracker.hedge_delay(URL) is None
+
+        for _ in range(settings.HTTP_HEDGE_MIN_SAMPLES):
+            tracker.observe(URL, 0.001)
+        assert tracker.hedge_delay(URL) == settings.HTTP_HEDGE_MIN_DELAY
+
+
+class TestRequestHedging:
+    """Test cases for hedged requests in BaseService."""
+
+    @pytest.fixture(autouse=True)
+    def hedge_settings(self):
+        """Hedge quickly so tests stay fast."""
+        with patch.object(settings, 'HTTP_HEDGE_MIN_DELAY', 0.02), \
+             patch.object(settings, 'HTTP_HEDGE_STRATEGY', 'request'):
+            yield
+
+    async def test_no_hedge_without_latency_history(self):
+        """Test that a single request is sent until the endpoint has been observed."""
+        calls = []
+
+        async def fetch(url, response_model, timeout):
+            calls.append(url)
+            await asyncio.sleep(0.05)
+            return {"ok": True}
+
+        service = TechTriviaService()
+        with patch.object(service, '_fetch', fetch):
+            assert await service._make_request(url=URL) == {"ok": True}
+        assert len(calls) == 1
+
+    async def test_slow_request_is_hedged_and_loser_cancelled(self):
+        """Test that a stalled request is raced against a second one and the loser is cancelled."""
+        warm_up()
+        cancelled = asyncio.Event()
+        calls = 0
+
+        async def fetch(url, response_model, timeout):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return {"attempt": calls}
+
+        service = TechTriviaService()
+        with patch.object(service, '_fetch', fetch):
+            result = await asyncio.wait_for(service._make_request(url=URL), timeout=1)
+
+        assert result == {"attempt": 2}
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        # The cancelled primary still counts, at the time it had been running
+        assert latency_tracker.histogram(URL).count == 51
+
+    async def test_failed_hedge_waits_for_primary(self):
+        """Test that a failing hedge does not discard a primary that later succeeds."""
+        warm_up()
+        calls = 0
+
+        async def fetch(url, response_model, timeout):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.1)
+                return {"attempt": 1}
+            raise aiohttp.ClientError("hedge failed")
+
+        service = TechTriviaService()
+        with patch.object(service, '_fetch', fetch):
+            assert await service._make_request(url=URL) == {"attempt": 1}
+
+    async def test_fallback_strategy_serves_fallback_data(self):
+        """Test that the fallback strategy answers with fallback data instead of a second request."""
+        warm_up()
+        calls = 0
+
+        async def fetch(url, response_model, timeout):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(5)
+
+        service = TechTriviaService()
+        with patch.object(settings, 'HTTP_HEDGE_STRATEGY', 'fallback'), \
+             patch.object(service, '_fetch', fetch):
+            result = await asyncio.wait_for(service._make_request(url=URL), timeout=1)
+
+        assert result == service._get_fallback_data()
+        assert calls == 1
+
+    async def test_fallback_strategy_counts_as_failure(self):
+        """Test that a request given up by the fallback strategy counts against the endpoint and its latency."""
+        warm_up()
+
+        async def fetch(url, response_model, timeout):
+            await asyncio.sleep(5)
+
+        service = TechTriviaService()
+        with patch.object(settings, 'HTTP_HEDGE_STRATEGY', 'fallback'), \
+             patch.object(settings, 'CIRCUIT_BREAKER_MIN_REQUESTS', 1), \
+             patch.object(service, '_fetch', fetch):
+            await asyncio.wait_for(service._make_request(url=URL), timeout=1)
+
+        assert circuit_breakers.get(URL).state == OPEN
+        histogram = latency_tracker.histogram(URL)
+        assert histogram.count == 51
+        assert histogram.quantile(1.0) >= settings.HTTP_HEDGE_MIN_DELAY
+
+    async def test_hedging_can_be_disabled(self):
+        """Test that no hedge is sent when hedging is disabled."""
+        warm_up()
+        calls = 0
+
+        async def fetch(url, response_model, timeout):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"ok": True}
+
+        service = TechTriviaService()
+        with patch.object(settings, 'HTTP_HEDGING_ENABLED', False), \
+             patch.object(service, '_fetch', fetch):
+            await service._make_request(url=URL)
+        assert calls == 1
@@ -0,0 +1,176 @@
+"""
+Tests for the LLM response caches.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.llm_cache import (
+    InMemoryLLMCache,
+    LLMResponseCache,
+    SQLiteLLMCache,
+    get_llm_cache,
+    make_cache_key,
+)
+
+
+class TestMakeCacheKey:
+    """Test cases for make_cache_key."""
+
+    def test_key_is_stable(self):
+        """Test that identical inputs produce the same key."""
+        assert make_cache_key("gpt-4o-mini", 0.0, "prompt") == make_cache_key("gpt-4o-mini", 0.0, "prompt")
+
+    def test_key_depends_on_all_inputs(self):
+        """Test that model, temperature, prompt and kind all change the key."""
+        base = make_cache_key("gpt-4o-mini", 0.0, "prompt", "text")
+
+        assert make_cache_key("gpt-4o", 0.0, "prompt", "text") != base
+        assert make_cache_key("gpt-4o-mini", 0.7, "prompt", "text") != base
+        assert make_cache_key("gpt-4o-mini", 0.0, "other prompt", "text") != base
+        assert make_cache_key("gpt-4o-mini", 0.0, "prompt", "MeetingContent") != base
+
+
+class TestLLMResponseCache:
+    """Test cases for the cache base class."""
+
+    def test_backends_must_implement_storage(self):
+        """Test that a backend missing any storage method cannot be created."""
+        class Incomplete(LLMResponseCache):
+            async def _get(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            Incomplete("incomplete", max_entries=1, ttl=1)
+
+
+class TestInMemoryLLMCache:
+    """Test cases for InMemoryLLMCache."""
+
+    async def test_get_after_set_counts_hits_and_misses(self):
+        """Test that lookups are counted as hits and misses."""
+        cache = InMemoryLLMCache(max_entries=10, ttl=60)
+
+        assert await cache.get("key") is None
+        await cache.set("key", "value")
+        assert await cache.get("key") == "value"
+
+        assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    async def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = InMemoryLLMCache(max_entries=2, ttl=60)
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        await cache.get("a")
+
+        await cache.set("c", "3")
+
+        assert len(cache) == 2
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "1"
+        assert await cache.get("c") == "3"
+
+    async def test_expired_entries_are_misses(self):
+        """Test that entries older than the TTL are not served."""
+        cache = InMemoryLLMCache(max_entries=10, ttl=60)
+        with patch('app.core.llm_cache.time.monotonic', return_value=1000.0):
+            await cache.set("key", "value")
+        with patch('app.core.llm_cache.time.monotonic', return_value=1061.0):
+            assert await cache.get("key") is None
+
+        assert len(cache) == 0
+
+    async def test_clear_resets_entries_and_counters(self):
+        """Test that clearing drops entries and counters."""
+        cache = InMemoryLLMCache(max_entries=10, ttl=60)
+        await cache.set("key", "value")
+        await cache.get("key")
+
+        await cache.clear()
+
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 0
+
+
+class TestSQLiteLLMCache:
+    """Test cases for SQLiteLLMCache."""
+
+    async def test_persists_across_instances(self, tmp_path):
+        """Test that responses survive reopening the database."""
+        path = str(tmp_path / "cache" / "llm.sqlite3")
+        cache = SQLiteLLMCache(path, max_entries=10, ttl=60)
+        await cache.set("key", "value")
+        cache.close()
+
+        reopened = SQLiteLLMCache(path, max_entries=10, ttl=60)
+        assert await reopened.get("key") == "value"
+        assert reopened.hits == 1
+        reopened.close()
+
+    async def test_shared_between_open_instances(self, tmp_path):
+        """Test that workers with the same database file see each other's responses."""
+        path = str(tmp_path / "llm.sqlite3")
+        first = SQLiteLLMCache(path, max_entries=10, ttl=60)
+        second = SQLiteLLMCache(path, max_entries=10, ttl=60)
+
+        await first.set("key", "value")
+
+        assert await second.get("key") == "value"
+        first.close()
+        second.close()
+
+    async def test_evicts_least_recently_used(self, tmp_path):
+        """Test that the size limit evicts the least recently accessed entries."""
+        cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite3"), max_entries=2, ttl=60)
+        with patch('app.core.llm_cache.time.time', side_effect=[1.0, 2.0, 3.0, 4.0, 5.0, 6.0]):
+            await cache.set("a", "1")
+            await cache.set("b", "2")
+            await cache.get("a")
+            await cache.set("c", "3")
+
+            assert len(cache) == 2
+            assert await cache.get("b") is None
+            assert await cache.get("a") == "1"
+        cache.close()
+
+    async def test_expired_entries_are_misses(self, tmp_path):
+        """Test that entries older than the TTL are not served."""
+        cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite3"), max_entries=10, ttl=60)
+        with patch('app.core.llm_cache.time.time', return_value=1000.0):
+            await cache.set("key", "value")
+        with patch('app.core.llm_cache.time.time', return_value=1061.0):
+            assert await cache.get("key") is None
+
+        assert len(cache) == 0
+        cache.close()
+
+
+class TestGetLLMCache:
+    """Test cases for the settings-driven shared cache."""
+
+    def test_memory_backend_is_shared(self):
+        """Test that the default backend is a shared in-memory cache."""
+        with patch.object(settings, 'LLM_CACHE_BACKEND', 'memory'):
+            cache = get_llm_cache()
+
+            assert isinstance(cache, InMemoryLLMCache)
+            assert get_llm_cache() is cache
+
+    def test_sqlite_backend(self, tmp_path):
+        """Test that the sqlite backend uses the configured path."""
+        path = str(tmp_path / "llm.sqlite3")
+        with patch.object(settings, 'LLM_CACHE_BACKEND', 'sqlite'), \
+             patch.object(settings, 'LLM_CACHE_SQLITE_PATH', path):
+            cache = get_llm_cache()
+
+        assert isinstance(cache, SQLiteLLMCache)
+        assert cache.path == path
+
+    @pytest.mark.parametrize("backend,ttl", [("none", 3600), ("memory", 0)])
+    def test_disabled(self, backend, ttl):
+        """Test that the cache can be disabled by backend or TTL."""
+        with patch.object(settings, 'LLM_CACHE_BACKEND', backend), \
+             patch.object(settings, 'LLM_CACHE_TTL', ttl):
+            assert get_llm_cache() is None
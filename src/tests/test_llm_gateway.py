@@ -0,0 +1,317 @@
+"""
+Tests for the LLM gateway registry.
+"""
+import asyncio
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import pytest
+from pydantic import SecretStr
+
+from app.core.config import settings
+from app.core.deadline import deadline_scope
+from app.core.llm_cache import InMemoryLLMCache
+from app.core.llm_gateway import LLMGateway, LLMGatewayRegistry, llm_gateway_registry, packed_response_model
+from app.schemas.meeting_content import MeetingContent
+from app.schemas.tech_trivia import TechTriviaQuestion
+from app.tools.agent_tools import tech_trivia_agent
+
+
+@pytest.fixture
+def llm_settings():
+    """Provide LLM settings so gateways can be built without a .env file."""
+    with patch.object(settings, 'LLM_API_KEY', SecretStr('test-key')), \
+         patch.object(settings, 'LLM_MODEL', 'gpt-4o-mini'):
+        yield
+
+
+class TestLLMGatewayRegistry:
+    """Test cases for LLMGatewayRegistry."""
+
+    def test_get_returns_shared_gateway(self, llm_settings):
+        """Test that repeated lookups reuse one gateway and chat model."""
+        registry = LLMGatewayRegistry()
+
+        first = registry.get()
+        second = registry.get()
+
+        assert first is second
+        assert first.chat_model is second.chat_model
+
+    def test_get_separates_models(self, llm_settings):
+        """Test that different models get different gateways."""
+        registry = LLMGatewayRegistry()
+
+        default = registry.get()
+        other = registry.get("gpt-4o")
+
+        assert default is not other
+        assert other.model == "gpt-4o"
+
+    def test_openai_gateway_uses_pooled_http_client(self, llm_settings):
+        """Test that the OpenAI-compatible chat model gets the configured pooled client."""
+        gateway = LLMGateway()
+
+        client = gateway.chat_model.http_async_client
+        assert client is not None
+        assert gateway.chat_model.root_async_client._client is client
+
+    def test_register_injects_gateway(self):
+        """Test that an injected gateway is returned by lookups."""
+        registry = LLMGatewayRegistry()
+        fake_gateway = MagicMock()
+
+        registry.register(fake_gateway)
+
+        assert registry.get() is fake_gateway
+
+    async def test_agent_tools_use_shared_gateway(self):
+        """Test that agent tools reuse the registered gateway instead of building one."""
+        fake_gateway = MagicMock()
+        fake_gateway.get_string_response = AsyncMock(return_value="Enhanced trivia")
+        trivia = TechTriviaQuestion(
+            category="Science: Computers",
+            type="multiple",
+            difficulty="easy",
+            question="What is Python?",
+            correct_answer="A programming language",
+            incorrect_answers=["A snake", "A game", "A database"]
+        )
+
+        llm_gateway_registry.register(fake_gateway)
+        with patch('app.tools.agent_tools.TechTriviaAgent') as mock_agent_class, \
+             patch('app.core.llm_gateway.LLMGateway') as mock_gateway_class:
+            mock_agent_class.return_value.get_tech_trivia = AsyncMock(return_value=trivia)
+
+            result = await tech_trivia_agent.coroutine(ctx=MagicMock(), meeting_context="standup")
+
+        assert result == "Enhanced trivia"
+        mock_gateway_class.assert_not_called()
+        fake_gateway.get_string_response.assert_called_once()
+
+
+class TestLLMGatewayCache:
+    """Test cases for LLMGateway response caching."""
+
+    @pytest.fixture
+    def gateway(self, llm_settings):
+        """A gateway with an in-memory cache and a fake chat model."""
+        gateway = LLMGateway(cache=InMemoryLLMCache(max_entries=10, ttl=60))
+        gateway.chat_model = MagicMock(model_name="gpt-4o-mini")
+        gateway.chat_model.ainvoke = AsyncMock(return_value=MagicMock(content="Enhanced"))
+        return gateway
+
+    async def test_string_response_is_cached(self, gateway):
+        """Test that a repeated prompt is served from the cache."""
+        first = await gateway.get_string_response("Enhance this trivia")
+        second = await gateway.get_string_response("Enhance this trivia")
+
+        assert first == second == "Enhanced"
+        gateway.chat_model.ainvoke.assert_called_once()
+        assert gateway.cache.stats()["hits"] == 1
+
+    async def test_different_prompts_are_not_shared(self, gateway):
+        """Test that different prompts each reach the LLM."""
+        await gateway.get_string_response("Prompt one")
+        await gateway.get_string_response("Prompt two")
+
+        assert gateway.chat_model.ainvoke.call_count == 2
+
+    async def test_cache_prompt_keys_the_cache(self, gateway):
+        """Test that prompts with the same cache prompt share an entry, while the LLM gets the prompt itself."""
+        await gateway.get_string_response("Plan Sprint Planning!!", cache_prompt="Plan sprint planning")
+        await gateway.get_string_response("Plan our sprint planning", cache_prompt="Plan sprint planning")
+
+        gateway.chat_model.ainvoke.assert_called_once_with("Plan Sprint Planning!!")
+
+    async def test_failures_are_not_cached(self, gateway):
+        """Test that a failed call is retried on the next request."""
+        gateway.chat_model.ainvoke.side_effect = [Exception("LLM error"), MagicMock(content="Enhanced")]
+
+        with pytest.raises(ValueError):
+            await gateway.get_string_response("Enhance this trivia")
+        assert await gateway.get_string_response("Enhance this trivia") == "Enhanced"
+
+    async def test_call_bounded_by_request_deadline(self, gateway):
+        """Test that an LLM call is abandoned when the request deadline passes."""
+        async def slow_invoke(prompt):
+            await asyncio.sleep(5)
+
+        gateway.chat_model.ainvoke = slow_invoke
+        with deadline_scope(0.05):
+            with pytest.raises(ValueError):
+                await gateway.get_string_response("Enhance this trivia")
+
+    async def test_structured_response_is_cached(self, gateway):
+        """Test that structured responses round-trip through the cache."""
+        content = MeetingContent(trivia="Trivia", fun_fact="Fact", trending_repos="Repos")
+        structured_model = MagicMock()
+        structured_model.ainvoke = AsyncMock(return_value=content)
+        gateway.chat_model.with_structured_output.return_value = structured_model
+
+        first = await gateway.get_structured_response("Enhance everything", MeetingContent)
+        second = await gateway.get_structured_response("Enhance everything", MeetingContent)
+
+        assert first == second == content
+        assert isinstance(second, MeetingContent)
+        structured_model.ainvoke.assert_called_once()
+
+    async def test_streamed_response_is_cached(self, gateway):
+        """Test that a completed stream is cached and replayed in one piece."""
+        async def astream(prompt):
+            for text in ["Meeting ", "Notes"]:
+                yield MagicMock(content=text)
+
+        gateway.chat_model.astream = MagicMock(side_effect=astream)
+
+        first = [text async for text in gateway.stream_string_response("Format the notes")]
+        second = [text async for text in gateway.stream_string_response("Format the notes")]
+
+        assert first == ["Meeting ", "Notes"]
+        assert second == ["Meeting Notes"]
+        gateway.chat_model.astream.assert_called_once()
+        assert await gateway.get_string_response("Format the notes") == "Meeting Notes"
+
+    async def test_registry_gateways_share_cache(self, llm_settings):
+        """Test that gateways from the registry use the configured shared cache."""
+        registry = LLMGatewayRegistry()
+
+        assert isinstance(registry.get().cache, InMemoryLLMCache)
+        assert registry.get().cache is registry.get("gpt-4o").cache
+
+
+class TestLLMGatewayBatch:
+    """Test cases for the LLMGateway batch API."""
+
+    @pytest.fixture
+    def gateway(self, llm_settings):
+        """A gateway with an in-memory cache and a fake chat model."""
+        gateway = LLMGateway(cache=InMemoryLLMCache(max_entries=10, ttl=60))
+        gateway.chat_model = MagicMock(model_name="gpt-4o-mini")
+        return gateway
+
+    @staticmethod
+    def packed_answer(prompt: str, skip: int = 0):
+        """Answer every task in a packed prompt, except task number `skip`."""
+        model = packed_response_model(MeetingContent)
+        count = prompt.count("### Task ")
+        return model(items=[
+            {"index": number, "result": MeetingContent(trivia=f"Trivia {number}", fun_fact="Fact", trending_repos="Repos")}
+            for number in range(1, count + 1) if number != skip
+        ])
+
+    async def test_string_responses_keep_order_and_cap_concurrency(self, gateway):
+        """Test that batched prompts are answered in order through abatch with the concurrency cap."""
+        gateway.chat_model.abatch = AsyncMock(side_effect=lambda prompts, config, return_exceptions: [
+            MagicMock(content=f"Answer to {prompt}") for prompt in prompts
+        ])
+
+        results = await gateway.get_string_responses(["one", "two", "three"], max_concurrency=2)
+
+        assert results == ["Answer to one", "Answer to two", "Answer to three"]
+        assert gateway.chat_model.abatch.call_args.kwargs["config"] == {"max_concurrency": 2}
+
+    async def test_only_failed_prompts_are_retried(self, gateway):
+        """Test that a retry resends just the prompts that failed."""
+        calls = []
+
+        async def abatch(prompts, config, return_exceptions):
+            calls.append(list(prompts))
+            if len(calls) == 1:
+                return [MagicMock(content="ok one"), Exception("rate limited"), MagicMock(content="ok three")]
+            return [MagicMock(content=f"ok {prompt}") for prompt in prompts]
+
+        gateway.chat_model.abatch = abatch
+
+        results = await gateway.get_string_responses(["one", "two", "three"])
+
+        assert results == ["ok one", "ok two", "ok three"]
+        assert calls == [["one", "two", "three"], ["two"]]
+
+    async def test_failures_after_retries_are_none(self, gateway):
+        """Test that prompts failing every attempt come back as None."""
+        gateway.chat_model.abatch = AsyncMock(side_effect=lambda prompts, config, return_exceptions: [
+            Exception("down") for _ in prompts
+        ])
+
+        with patch.object(settings, 'LLM_BATCH_MAX_RETRIES', 2):
+            assert await gateway.get_string_responses(["one"]) == [None]
+
+        assert gateway.chat_model.abatch.call_count == 3
+
+    async def test_cached_prompts_are_not_sent(self, gateway):
+        """Test that batch calls share the response cache with single calls."""
+        gateway.chat_model.ainvoke = AsyncMock(return_value=MagicMock(content="cached"))
+        await gateway.get_string_response("one")
+        gateway.chat_model.abatch = AsyncMock(return_value=[MagicMock(content="fresh")])
+
+        results = await gateway.get_string_responses(["one", "two"])
+
+        assert results == ["cached", "fresh"]
+        assert gateway.chat_model.abatch.call_args[0][0] == ["two"]
+
+    async def test_structured_prompts_are_packed(self, gateway):
+        """Test that structured prompts are packed as numbered tasks, several per request."""
+        structured_model = MagicMock()
+        structured_model.abatch = AsyncMock(side_effect=lambda prompts, config, return_exceptions: [
+            self.packed_answer(prompt) for prompt in prompts
+        ])
+        gateway.chat_model.with_structured_output.return_value = structured_model
+
+        results = await gateway.get_structured_responses(
+            [f"Enhance meeting {i}" for i in range(5)], MeetingContent, pack_size=2
+        )
+
+        assert [result.trivia for result in results] == ["Trivia 1", "Trivia 2", "Trivia 1", "Trivia 2", "Trivia 1"]
+        packed_prompts = structured_model.abatch.call_args[0][0]
+        assert len(packed_prompts) == 3
+        assert "### Task 2\nEnhance meeting 1" in packed_prompts[0]
+        gateway.chat_model.with_structured_output.assert_called_once_with(packed_response_model(MeetingContent))
+
+    async def test_missing_packed_results_are_repacked_and_retried(self, gateway):
+        """Test that only tasks missing from a packed answer are sent again, and results are cached per prompt."""
+        calls = []
+
+        async def abatch(prompts, config, return_exceptions):
+            calls.append(list(prompts))
+            return [self.packed_answer(prompt, skip=2 if len(calls) == 1 else 0) for prompt in prompts]
+
+        structured_model = MagicMock(abatch=abatch)
+        gateway.chat_model.with_structured_output.return_value = structured_model
+
+        results = await gateway.get_structured_responses(["a", "b", "c"], MeetingContent, pack_size=3)
+
+        assert all(isinstance(result, MeetingContent) for result in results)
+        assert len(calls) == 2
+        assert "### Task 1\nb" in calls[1][0] and "### Task 2" not in calls[1][0]
+        single = MagicMock()
+        single.ainvoke = AsyncMock()
+        gateway.chat_model.with_structured_output.return_value = single
+        assert await gateway.get_structured_response("a", MeetingContent) == results[0]
+        single.ainvoke.assert_not_called()
+
+    async def test_pack_size_one_sends_plain_prompts(self, gateway):
+        """Test that packing can be disabled."""
+        content = MeetingContent(trivia="Trivia", fun_fact="Fact", trending_repos="Repos")
+        structured_model = MagicMock()
+        structured_model.abatch = AsyncMock(return_value=[content, content])
+        gateway.chat_model.with_structured_output.return_value = structured_model
+
+        results = await gateway.get_structured_responses(["a", "b"], MeetingContent, pack_size=1)
+
+        assert results == [content, content]
+        assert structured_model.abatch.call_args[0][0] == ["a", "b"]
+        gateway.chat_model.with_structured_output.assert_called_once_with(MeetingContent)
+
+    async def test_slow_round_stops_at_the_deadline_less_reserve(self, gateway):
+        """Test that a stalled batch round is cut off before the deadline, leaving the reserve to the caller."""
+        async def abatch(prompts, config, return_exceptions):
+            await asyncio.sleep(10)
+
+        gateway.chat_model.abatch = abatch
+
+        start = asyncio.get_event_loop().time()
+        with deadline_scope(0.5):
+            results = await gateway.get_string_responses(["one", "two"], reserve=0.3)
+
+        assert results == [None, None]
+        assert asyncio.get_event_loop().time() - start < 0.4
@@ -0,0 +1,120 @@
+"""
+Tests for the queue-based log pipeline.
+"""
+import logging
+import queue
+from unittest.mock import patch
+
+import pytest
+
+from app.core import logging_config
+from app.core.config import settings
+from app.core.logging_config import LOG_RECORDS_DROPPED, BoundedQueueHandler, log_queue_stats, setup_logging
+
+
+def make_record(message: str) -> logging.LogRecord:
+    """Build a log record with the given message."""
+    return logging.LogRecord("app.test", logging.INFO, __file__, 1, message, None, None)
+
+
+class CollectingHandler(logging.Handler):
+    """Remembers the messages of the records it handles."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def restore_logging():
+    """Reconfigure logging from settings after the test."""
+    yield
+    setup_logging(force=True)
+
+
+class TestBoundedQueueHandler:
+    """Test cases for BoundedQueueHandler."""
+
+    def test_drop_new_keeps_queued_records(self):
+        """Test that a full queue drops and counts the new record."""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), drop_policy="drop_new")
+        for message in ("one", "two", "three"):
+            handler.emit(make_record(message))
+
+        assert [handler.queue.get_nowait().msg for _ in range(2)] == ["one", "two"]
+        assert handler.dropped == 1
+        assert LOG_RECORDS_DROPPED.value() == 1
+
+    def test_drop_oldest_keeps_newest_records(self):
+        """Test that a full queue drops the oldest record to make room."""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), drop_policy="drop_oldest")
+        for message in ("one", "two", "three"):
+            handler.emit(make_record(message))
+
+        assert [handler.queue.get_nowait().msg for _ in range(2)] == ["two", "three"]
+        assert handler.dropped == 1
+
+    def test_records_are_enqueued_unformatted(self):
+        """Test that structlog event dicts are left for the listener to render."""
+        handler = BoundedQueueHandler(queue.Queue())
+        record = make_record("ignored")
+        record.msg = {"event": "Fetched data", "url": "https://api.example.com"}
+        handler.emit(record)
+
+        assert handler.queue.get_nowait().msg == {"event": "Fetched data", "url": "https://api.example.com"}
+
+    def test_unknown_drop_policy_is_rejected(self):
+        """Test that a misconfigured drop policy fails loudly."""
+        with pytest.raises(ValueError):
+            BoundedQueueHandler(queue.Queue(), drop_policy="block")
+
+
+class TestQueueLogging:
+    """Test cases for setup_logging in queue mode."""
+
+    def test_root_logger_only_enqueues(self, restore_logging):
+        """Test that records reach the real handlers through the listener thread."""
+        with patch.object(settings, 'LOG_QUEUE_ENABLED', True):
+            setup_logging(force=True)
+
+        root = logging.getLogger()
+        assert [type(handler) for handler in root.handlers] == [BoundedQueueHandler]
+        collector = CollectingHandler()
+        logging_config._queue_listener.handlers += (collector,)
+
+        logging.getLogger("app.queue_test").info("queued message")
+        logging_config._stop_queue_listener()
+
+        assert collector.messages == ["queued message"]
+
+    def test_stats_report_queue_state(self, restore_logging):
+        """Test that queue stats reflect the configured queue."""
+        with patch.object(settings, 'LOG_QUEUE_ENABLED', True), \
+             patch.object(settings, 'LOG_QUEUE_MAX_SIZE', 50):
+            setup_logging(force=True)
+
+        stats = log_queue_stats()
+        assert stats["enabled"] is True
+        assert stats["max_size"] == 50
+        assert stats["drop_policy"] == settings.LOG_QUEUE_DROP_POLICY
+
+    def test_setup_is_idempotent(self, restore_logging):
+        """Test that repeated setup calls keep the running configuration."""
+        handlers = list(logging.getLogger().handlers)
+        listener = logging_config._queue_listener
+
+        setup_logging()
+
+        assert logging.getLogger().handlers == handlers
+        assert logging_config._queue_listener is listener
+
+    def test_queue_can_be_disabled(self, restore_logging):
+        """Test that handlers are attached directly when the queue is disabled."""
+        with patch.object(settings, 'LOG_QUEUE_ENABLED', False):
+            setup_logging(force=True)
+
+        assert not any(isinstance(handler, BoundedQueueHandler) for handler in logging.getLogger().handlers)
+        assert log_queue_stats() == {"enabled": False}
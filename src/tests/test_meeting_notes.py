@@ -116,6 +116,20 @@ class TestMeetingNotesFormatter(unittest.TestCase):
         self.assertNotIn("repo3", result)
         self.assertNotIn("repo4", result)
 
+    def test_format_meeting_sections(self):
+        """Test formatting meeting notes from pre-rendered section texts."""
+        result = MeetingNotesFormatter.format_meeting_sections(
+            "Question: What is Python?\nAnswer: Programming language",
+            "Python was named after Monty Python",
+            "• test/repo - A test repository"
+        )
+        
+        self.assertIn("Meeting Notes for Host", result)
+        self.assertIn("Ice Breaker - Tech Trivia:\nQuestion: What is Python?", result)
+        self.assertIn("Fun Fact to Share:\nPython was named after Monty Python", result)
+        self.assertIn("Trending Tech Topics:\n• test/repo - A test repository", result)
+        self.assertIn("Use these notes to:", result)
+
 
 if __name__ == '__main__':
     unittest.main()
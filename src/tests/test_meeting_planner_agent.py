@@ -1,9 +1,17 @@
 """
 Tests for the LangChain-based MeetingPlannerAgent.
 """
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
+from langchain_core.messages import AIMessageChunk
 from app.agents.meeting_planner_agent import MeetingPlannerAgent
+from app.core.config import settings
+from app.core.deadline import deadline_scope
+from app.core.llm_gateway import LLMGateway
+from app.core.progress import PlanningListener
+from app.schemas.meeting_content import MeetingContent
 from app.schemas.tech_trivia import TechTriviaQuestion
 from app.schemas.fun_facts import FunFact
 
@@ -14,10 +22,10 @@ class TestMeetingPlannerAgent:
     @pytest.fixture
     def agent(self):
         """Create a MeetingPlannerAgent instance for testing."""
-        with patch('app.agents.meeting_planner_agent.LLMGateway') as mock_llm_gateway:
-            # Mock the LLMGateway to avoid API key requirements
+        with patch('app.agents.meeting_planner_agent.get_llm_gateway') as mock_get_llm_gateway:
+            # Mock the shared LLMGateway to avoid API key requirements
             mock_gateway_instance = MagicMock()
-            mock_llm_gateway.return_value = mock_gateway_instance
+            mock_get_llm_gateway.return_value = mock_gateway_instance
             return MeetingPlannerAgent()
 
     @pytest.mark.asyncio
@@ -109,6 +117,23 @@ class TestMeetingPlannerAgent:
                 
                 assert "Unable to prepare meeting information" in result
 
+    @pytest.mark.asyncio
+    async def test_planning_leaves_fallback_reserve_before_deadline(self, agent):
+        """Test that slow planning is cut short so the fallback finishes within the request deadline."""
+        async def slow_plan(agent_input, config=None):
+            await asyncio.sleep(5)
+        
+        with patch.object(agent, 'agent_executor', MagicMock(ainvoke=slow_plan)), \
+             patch.object(settings, 'PLANNER_FALLBACK_RESERVE', 0.2), \
+             patch.object(MeetingPlannerAgent, '_fallback_plan_meeting', AsyncMock(return_value="Fallback notes")):
+            start = asyncio.get_event_loop().time()
+            with deadline_scope(0.4):
+                result = await agent.plan_meeting("team standup")
+            elapsed = asyncio.get_event_loop().time() - start
+        
+        assert result == "Fallback notes"
+        assert elapsed < 0.4
+
     @pytest.mark.asyncio
     async def test_agent_initialization(self, agent):
         """Test that the agent is properly initialized with tools and LLM."""
@@ -146,3 +171,454 @@ class TestMeetingPlannerAgent:
             # Verify the input includes the specific context
             call_args = mock_ainvoke.call_args[0][0]
             assert "sprint planning" in call_args["input"]
+
+
+class RecordingListener(PlanningListener):
+    """Planning listener that records every event."""
+
+    def __init__(self):
+        self.sections = []
+        self.tokens = []
+        self.completed = None
+
+    async def on_section(self, section, content):
+        self.sections.append((section, content))
+
+    async def on_token(self, text):
+        self.tokens.append(text)
+
+    async def on_complete(self, notes):
+        self.completed = notes
+
+
+class TestMeetingPlannerPipelineMode:
+    """Test cases for the deterministic pipeline execution mode."""
+
+    @pytest.fixture
+    def agent(self):
+        """Create a MeetingPlannerAgent whose tools return fixed section texts."""
+        with patch('app.agents.meeting_planner_agent.get_llm_gateway') as mock_get_llm_gateway:
+            mock_get_llm_gateway.return_value = MagicMock()
+            agent = MeetingPlannerAgent()
+        agent.tools = [
+            MagicMock(ainvoke=AsyncMock(return_value="Question: What is Python?\nAnswer: A programming language")),
+            MagicMock(ainvoke=AsyncMock(return_value="Honey never spoils.")),
+            MagicMock(ainvoke=AsyncMock(return_value="• test/repo - A test repository"))
+        ]
+        agent.llm_gateway.get_string_response = AsyncMock(return_value="Meeting Notes for Host\n\nFormatted by LLM")
+        return agent
+
+    async def test_pipeline_uses_single_formatting_call(self, agent):
+        """Test that pipeline mode skips the agent loop and formats with one LLM call."""
+        with patch('app.agents.meeting_planner_agent.AgentExecutor.ainvoke', new_callable=AsyncMock) as mock_ainvoke:
+            result = await agent.plan_meeting("sprint planning", mode="pipeline")
+
+        assert result == "Meeting Notes for Host\n\nFormatted by LLM"
+        mock_ainvoke.assert_not_called()
+        for tool in agent.tools:
+            tool.ainvoke.assert_called_once_with({"meeting_context": "sprint planning"})
+        agent.llm_gateway.get_string_response.assert_called_once()
+        prompt = agent.llm_gateway.get_string_response.call_args[0][0]
+        assert "sprint planning" in prompt
+        assert "Honey never spoils." in prompt
+
+    async def test_pipeline_runs_tools_concurrently(self, agent):
+        """Test that pipeline mode fans out the tools instead of running them in sequence."""
+        async def slow_tool(_):
+            await asyncio.sleep(0.1)
+            return "content"
+
+        for tool in agent.tools:
+            tool.ainvoke = AsyncMock(side_effect=slow_tool)
+
+        start = asyncio.get_running_loop().time()
+        await agent.plan_meeting("standup", mode="pipeline")
+
+        assert asyncio.get_running_loop().time() - start < 0.25
+
+    async def test_pipeline_without_llm_formatting(self, agent):
+        """Test that pipeline mode can format notes with the template formatter alone."""
+        with patch.object(settings, 'PIPELINE_LLM_FORMATTING', False):
+            result = await agent.plan_meeting("standup", mode="pipeline")
+
+        agent.llm_gateway.get_string_response.assert_not_called()
+        assert "Meeting Notes for Host" in result
+        assert "Question: What is Python?" in result
+        assert "Honey never spoils." in result
+        assert "• test/repo - A test repository" in result
+
+    async def test_pipeline_formatting_failure_uses_template(self, agent):
+        """Test that a failed formatting call falls back to the template formatter."""
+        agent.llm_gateway.get_string_response.side_effect = ValueError("LLM error")
+
+        result = await agent.plan_meeting("standup", mode="pipeline")
+
+        assert "Ice Breaker - Tech Trivia:" in result
+        assert "Honey never spoils." in result
+
+    async def test_pipeline_combined_enhancement(self, agent):
+        """Test that combined enhancement makes one LLM request for all sections."""
+        enhanced = MeetingContent(trivia="Enhanced trivia", fun_fact="Enhanced fact", trending_repos="Enhanced repos")
+        agent.llm_gateway.get_structured_response = AsyncMock(return_value=enhanced)
+
+        with patch.object(settings, 'PIPELINE_COMBINED_ENHANCEMENT', True), \
+             patch.object(settings, 'PIPELINE_LLM_FORMATTING', False):
+            result = await agent.plan_meeting("sprint planning", mode="pipeline")
+
+        agent.llm_gateway.get_structured_response.assert_called_once()
+        agent.llm_gateway.get_string_response.assert_not_called()
+        assert "Ice Breaker - Tech Trivia:\nEnhanced trivia" in result
+        assert "Fun Fact to Share:\nEnhanced fact" in result
+        assert "Trending Tech Topics:\nEnhanced repos" in result
+
+    async def test_pipeline_combined_enhancement_skipped_without_context(self, agent):
+        """Test that combined enhancement only runs when there is a meeting context."""
+        agent.llm_gateway.get_structured_response = AsyncMock()
+
+        with patch.object(settings, 'PIPELINE_COMBINED_ENHANCEMENT', True):
+            await agent.plan_meeting("", mode="pipeline")
+
+        agent.llm_gateway.get_structured_response.assert_not_called()
+
+    async def test_pipeline_keeps_original_meeting_context(self, agent):
+        """Test that tools and prompts get the context as written, and only the cache key is canonical."""
+        await agent.plan_meeting("Kubernetes migration kickoff for a team of 100", mode="pipeline")
+
+        for tool in agent.tools:
+            tool.ainvoke.assert_called_once_with({"meeting_context": "Kubernetes migration kickoff for a team of 100"})
+        prompt = agent.llm_gateway.get_string_response.call_args[0][0]
+        cache_prompt = agent.llm_gateway.get_string_response.call_args[1]["cache_prompt"]
+        assert "Kubernetes migration kickoff for a team of 100" in prompt
+        assert "kubernetes migration kickoff team 100" in cache_prompt
+
+    async def test_near_duplicate_phrasing_keeps_its_own_text(self, agent):
+        """Test that a context matched to another user's phrasing is still planned with its own text."""
+        await agent.plan_meeting("sprint planning", mode="pipeline")
+        await agent.plan_meeting("Sprint planing!", mode="pipeline")
+
+        prompt = agent.llm_gateway.get_string_response.call_args[0][0]
+        cache_prompt = agent.llm_gateway.get_string_response.call_args[1]["cache_prompt"]
+        assert "Sprint planing!" in prompt
+        assert "sprint planning" in cache_prompt
+
+    async def test_mode_defaults_to_settings(self, agent):
+        """Test that the execution mode is taken from settings when not given."""
+        with patch.object(settings, 'PLANNER_MODE', 'pipeline'), \
+             patch('app.agents.meeting_planner_agent.AgentExecutor.ainvoke', new_callable=AsyncMock) as mock_ainvoke:
+            await agent.plan_meeting("standup")
+
+        mock_ainvoke.assert_not_called()
+        agent.llm_gateway.get_string_response.assert_called_once()
+
+    async def test_invalid_mode_raises(self, agent):
+        """Test that an unknown execution mode is rejected."""
+        with pytest.raises(ValueError, match="Unsupported planner mode"):
+            await agent.plan_meeting("standup", mode="unknown")
+
+
+class TestMeetingPlannerStreaming:
+    """Test cases for streaming planning progress to a listener."""
+
+    @pytest.fixture
+    def agent(self):
+        """Create a MeetingPlannerAgent whose tools return fixed section texts."""
+        with patch('app.agents.meeting_planner_agent.get_llm_gateway') as mock_get_llm_gateway:
+            mock_get_llm_gateway.return_value = MagicMock()
+            return MeetingPlannerAgent()
+
+    async def test_pipeline_streams_sections_and_tokens(self, agent):
+        """Test that sections are reported as they finish and the notes stream token by token."""
+        async def fast(_):
+            return "Honey never spoils."
+
+        async def slow(_):
+            await asyncio.sleep(0.05)
+            return "slow content"
+
+        async def stream(prompt, cache_prompt=None):
+            for text in ["Meeting Notes", " for Host"]:
+                yield text
+
+        agent.tools = [
+            MagicMock(ainvoke=AsyncMock(side_effect=slow)),
+            MagicMock(ainvoke=AsyncMock(side_effect=fast)),
+            MagicMock(ainvoke=AsyncMock(side_effect=slow))
+        ]
+        agent.llm_gateway.stream_string_response = stream
+        listener = RecordingListener()
+
+        result = await agent.plan_meeting("standup", mode="pipeline", listener=listener)
+
+        assert result == "Meeting Notes for Host"
+        assert listener.sections[0] == ("fun_fact", "Honey never spoils.")
+        assert {section for section, _ in listener.sections} == {"trivia", "fun_fact", "trending_repos"}
+        assert listener.tokens == ["Meeting Notes", " for Host"]
+        assert listener.completed == result
+
+    async def test_agent_mode_reports_tool_results_and_streams_notes(self, agent):
+        """Test that agent mode reports each tool observation as a section and streams the agent's answer."""
+        async def astream_events(self, agent_input, config=None, version=None):
+            yield {"event": "on_tool_start", "name": "fun_facts_agent", "run_id": "tool-1", "parent_ids": ["root"], "data": {}}
+            # Tokens of an LLM call made inside a tool are not part of the notes
+            yield {"event": "on_chat_model_stream", "run_id": "llm-1", "parent_ids": ["root", "tool-1"], "data": {"chunk": AIMessageChunk(content="Tool text")}}
+            yield {"event": "on_tool_end", "name": "fun_facts_agent", "run_id": "tool-1", "parent_ids": ["root"], "data": {"output": "Honey never spoils."}}
+            for text in ["Meeting Notes", " for Host"]:
+                yield {"event": "on_chat_model_stream", "run_id": "llm-2", "parent_ids": ["root"], "data": {"chunk": AIMessageChunk(content=text)}}
+            yield {"event": "on_chain_end", "name": "AgentExecutor", "run_id": "root", "parent_ids": [], "data": {"output": {"output": "Meeting Notes for Host"}}}
+
+        listener = RecordingListener()
+        with patch('app.agents.meeting_planner_agent.AgentExecutor.astream_events', astream_events):
+            result = await agent.plan_meeting("standup", mode="agent", listener=listener)
+
+        assert result == "Meeting Notes for Host"
+        assert listener.sections == [("fun_fact", "Honey never spoils.")]
+        assert listener.tokens == ["Meeting Notes", " for Host"]
+        assert listener.completed == result
+
+    async def test_fallback_result_is_reported_complete(self, agent):
+        """Test that the listener receives the final notes even when planning falls back."""
+        listener = RecordingListener()
+        with patch('app.agents.meeting_planner_agent.AgentExecutor.astream_events', side_effect=Exception("agent error")), \
+             patch.object(MeetingPlannerAgent, '_fallback_plan_meeting', AsyncMock(return_value="Fallback notes")):
+            result = await agent.plan_meeting("standup", mode="agent", listener=listener)
+
+        assert result == "Fallback notes"
+        assert listener.completed == "Fallback notes"
+
+
+class TestMeetingPlannerSingleFlight:
+    """Test cases for coalescing concurrent identical planning requests."""
+
+    @pytest.fixture
+    def agent(self):
+        """Create a MeetingPlannerAgent whose pipeline tools are slow enough to overlap."""
+        with patch('app.agents.meeting_planner_agent.get_llm_gateway') as mock_get_llm_gateway:
+            mock_get_llm_gateway.return_value = MagicMock()
+            agent = MeetingPlannerAgent()
+
+        async def slow(_):
+            await asyncio.sleep(0.05)
+            return "content"
+
+        agent.tools = [MagicMock(ainvoke=AsyncMock(side_effect=slow)) for _ in range(3)]
+        agent.llm_gateway.get_string_response = AsyncMock(return_value="Meeting Notes for Host")
+        return agent
+
+    async def test_concurrent_identical_requests_share_one_run(self, agent):
+        """Test that a burst of identical requests runs the planning once."""
+        results = await asyncio.gather(*(
+            agent.plan_meeting(context, mode="pipeline")
+            for context in ["Sprint Planning!!", "sprint planning", "our sprint planning meeting"] * 4
+        ))
+
+        assert results == ["Meeting Notes for Host"] * 12
+        for tool in agent.tools:
+            tool.ainvoke.assert_called_once()
+        agent.llm_gateway.get_string_response.assert_called_once()
+
+    async def test_different_contexts_run_separately(self, agent):
+        """Test that different meetings are not coalesced."""
+        await asyncio.gather(
+            agent.plan_meeting("sprint planning", mode="pipeline"),
+            agent.plan_meeting("design review", mode="pipeline")
+        )
+
+        for tool in agent.tools:
+            assert tool.ainvoke.call_count == 2
+
+    async def test_sequential_requests_are_not_coalesced(self, agent):
+        """Test that only in-flight runs are shared."""
+        await agent.plan_meeting("standup", mode="pipeline")
+        await agent.plan_meeting("standup", mode="pipeline")
+
+        assert agent.llm_gateway.get_string_response.call_count == 2
+
+    async def test_waiter_timeout_does_not_cancel_shared_run(self, agent):
+        """Test that one caller timing out leaves the shared run for the others."""
+        patient = asyncio.create_task(agent.plan_meeting("standup", mode="pipeline"))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(agent.plan_meeting("standup", mode="pipeline"), timeout=0.01)
+
+        assert await patient == "Meeting Notes for Host"
+        agent.llm_gateway.get_string_response.assert_called_once()
+
+    async def test_late_streaming_caller_receives_earlier_sections(self, agent):
+        """Test that a streaming caller joining a shared run gets the sections it missed."""
+        async def stream(prompt, cache_prompt=None):
+            yield "Meeting Notes for Host"
+
+        agent.llm_gateway.stream_string_response = stream
+        agent.tools[0].ainvoke = AsyncMock(return_value="fast content")
+        first, late = RecordingListener(), RecordingListener()
+
+        leader = asyncio.create_task(agent.plan_meeting("standup", mode="pipeline", listener=first))
+        await asyncio.sleep(0.02)
+        assert first.sections == [("trivia", "fast content")]
+        result = await agent.plan_meeting("standup", mode="pipeline", listener=late)
+
+        assert await leader == result == "Meeting Notes for Host"
+        assert len(late.sections) == 3
+        assert late.sections == first.sections
+        assert late.completed == result
+        for tool in agent.tools:
+            tool.ainvoke.assert_called_once()
+
+    async def test_single_flight_can_be_disabled(self, agent):
+        """Test that coalescing can be turned off in settings."""
+        with patch.object(settings, 'PLANNER_SINGLE_FLIGHT_ENABLED', False):
+            await asyncio.gather(*(agent.plan_meeting("standup", mode="pipeline") for _ in range(3)))
+
+        assert agent.llm_gateway.get_string_response.call_count == 3
+
+
+class TestMeetingPlannerBatch:
+    """Test cases for planning many meetings in one batch."""
+
+    @pytest.fixture
+    def agent(self):
+        """Create a MeetingPlannerAgent with a fake gateway."""
+        with patch('app.agents.meeting_planner_agent.get_llm_gateway') as mock_get_llm_gateway:
+            mock_get_llm_gateway.return_value = MagicMock()
+            agent = MeetingPlannerAgent()
+
+        async def format_notes(prompts, max_concurrency=None, cache_prompts=None, reserve=0.0):
+            return [f"Notes for: {prompt}" for prompt in prompts]
+
+        async def enhance(prompts, response_model, max_concurrency=None, cache_prompts=None, reserve=0.0):
+            return [
+                MeetingContent(trivia="Enhanced trivia", fun_fact="Enhanced fact", trending_repos="Enhanced repos")
+                for _ in prompts
+            ]
+
+        agent.llm_gateway.get_string_responses = AsyncMock(side_effect=format_notes)
+        agent.llm_gateway.get_structured_responses = AsyncMock(side_effect=enhance)
+        return agent
+
+    @pytest.fixture
+    def services(self):
+        """Patch the upstream services with fixed content."""
+        questions = [
+            TechTriviaQuestion(
+                category="Science: Computers", type="multiple", difficulty="easy",
+                question=f"Question {i}?", correct_answer=f"Answer {i}", incorrect_answers=["a", "b", "c"]
+            )
+            for i in range(5)
+        ]
+        fact = FunFact(id="1", text="Honey never spoils.", source="test", source_url="", language="en", permalink="")
+        with patch('app.services.tech_trivia_service.TechTriviaService.get_tech_trivia_batch', new_callable=AsyncMock) as trivia, \
+             patch('app.services.fun_facts_service.FunFactsService.get_fun_facts', new_callable=AsyncMock) as fun_facts, \
+             patch('app.services.github_trending_service.GitHubTrendingService.get_trending_repos', new_callable=AsyncMock) as repos:
+            trivia.side_effect = lambda count: questions[:count]
+            fun_facts.side_effect = lambda count, concurrency: [fact] * count
+            repos.return_value = [{"name": "test/repo", "description": "A test repository", "language": "Python", "stars": 10}]
+            yield trivia, fun_facts, repos
+
+    async def test_results_follow_input_order_and_share_duplicates(self, agent, services):
+        """Test that each context gets notes in order and duplicates are planned once."""
+        trivia, fun_facts, repos = services
+        with patch.object(settings, 'MEETING_BATCH_ENHANCEMENT', False):
+            results = await agent.plan_meetings(["standup", "Sprint Planning!!", "standup", "retro"])
+
+        assert len(results) == 4
+        assert results[0] == results[2]
+        assert "standup" in results[0] and "Sprint Planning!!" in results[1] and "retro" in results[3]
+        assert len(set(results)) == 3
+        trivia.assert_awaited_once_with(3)
+        fun_facts.assert_awaited_once()
+        repos.assert_awaited_once()
+        agent.llm_gateway.get_string_responses.assert_awaited_once()
+        assert len(agent.llm_gateway.get_string_responses.call_args[0][0]) == 3
+
+    async def test_meetings_get_distinct_trivia(self, agent, services):
+        """Test that every planned meeting receives its own trivia question."""
+        with patch.object(settings, 'MEETING_BATCH_ENHANCEMENT', False), \
+             patch.object(settings, 'PIPELINE_LLM_FORMATTING', False):
+            results = await agent.plan_meetings(["standup", "retro", "planning"])
+
+        for i, notes in enumerate(results):
+            assert f"Question {i}?" in notes
+
+    async def test_meetings_get_distinct_fun_facts(self, agent):
+        """Test that every planned meeting receives its own fun fact, even when the API repeats one."""
+        question = TechTriviaQuestion(
+            category="Science: Computers", type="multiple", difficulty="easy",
+            question="Question?", correct_answer="Answer", incorrect_answers=["a", "b", "c"]
+        )
+        facts = [
+            FunFact(id=str(i), text=f"Fact {i}.", source="test", source_url="", language="en", permalink="")
+            for i in range(3)
+        ]
+        with patch.object(settings, 'MEETING_BATCH_ENHANCEMENT', False), \
+             patch.object(settings, 'PIPELINE_LLM_FORMATTING', False), \
+             patch('app.services.tech_trivia_service.TechTriviaService.get_tech_trivia_batch', new_callable=AsyncMock) as trivia, \
+             patch('app.services.github_trending_service.GitHubTrendingService.get_trending_repos', new_callable=AsyncMock) as repos, \
+             patch('app.services.fun_facts_service.FunFactsService.get_fun_fact', new_callable=AsyncMock) as get_fun_fact:
+            trivia.side_effect = lambda count: [question] * count
+            repos.return_value = []
+            get_fun_fact.side_effect = [facts[0], facts[0], facts[1], facts[2]]
+            results = await agent.plan_meetings(["standup", "retro", "planning"])
+
+        for i, notes in enumerate(results):
+            assert f"Fact {i}." in notes
+
+    async def test_enhancement_is_one_batch_for_meetings_with_context(self, agent, services):
+        """Test that meetings with a context are enhanced in one batch call, and ones without are not."""
+        with patch.object(settings, 'PIPELINE_LLM_FORMATTING', False):
+            results = await agent.plan_meetings(["standup", "", "retro"])
+
+        agent.llm_gateway.get_structured_responses.assert_awaited_once()
+        prompts, response_model = agent.llm_gateway.get_structured_responses.call_args[0]
+        assert len(prompts) == 2 and response_model is MeetingContent
+        assert "Enhanced trivia" in results[0]
+        assert "Enhanced trivia" not in results[1]
+
+    async def test_slow_llm_batches_fall_back_before_the_deadline(self, agent, services):
+        """Test that stalled enhancement and formatting batches leave time for basic content and template notes."""
+        async def stalled(prompts, *args, **kwargs):
+            await asyncio.sleep(10)
+
+        agent.llm_gateway = LLMGateway(cache=None)
+        agent.llm_gateway.chat_model = MagicMock(model_name="gpt-4o-mini")
+        agent.llm_gateway.chat_model.abatch = stalled
+        agent.llm_gateway.chat_model.with_structured_output.return_value.abatch = stalled
+        agent.content_enhancer.llm_gateway = agent.llm_gateway
+
+        with patch.object(settings, 'MEETING_BATCH_FALLBACK_RESERVE', 0.3):
+            with deadline_scope(1):
+                results = await asyncio.wait_for(agent.plan_meetings(["standup", "retro"]), timeout=1)
+
+        assert all("Ice Breaker - Tech Trivia:" in notes for notes in results)
+
+    async def test_failed_items_keep_basic_content_and_template(self, agent, services):
+        """Test that items the batch API could not answer fall back individually."""
+        agent.llm_gateway.get_structured_responses = AsyncMock(return_value=[
+            MeetingContent(trivia="Enhanced trivia", fun_fact="Enhanced fact", trending_repos="Enhanced repos"), None
+        ])
+        agent.llm_gateway.get_string_responses = AsyncMock(return_value=["LLM notes", None])
+
+        results = await agent.plan_meetings(["standup", "retro"])
+
+        assert results[0] == "LLM notes"
+        assert "Ice Breaker - Tech Trivia:" in results[1]
+        assert "Question 1?" in results[1]
+
+    async def test_llm_concurrency_is_capped(self, agent, services):
+        """Test that the batch LLM calls are capped at MEETING_BATCH_CONCURRENCY."""
+        with patch.object(settings, 'MEETING_BATCH_CONCURRENCY', 2):
+            await agent.plan_meetings([f"meeting {i}" for i in range(5)])
+
+        assert agent.llm_gateway.get_structured_responses.call_args.kwargs["max_concurrency"] == 2
+        assert agent.llm_gateway.get_string_responses.call_args.kwargs["max_concurrency"] == 2
+
+    async def test_precomputed_notes_are_served_from_cache(self, agent, services):
+        """Test that tracked contexts with cached notes are not planned again."""
+        trivia, _, _ = services
+        agent.notes_cache.track("pipeline", "standup")
+        agent.notes_cache.store("pipeline", "standup", "Precomputed notes")
+
+        with patch.object(settings, 'MEETING_BATCH_ENHANCEMENT', False):
+            results = await agent.plan_meetings(["standup", "retro"])
+
+        assert results[0] == "Precomputed notes"
+        trivia.assert_awaited_once_with(1)
@@ -0,0 +1,176 @@
+"""
+Tests for per-stage metrics and the metrics route.
+"""
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import httpx
+import pytest
+from pydantic import SecretStr
+
+from app.core.config import settings
+from app.core.llm_cache import InMemoryLLMCache
+from app.core.llm_gateway import LLMGateway
+from app.core.metrics import (
+    CACHE_LOOKUPS, LLM_DURATION, SERVICE_FALLBACKS, UPSTREAM_DURATION,
+    MetricsRegistry, _Metric, current_llm_prompt, llm_prompt
+)
+from app.services.tech_trivia_service import TechTriviaService
+
+# Add the project root to the path so we can import server.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+URL = "https://api.example.com/items?amount=1"
+
+
+class TestMetricsRegistry:
+    """Test cases for counters, histograms and the text format."""
+
+    def test_counter_renders_labelled_samples(self):
+        """Test that counters render one sample per label set."""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests.", ("outcome",))
+        counter.inc(outcome="success")
+        counter.inc(2, outcome="error")
+
+        output = registry.render()
+        assert "# TYPE requests_total counter" in output
+        assert 'requests_total{outcome="success"} 1' in output
+        assert 'requests_total{outcome="error"} 2' in output
+
+    def test_metric_kinds_must_render_and_reset(self):
+        """Test that a metric kind missing its samples or reset cannot be created."""
+        class Incomplete(_Metric):
+            kind = "untyped"
+
+            def _samples(self):
+                return []
+
+        with pytest.raises(TypeError):
+            Incomplete("incomplete", "Incomplete.")
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets count every observation at or below their bound."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        output = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in output
+        assert 'latency_seconds_bucket{le="1"} 2' in output
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in output
+        assert "latency_seconds_count 3" in output
+        assert histogram.sum() == pytest.approx(5.55)
+
+    def test_labels_must_match(self):
+        """Test that observations with the wrong label names are rejected."""
+        histogram = MetricsRegistry().histogram("latency_seconds", "Latency.", ("service",))
+        with pytest.raises(ValueError):
+            histogram.observe(1.0, endpoint="api")
+
+    def test_registering_twice_returns_same_metric(self):
+        """Test that a metric is shared by name, and conflicting definitions are refused."""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests.")
+        assert registry.counter("requests_total", "Requests.") is counter
+        with pytest.raises(ValueError):
+            registry.histogram("requests_total", "Requests.")
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes in label values do not break the text format."""
+        registry = MetricsRegistry()
+        registry.counter("lookups_total", "Lookups.", ("cache",)).inc(cache='say "hi"')
+        assert 'lookups_total{cache="say \\"hi\\""} 1' in registry.render()
+
+    def test_collectors_run_before_render(self):
+        """Test that gauges set by collectors reflect live state at scrape time."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("queue_depth", "Queue depth.")
+        depth = [3]
+        registry.on_collect(lambda: gauge.set(depth[0]))
+
+        assert "queue_depth 3" in registry.render()
+        depth[0] = 5
+        assert "queue_depth 5" in registry.render()
+
+    def test_disabled_metrics_record_nothing(self):
+        """Test that nothing is recorded when metrics are disabled."""
+        histogram = MetricsRegistry().histogram("latency_seconds", "Latency.")
+        with patch.object(settings, 'METRICS_ENABLED', False):
+            histogram.observe(1.0)
+        assert histogram.count() == 0
+
+    def test_llm_prompt_scope(self):
+        """Test that the prompt label is restored after the block."""
+        with llm_prompt("tech_trivia"):
+            assert current_llm_prompt() == "tech_trivia"
+        assert current_llm_prompt() == "other"
+
+
+class TestStageMetrics:
+    """Test cases for the metrics recorded by each stage."""
+
+    async def test_upstream_success_and_fallback_are_recorded(self):
+        """Test that upstream requests are timed per service, and fallbacks counted by reason."""
+        service = TechTriviaService()
+        with patch.object(service, '_fetch', AsyncMock(return_value={"ok": True})):
+            await service._make_request(url=URL)
+        with patch.object(service, '_fetch', AsyncMock(side_effect=aiohttp.ClientError("down"))):
+            await service._make_request(url=URL)
+
+        assert UPSTREAM_DURATION.count(service="TechTriviaService", outcome="success") == 1
+        assert UPSTREAM_DURATION.count(service="TechTriviaService", outcome="fallback") == 1
+        assert SERVICE_FALLBACKS.value(service="TechTriviaService", reason="invalid_response") == 1
+
+    async def test_llm_calls_are_timed_per_prompt_and_cache_hits_counted(self):
+        """Test that LLM calls are labelled with their prompt type and cached answers are not timed."""
+        with patch.object(settings, 'LLM_API_KEY', SecretStr('test-key')), \
+             patch.object(settings, 'LLM_MODEL', 'gpt-4o-mini'):
+            gateway = LLMGateway(cache=InMemoryLLMCache(max_entries=10, ttl=60))
+        gateway.chat_model = MagicMock(model_name="gpt-4o-mini")
+        gateway.chat_model.ainvoke = AsyncMock(return_value=MagicMock(content="Enhanced"))
+
+        with llm_prompt("tech_trivia"):
+            await gateway.get_string_response("Enhance this trivia")
+            await gateway.get_string_response("Enhance this trivia")
+
+        assert LLM_DURATION.count(prompt="tech_trivia", outcome="success") == 1
+        assert CACHE_LOOKUPS.value(cache="llm", result="miss") == 1
+        assert CACHE_LOOKUPS.value(cache="llm", result="hit") == 1
+
+    async def test_failed_llm_call_is_recorded_as_error(self):
+        """Test that failing LLM calls are timed with the error outcome."""
+        with patch.object(settings, 'LLM_API_KEY', SecretStr('test-key')), \
+             patch.object(settings, 'LLM_MODEL', 'gpt-4o-mini'):
+            gateway = LLMGateway()
+        gateway.chat_model = MagicMock(model_name="gpt-4o-mini")
+        gateway.chat_model.ainvoke = AsyncMock(side_effect=Exception("LLM error"))
+
+        with pytest.raises(ValueError):
+            await gateway.get_string_response("Format the notes")
+
+        assert LLM_DURATION.count(prompt="other", outcome="error") == 1
+
+
+class TestMetricsRoute:
+    """Test cases for the server's metrics route."""
+
+    async def test_metrics_route_serves_text_format(self):
+        """Test that the metrics route serves recorded metrics and live server gauges."""
+        import server
+        from src.app.core.metrics import REQUEST_DURATION, metrics
+
+        # server.py records into its own import of the metrics module
+        metrics.reset()
+        REQUEST_DURATION.observe(0.2, mode="pipeline", outcome="success")
+        transport = httpx.ASGITransport(app=server.mcp.http_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(settings.METRICS_PATH)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'meeting_agent_request_duration_seconds_count{mode="pipeline",outcome="success"} 1' in response.text
+        assert "meeting_agent_admission_active 0" in response.text
@@ -0,0 +1,135 @@
+"""
+Tests for precomputed meeting notes and background warming.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents.meeting_planner_agent import MeetingPlannerAgent
+from app.core.config import settings
+from app.core.notes_cache import WARMING_LEASE, MeetingNotesCache, MeetingNotesWarmer
+from app.core.shared_store import SharedContentStore
+
+
+class TestMeetingNotesCache:
+    """Test cases for MeetingNotesCache."""
+
+    def test_only_tracked_contexts_are_stored(self):
+        """Test that notes for ad-hoc contexts are never cached."""
+        cache = MeetingNotesCache(ttl=60)
+        cache.track("pipeline", "sprint planning")
+
+        cache.store("pipeline", "sprint planning", "Sprint notes")
+        cache.store("pipeline", "retro", "Retro notes")
+
+        assert cache.get("pipeline", "sprint planning") == "Sprint notes"
+        assert cache.get("pipeline", "retro") is None
+        assert cache.get("agent", "sprint planning") is None
+
+    def test_entries_expire(self):
+        """Test that notes are not served after the TTL."""
+        cache = MeetingNotesCache(ttl=60)
+        cache.track("agent", "")
+        with patch('app.core.notes_cache.time.monotonic', side_effect=[100.0, 159.0, 161.0]):
+            cache.store("agent", "", "General notes")
+            assert cache.get("agent", "") == "General notes"
+            assert cache.get("agent", "") is None
+
+
+class TestMeetingNotesWarmer:
+    """Test cases for MeetingNotesWarmer."""
+
+    @pytest.fixture
+    def planner(self):
+        """A planner double with a real notes cache."""
+        planner = MagicMock(notes_cache=MeetingNotesCache(ttl=60))
+        planner.plan_meeting = AsyncMock(return_value="notes")
+        return planner
+
+    async def test_warm_once_plans_every_context_afresh(self, planner):
+        """Test that each canonical context, plus the general one, is re-planned with its first phrasing."""
+        warmer = MeetingNotesWarmer(planner, ["Sprint Planning!!", "our sprint planning"], mode="pipeline", interval=60)
+
+        assert await warmer.warm_once() == 2
+        planner.plan_meeting.assert_any_await("", mode="pipeline", refresh=True)
+        planner.plan_meeting.assert_any_await("Sprint Planning!!", mode="pipeline", refresh=True)
+
+    async def test_failed_context_does_not_stop_warming(self, planner):
+        """Test that one failing context leaves the others warmed."""
+        planner.plan_meeting.side_effect = [Exception("LLM down"), "notes"]
+        warmer = MeetingNotesWarmer(planner, ["retro"], mode="agent", interval=60)
+
+        assert await warmer.warm_once() == 1
+
+    async def test_start_tracks_contexts_and_stop_cancels(self, planner):
+        """Test that starting tracks the contexts and warms in the background until stopped."""
+        warmer = MeetingNotesWarmer(planner, ["retro"], mode="agent", interval=60)
+
+        warmer.start()
+        await asyncio.sleep(0.01)
+        await warmer.stop()
+
+        assert planner.notes_cache.tracked() == [("agent", ""), ("agent", "retro")]
+        assert planner.plan_meeting.await_count == 2
+
+    async def test_only_the_lease_holder_warms(self, planner, tmp_path):
+        """Test that a worker leaves warming to the worker holding the shared warming lease."""
+        path = str(tmp_path / "store.sqlite3")
+        other_worker = SharedContentStore(path, max_items_per_pool=10)
+        other_worker.holder = "other-host:1"
+        warmer = MeetingNotesWarmer(planner, ["retro"], mode="agent", interval=60)
+
+        with patch.object(settings, 'SHARED_CONTENT_ENABLED', True), \
+             patch.object(settings, 'SHARED_CONTENT_PATH', path):
+            assert await other_worker.acquire_lease(WARMING_LEASE, 60)
+            warmer.start()
+            await asyncio.sleep(0.05)
+            await warmer.stop()
+            planner.plan_meeting.assert_not_awaited()
+
+            await other_worker.release_lease(WARMING_LEASE)
+            warmer.start()
+            await asyncio.sleep(0.05)
+            await warmer.stop()
+
+        assert planner.plan_meeting.await_count == 2
+        other_worker.close()
+
+
+class TestPlannerNotesCache:
+    """Test cases for serving precomputed notes from MeetingPlannerAgent."""
+
+    @pytest.fixture
+    def agent(self):
+        """A pipeline planner with fake tools and formatting."""
+        with patch('app.agents.meeting_planner_agent.get_llm_gateway', return_value=MagicMock()):
+            agent = MeetingPlannerAgent()
+        agent.tools = [MagicMock(ainvoke=AsyncMock(return_value="content")) for _ in range(3)]
+        agent.llm_gateway.get_string_response = AsyncMock(return_value="Meeting Notes for Host")
+        agent.notes_cache.track("pipeline", "retro")
+        return agent
+
+    async def test_tracked_context_served_from_cache(self, agent):
+        """Test that a warmed context is answered without planning again."""
+        first = await agent.plan_meeting("retro", mode="pipeline")
+        second = await agent.plan_meeting("Retro!", mode="pipeline")
+
+        assert first == second == "Meeting Notes for Host"
+        assert agent.tools[0].ainvoke.await_count == 1
+
+    async def test_refresh_bypasses_cache(self, agent):
+        """Test that refreshing plans again and replaces the cached notes."""
+        await agent.plan_meeting("retro", mode="pipeline")
+        agent.llm_gateway.get_string_response.return_value = "Updated notes"
+
+        assert await agent.plan_meeting("retro", mode="pipeline", refresh=True) == "Updated notes"
+        assert await agent.plan_meeting("retro", mode="pipeline") == "Updated notes"
+
+    async def test_fallback_notes_are_not_cached(self, agent):
+        """Test that notes from the fallback path are never served from the cache."""
+        with patch.object(agent, '_pipeline_plan_meeting', AsyncMock(side_effect=Exception("boom"))), \
+             patch.object(MeetingPlannerAgent, '_fallback_plan_meeting', AsyncMock(return_value="Fallback notes")):
+            assert await agent.plan_meeting("retro", mode="pipeline") == "Fallback notes"
+
+        assert agent.notes_cache.get("pipeline", "retro") is None
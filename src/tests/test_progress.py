@@ -0,0 +1,118 @@
+"""
+Tests for meeting planning progress reporting.
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.progress import BroadcastListener, MCPProgressReporter, PlanningListener, notify
+
+
+@pytest.fixture
+def ctx():
+    """A fake MCP Context recording notifications."""
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+    ctx.info = AsyncMock()
+    return ctx
+
+
+class TestMCPProgressReporter:
+    """Test cases for MCPProgressReporter."""
+
+    async def test_section_reports_progress_and_content(self, ctx):
+        """Test that a ready section advances progress and is sent to the client."""
+        reporter = MCPProgressReporter(ctx)
+
+        await reporter.on_section("fun_fact", "Honey never spoils.")
+
+        ctx.report_progress.assert_called_once_with(1, 4, "Fun Fact ready")
+        ctx.info.assert_called_once_with(
+            "Fun Fact:\nHoney never spoils.", logger_name="meeting_notes", extra={"section": "fun_fact"}
+        )
+
+    async def test_tokens_are_buffered_until_line_break(self, ctx):
+        """Test that streamed tokens are flushed per line rather than per token."""
+        reporter = MCPProgressReporter(ctx)
+
+        await reporter.on_token("Meeting ")
+        await reporter.on_token("Notes")
+        ctx.info.assert_not_called()
+
+        await reporter.on_token(" for Host\n")
+        ctx.info.assert_called_once()
+        assert ctx.info.call_args[0][0] == "Meeting Notes for Host\n"
+
+    async def test_tokens_flush_when_buffer_is_large(self, ctx):
+        """Test that long lines are flushed once the buffer limit is reached."""
+        reporter = MCPProgressReporter(ctx, flush_chars=10)
+
+        await reporter.on_token("0123456789abc")
+
+        ctx.info.assert_called_once()
+
+    async def test_complete_flushes_and_finishes_progress(self, ctx):
+        """Test that completion sends buffered text and marks progress as done."""
+        reporter = MCPProgressReporter(ctx)
+        await reporter.on_token("partial")
+
+        await reporter.on_complete("final notes")
+
+        assert ctx.info.call_args[0][0] == "partial"
+        ctx.report_progress.assert_called_once_with(4, 4, "Meeting notes ready")
+
+    async def test_client_errors_do_not_raise(self, ctx):
+        """Test that a failing notification never breaks planning."""
+        ctx.report_progress.side_effect = RuntimeError("client gone")
+        reporter = MCPProgressReporter(ctx)
+
+        await reporter.on_section("trivia", "Question: What is Python?")
+
+        ctx.info.assert_called_once()
+
+
+class TestBroadcastListener:
+    """Test cases for BroadcastListener."""
+
+    async def test_late_subscriber_receives_missed_events_in_order(self):
+        """Test that a subscriber joining part-way first gets the events it missed."""
+        broadcast = BroadcastListener()
+        early = MagicMock(spec=PlanningListener, on_section=AsyncMock(), on_token=AsyncMock())
+        late = MagicMock(spec=PlanningListener, on_section=AsyncMock(), on_token=AsyncMock())
+
+        await broadcast.subscribe(early)
+        await broadcast.on_section("trivia", "Question")
+        await broadcast.subscribe(late)
+        await broadcast.on_token("Meeting")
+
+        early.on_section.assert_called_once_with("trivia", "Question")
+        late.on_section.assert_called_once_with("trivia", "Question")
+        late.on_token.assert_called_once_with("Meeting")
+
+    async def test_unsubscribed_listener_gets_no_events(self):
+        """Test that a listener stops receiving events after unsubscribing."""
+        broadcast = BroadcastListener()
+        listener = MagicMock(spec=PlanningListener, on_section=AsyncMock())
+
+        await broadcast.subscribe(listener)
+        broadcast.unsubscribe(listener)
+        await broadcast.on_section("trivia", "Question")
+
+        listener.on_section.assert_not_called()
+
+
+class TestNotify:
+    """Test cases for notify."""
+
+    async def test_no_listener(self):
+        """Test that a missing listener is ignored."""
+        await notify(None, "on_section", "trivia", "content")
+
+    async def test_listener_errors_are_logged(self):
+        """Test that listener failures are swallowed."""
+        listener = PlanningListener()
+        listener.on_section = AsyncMock(side_effect=RuntimeError("boom"))
+
+        await notify(listener, "on_section", "trivia", "content")
+
+        listener.on_section.assert_called_once_with("trivia", "content")
@@ -0,0 +1,159 @@
+"""
+Tests for client-side upstream rate limiting.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limiter import RateLimitExceeded, TokenBucket, rate_limiters
+from app.schemas.tech_trivia import TechTriviaQuestion, TechTriviaResponse
+from app.services.tech_trivia_service import TechTriviaService
+
+URL = "https://api.example.com/items"
+
+
+def make_question(index: int) -> TechTriviaQuestion:
+    """Create a trivia question with a unique question text."""
+    return TechTriviaQuestion(
+        category="Science: Computers",
+        type="multiple",
+        difficulty="easy",
+        question=f"Question {index}?",
+        correct_answer=f"Answer {index}",
+        incorrect_answers=["Wrong 1", "Wrong 2", "Wrong 3"]
+    )
+
+
+@pytest.fixture
+def limited_host():
+    """Rate limit the test host to one request per 100 seconds."""
+    with patch.object(settings, 'RATE_LIMITS', {"api.example.com": 0.01, "opentdb.com": 0.01}):
+        yield
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_refuse(self):
+        """Test that a full bucket allows a burst and then refuses."""
+        bucket = TokenBucket(rate=0.01, burst=2)
+
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+    def test_wait_time_until_next_token(self):
+        """Test that the wait time is zero with a token available and the refill time without."""
+        bucket = TokenBucket(rate=0.5)
+
+        assert bucket.wait_time() == 0
+        bucket.try_acquire()
+        assert 1.9 <= bucket.wait_time() <= 2.0
+
+    async def test_acquire_waits_for_next_token(self):
+        """Test that a caller waits when the next token arrives soon enough."""
+        bucket = TokenBucket(rate=20)
+        bucket.try_acquire()
+
+        start = asyncio.get_event_loop().time()
+        assert await bucket.acquire(max_wait=1.0)
+        assert asyncio.get_event_loop().time() - start >= 0.04
+
+    async def test_acquire_refuses_long_waits_without_taking_a_token(self):
+        """Test that a refused caller does not push back later callers."""
+        bucket = TokenBucket(rate=20)
+        bucket.try_acquire()
+
+        assert not await bucket.acquire(max_wait=0.01)
+        assert await bucket.acquire(max_wait=0.1)
+
+    async def test_concurrent_waiters_are_spaced_out(self):
+        """Test that waiting callers each reserve their own token."""
+        bucket = TokenBucket(rate=20)
+        bucket.try_acquire()
+
+        start = asyncio.get_event_loop().time()
+        await asyncio.gather(bucket.acquire(max_wait=1.0), bucket.acquire(max_wait=1.0))
+        assert asyncio.get_event_loop().time() - start >= 0.09
+
+    async def test_cancelled_waiter_returns_its_token(self):
+        """Test that cancelling a waiter hands its reserved token back."""
+        bucket = TokenBucket(rate=10)
+        bucket.try_acquire()
+        waiter = asyncio.create_task(bucket.acquire(max_wait=1.0))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert await bucket.acquire(max_wait=0.15)
+
+
+class TestRateLimiterRegistry:
+    """Test cases for per-host rate limiters."""
+
+    async def test_unconfigured_hosts_are_unlimited(self):
+        """Test that hosts without a configured rate are never limited."""
+        for _ in range(10):
+            await rate_limiters.acquire("https://unlimited.example.org/", max_wait=0)
+
+    async def test_configured_host_is_limited(self, limited_host):
+        """Test that a configured host refuses requests beyond its rate."""
+        await rate_limiters.acquire(URL, max_wait=0)
+        with pytest.raises(RateLimitExceeded):
+            await rate_limiters.acquire(URL + "?page=2", max_wait=0)
+
+    def test_workers_share_the_host_rate(self, limited_host):
+        """Test that each worker process gets its share of a host's rate."""
+        with patch.object(settings, 'MCP_WORKERS', 4):
+            assert rate_limiters.bucket(URL).rate == pytest.approx(0.0025)
+
+    async def test_rate_limiting_can_be_disabled(self, limited_host):
+        """Test that no host is limited when rate limiting is disabled."""
+        with patch.object(settings, 'RATE_LIMIT_ENABLED', False):
+            for _ in range(3):
+                await rate_limiters.acquire(URL, max_wait=0)
+
+
+class TestServiceRateLimiting:
+    """Test cases for rate limiting in services."""
+
+    async def test_request_over_limit_is_not_sent(self, limited_host):
+        """Test that a request exceeding the limit gets fallback data without reaching the API."""
+        service = TechTriviaService()
+        fetch = AsyncMock(return_value={"ok": True})
+
+        with patch.object(service, '_fetch', fetch):
+            assert await service._make_request(url=URL) == {"ok": True}
+            assert await service._make_request(url=URL) == service._get_fallback_data()
+
+        fetch.assert_called_once()
+
+    async def test_trivia_served_from_pool_when_over_limit(self, limited_host):
+        """Test that trivia comes from a batch-filled pool instead of a rate-limited single request."""
+        rate_limiters.try_acquire(settings.TECH_TRIVIA_API_URL)
+        batch = AsyncMock(return_value=[make_question(1), make_question(2)])
+
+        with patch.object(TechTriviaService, 'fetch_trivia_batch', batch), \
+             patch('app.services.BaseService._make_request', new_callable=AsyncMock) as mock_make_request:
+            question = await TechTriviaService().get_tech_trivia()
+
+        assert question.question == "Question 1?"
+        mock_make_request.assert_not_called()
+
+    async def test_throttled_burst_gets_pooled_trivia(self):
+        """Test that a burst over the limit is served real questions once the pool refill gets its token."""
+        response = TechTriviaResponse(response_code=0, results=[make_question(i) for i in range(5)])
+        fetch = AsyncMock(return_value=response)
+
+        # A token every 0.2 s, longer than a live request may wait for one
+        with patch.object(settings, 'RATE_LIMITS', {"opentdb.com": 5}), \
+             patch.object(settings, 'RATE_LIMIT_MAX_WAIT', 0.05), \
+             patch('app.services.BaseService._fetch', fetch):
+            rate_limiters.try_acquire(settings.TECH_TRIVIA_API_URL)
+            questions = await asyncio.gather(*(TechTriviaService().get_tech_trivia() for _ in range(3)))
+
+        assert [question.question for question in questions] == ["Question 0?", "Question 1?", "Question 2?"]
+        fetch.assert_awaited_once()
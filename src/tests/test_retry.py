@@ -0,0 +1,205 @@
+"""
+Tests for upstream retry policies and retry budgets.
+"""
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+
+from app.core.config import settings
+from app.core.deadline import deadline_scope
+from app.core.metrics import SERVICE_FALLBACKS, UPSTREAM_RETRIES
+from app.core.retry import RetryBudget, RetryPolicy, parse_retry_after, retry_policy
+from app.services.tech_trivia_service import TechTriviaService
+
+URL = "https://api.example.com/items?amount=1"
+
+
+def response_error(status: int, retry_after: str = None) -> aiohttp.ClientResponseError:
+    """Create the error raised for an HTTP error response."""
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return aiohttp.ClientResponseError(MagicMock(real_url=URL), (), status=status, headers=headers)
+
+
+def failing_fetch(*errors: BaseException):
+    """Return a fetch that raises the given errors in turn, then succeeds, and its call times."""
+    calls = []
+
+    async def fetch(url, response_model, timeout):
+        calls.append(asyncio.get_event_loop().time())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return {"ok": True}
+
+    return fetch, calls
+
+
+@pytest.fixture(autouse=True)
+def fast_retries():
+    """Retry quickly, so tests only wait for Retry-After headers."""
+    with patch.object(settings, 'RETRY_BASE_DELAY', 0.01), \
+         patch.object(settings, 'RETRY_MAX_DELAY', 0.02), \
+         patch.object(settings, 'RETRY_MAX_WAIT', 1.0):
+        yield
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy and its configuration."""
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that backoff delays stay between zero and the capped exponential bound."""
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+
+        assert all(0 <= policy.backoff(1) <= 0.1 for _ in range(50))
+        assert all(0 <= policy.backoff(2) <= 0.2 for _ in range(50))
+        assert all(0 <= policy.backoff(5) <= 0.3 for _ in range(50))
+        assert len({policy.backoff(3) for _ in range(10)}) > 1
+
+    def test_service_overrides_defaults(self):
+        """Test that a service's RETRY_POLICIES entry overrides the defaults."""
+        overrides = {"TechTriviaService": {"max_attempts": 5, "statuses": [503]}}
+        with patch.object(settings, 'RETRY_POLICIES', overrides):
+            trivia = retry_policy("TechTriviaService")
+            facts = retry_policy("FunFactsService")
+
+        assert trivia.max_attempts == 5
+        assert trivia.retries(503) and not trivia.retries(429)
+        assert facts.max_attempts == settings.RETRY_MAX_ATTEMPTS
+        assert facts.retries(429)
+
+    def test_retries_can_be_disabled(self):
+        """Test that no status is retried when retrying is disabled."""
+        with patch.object(settings, 'RETRY_ENABLED', False):
+            assert not retry_policy("TechTriviaService").retries(429)
+
+    def test_parse_retry_after(self):
+        """Test that Retry-After is read as seconds or as an HTTP date."""
+        in_ten_seconds = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True)
+
+        assert parse_retry_after("3") == 3.0
+        assert 8 <= parse_retry_after(in_ten_seconds) <= 10
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestRetryBudget:
+    """Test cases for RetryBudget."""
+
+    def test_allows_minimum_retries(self):
+        """Test that a quiet endpoint can still be retried a few times."""
+        budget = RetryBudget(ratio=0.1, min_retries=2, window=60)
+        budget.record_request()
+
+        assert budget.try_spend()
+        assert budget.try_spend()
+        assert not budget.try_spend()
+
+    def test_allows_retries_in_proportion_to_requests(self):
+        """Test that retries are capped at a share of recent requests."""
+        budget = RetryBudget(ratio=0.5, min_retries=0, window=60)
+        for _ in range(4):
+            budget.record_request()
+
+        assert budget.try_spend()
+        assert budget.try_spend()
+        assert not budget.try_spend()
+
+    def test_old_retries_leave_the_window(self):
+        """Test that the budget recovers once earlier retries are outside the window."""
+        budget = RetryBudget(ratio=0, min_retries=1, window=0.01)
+        assert budget.try_spend()
+        assert not budget.try_spend()
+
+        with patch('app.core.retry.time.monotonic', return_value=budget._retries[0] + 1):
+            assert budget.try_spend()
+
+
+class TestServiceRetries:
+    """Test cases for retries in services."""
+
+    async def test_retryable_status_is_retried(self):
+        """Test that a 503 is retried and the fresh response served."""
+        service = TechTriviaService()
+        fetch, calls = failing_fetch(response_error(503))
+
+        with patch.object(service, '_fetch', fetch):
+            assert await service._make_request(url=URL) == {"ok": True}
+
+        assert len(calls) == 2
+        assert UPSTREAM_RETRIES.value(service="TechTriviaService", decision="retried") == 1
+
+    async def test_retry_after_is_honoured(self):
+        """Test that a retry waits at least as long as the response's Retry-After."""
+        service = TechTriviaService()
+        fetch, calls = failing_fetch(response_error(429, retry_after="1"))
+
+        with patch.object(settings, 'RETRY_MAX_WAIT', 2.0), \
+             patch.object(service, '_fetch', fetch):
+            assert await service._make_request(url=URL) == {"ok": True}
+
+        assert calls[1] - calls[0] >= 1.0
+
+    async def test_long_retry_after_serves_fallback(self):
+        """Test that a Retry-After beyond the policy's max_wait is not waited for."""
+        service = TechTriviaService()
+        fetch, calls = failing_fetch(response_error(429, retry_after="120"))
+
+        with patch.object(service, '_fetch', fetch):
+            assert await service._make_request(url=URL) == service._get_fallback_data()
+
+        assert len(calls) == 1
+        assert UPSTREAM_RETRIES.value(service="TechTriviaService", decision="max_wait") == 1
+        assert SERVICE_FALLBACKS.value(service="TechTriviaService", reason="upstream_429") == 1
+
+    async def test_retries_stop_after_max_attempts(self):
+        """Test that a persistently failing endpoint gets max_attempts requests."""
+        service = TechTriviaService()
+        fetch, calls = failing_fetch(*[response_error(503)] * 5)
+
+        with patch.object(service, '_fetch', fetch):
+            assert await service._make_request(url=URL) == service._get_fallback_data()
+
+        assert len(calls) == settings.RETRY_MAX_ATTEMPTS
+        assert UPSTREAM_RETRIES.value(service="TechTriviaService", decision="attempts") == 1
+
+    async def test_retries_fit_in_the_deadline(self):
+        """Test that no retry is made when its wait would outlast the request deadline."""
+        service = TechTriviaService()
+        fetch, calls = failing_fetch(response_error(429, retry_after="1"))
+
+        with patch.object(service, '_fetch', fetch):
+            with deadline_scope(0.5):
+                assert await service._make_request(url=URL) == service._get_fallback_data()
+
+        assert len(calls) == 1
+        assert UPSTREAM_RETRIES.value(service="TechTriviaService", decision="deadline") == 1
+
+    async def test_retry_budget_prevents_retry_storms(self):
+        """Test that retries stop once the endpoint's retry budget is spent."""
+        service = TechTriviaService()
+        fetch, calls = failing_fetch(*[response_error(503)] * 20)
+
+        with patch.object(settings, 'RETRY_BUDGET_MIN_RETRIES', 2), \
+             patch.object(settings, 'RETRY_BUDGET_RATIO', 0), \
+             patch.object(settings, 'CIRCUIT_BREAKER_ENABLED', False), \
+             patch.object(service, '_fetch', fetch):
+            for _ in range(3):
+                await service._make_request(url=URL)
+
+        assert len(calls) == 5
+        assert UPSTREAM_RETRIES.value(service="TechTriviaService", decision="retried") == 2
+        assert UPSTREAM_RETRIES.value(service="TechTriviaService", decision="budget") == 2
+
+    async def test_client_errors_are_not_retried(self):
+        """Test that a 404 is answered with fallback data at once."""
+        service = TechTriviaService()
+        fetch, calls = failing_fetch(response_error(404))
+
+        with patch.object(service, '_fetch', fetch):
+            assert await service._make_request(url=URL) == service._get_fallback_data()
+
+        assert len(calls) == 1
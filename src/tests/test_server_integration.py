@@ -2,6 +2,7 @@
 Integration tests for the MCP server.
 """
 import pytest
+import subprocess
 import sys
 import os
 from unittest.mock import patch, AsyncMock, MagicMock
@@ -305,3 +306,237 @@ class TestMCPServerIntegration:
                 # Verify it's not the old simple format
                 assert "Meeting Notes for Host" not in result  # Old format
                 assert "Ice Breaker - Tech Trivia:" not in result  # Old format
+
+    @pytest.mark.asyncio
+    async def test_prepare_meeting_streams_sections_over_mcp(self):
+        """Test that streaming sends progress and sections to an MCP client before the result."""
+        from fastmcp import Client
+        from server import mcp, planner_agent
+        
+        async def stream(prompt, cache_prompt=None):
+            for text in ["Meeting Notes for Host\n", "Enjoy the meeting"]:
+                yield text
+        
+        tools = [
+            MagicMock(ainvoke=AsyncMock(return_value="Question: What is Python?\nAnswer: A programming language")),
+            MagicMock(ainvoke=AsyncMock(return_value="Honey never spoils.")),
+            MagicMock(ainvoke=AsyncMock(return_value="• test/repo - A test repository"))
+        ]
+        gateway = MagicMock(stream_string_response=stream)
+        progress = []
+        messages = []
+        
+        async def progress_handler(value, total, message):
+            progress.append((value, total, message))
+        
+        async def log_handler(message):
+            messages.append(message.data)
+        
+        with patch.object(planner_agent, 'tools', tools), \
+             patch.object(planner_agent, 'llm_gateway', gateway):
+            async with Client(mcp, log_handler=log_handler) as client:
+                result = await client.call_tool(
+                    "prepare_meeting",
+                    {"meeting_context": "standup", "mode": "pipeline", "stream": True},
+                    progress_handler=progress_handler
+                )
+        
+        assert result.content[0].text == "Meeting Notes for Host\nEnjoy the meeting"
+        sections = [message["extra"]["section"] for message in messages if message.get("extra")]
+        assert {"trivia", "fun_fact", "trending_repos"} <= set(sections)
+        assert sections[-2:] == ["notes", "notes"]
+        assert progress[-1] == (4, 4, "Meeting notes ready")
+        assert len(progress) == 4
+
+    @pytest.mark.asyncio
+    async def test_prepare_meeting_rejected_when_overloaded(self):
+        """Test that admission control rejects requests that cannot finish in time."""
+        from fastmcp import Client
+        from fastmcp.exceptions import ToolError
+        from server import mcp, planner_agent
+        from src.app.core.admission import AdmissionController
+        from src.app.core.config import settings
+        
+        # Expected run time longer than the tool timeout, so nothing can be admitted
+        controller = AdmissionController(
+            max_concurrent=1, max_per_client=1, max_queue=1,
+            expected_latency=settings.MCP_TOOL_TIMEOUT + 1
+        )
+        
+        with patch('server.admission_controller', controller), \
+             patch.object(planner_agent, '_plan_meeting', AsyncMock(return_value="notes")) as plan_meeting:
+            async with Client(mcp) as client:
+                with pytest.raises(ToolError, match="Server is busy"):
+                    await client.call_tool("prepare_meeting", {"meeting_context": "standup"})
+        
+        plan_meeting.assert_not_called()
+        assert controller.stats()["rejected"] == {"deadline": 1}
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_burst_shares_one_run_and_one_slot(self):
+        """Test that a burst of identical calls larger than the admission limit plans once."""
+        import asyncio
+        from fastmcp import Client
+        from server import mcp, planner_agent
+        from src.app.core.admission import AdmissionController
+        
+        controller = AdmissionController(max_concurrent=2, max_per_client=2, max_queue=0, expected_latency=1.0)
+        
+        async def slow_plan(meeting_context, mode, listener):
+            await asyncio.sleep(0.1)
+            return "notes"
+        
+        with patch('server.admission_controller', controller), \
+             patch.object(planner_agent, '_plan_meeting', AsyncMock(side_effect=slow_plan)) as plan_meeting:
+            async with Client(mcp) as client:
+                results = await asyncio.gather(*(
+                    client.call_tool("prepare_meeting", {"meeting_context": "standup", "mode": "pipeline"})
+                    for _ in range(10)
+                ))
+        
+        assert [result.content[0].text for result in results] == ["notes"] * 10
+        plan_meeting.assert_awaited_once()
+        assert controller.stats()["admitted"] == 1
+        assert controller.stats()["rejected"] == {}
+
+
+class TestPrepareMeetingsTool:
+    """Test cases for the batch prepare_meetings tool."""
+
+    @pytest.mark.asyncio
+    async def test_returns_notes_in_order(self):
+        """Test that the batch tool returns one result per context, in order."""
+        from fastmcp import Client
+        from server import mcp, planner_agent
+        
+        async def plan_meetings(contexts):
+            return [f"notes for {context}" for context in contexts]
+        
+        with patch.object(planner_agent, 'plan_meetings', AsyncMock(side_effect=plan_meetings)):
+            async with Client(mcp) as client:
+                result = await client.call_tool("prepare_meetings", {"contexts": ["standup", "retro"]})
+        
+        assert result.data == ["notes for standup", "notes for retro"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_too_many_contexts(self):
+        """Test that oversized batches are refused before any planning."""
+        from fastmcp import Client
+        from fastmcp.exceptions import ToolError
+        from server import mcp, planner_agent
+        from src.app.core.config import settings
+        
+        with patch.object(settings, 'MEETING_BATCH_MAX_CONTEXTS', 2), \
+             patch.object(planner_agent, 'plan_meetings', AsyncMock()) as plan_meetings:
+            async with Client(mcp) as client:
+                with pytest.raises(ToolError, match="Too many meetings"):
+                    await client.call_tool("prepare_meetings", {"contexts": ["a", "b", "c"]})
+        
+        plan_meetings.assert_not_called()
+
+
+class TestLazyInitialization:
+    """Test cases for the server's lazy cold-start path."""
+
+    def test_planner_agent_is_built_once(self):
+        """Test that the module attribute and the accessor share one planner agent."""
+        import server
+
+        assert server.get_planner_agent() is server.planner_agent
+        assert server.get_planner_agent() is server.get_planner_agent()
+
+    async def test_async_access_does_not_block_the_loop_during_warmup(self):
+        """Test that a request waiting for a warm-up in progress leaves the event loop free."""
+        import asyncio
+        import server
+
+        agent = MagicMock()
+        with patch.dict(vars(server)):
+            vars(server).pop("planner_agent", None)
+            server._init_lock.acquire()
+            try:
+                waiter = asyncio.create_task(server.get_planner_agent_async())
+                # The loop keeps running other work while the warm-up holds the lock
+                await asyncio.wait_for(asyncio.sleep(0.05), timeout=1)
+                assert not waiter.done()
+                vars(server)["planner_agent"] = agent
+            finally:
+                server._init_lock.release()
+
+            assert await asyncio.wait_for(waiter, timeout=1) is agent
+
+    def test_import_defers_langchain_until_warmup(self, tmp_path):
+        """Test that importing the server skips LangChain, and the warm-up thread builds the planner."""
+        root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        script = (
+            f"import sys; sys.path.insert(0, {root!r}); import server\n"
+            "assert 'langchain.agents' not in sys.modules\n"
+            "assert 'src.app.agents.meeting_planner_agent' not in sys.modules\n"
+            "server.start_warmup().join()\n"
+            "assert 'planner_agent' in vars(server)\n"
+        )
+        env = {**os.environ, "SERVER_LAZY_INIT": "true", "LLM_API_KEY": "test", "LLM_MODEL": "gpt-4o-mini"}
+        result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+
+
+class TestWorkerMode:
+    """Test cases for running the server as several worker processes."""
+
+    async def test_worker_lifespan_holds_shared_resources(self):
+        """Test that per-request lifespans inside a worker never close the shared resources."""
+        import server
+
+        app = server.create_worker_app()
+        with patch('server.start_warmup'), \
+             patch('server.http_session_manager.close', new_callable=AsyncMock) as close_session:
+            async with app.router.lifespan_context(app):
+                assert server._active_sessions == 1
+                async with server.server_lifespan(server.mcp):
+                    pass
+                close_session.assert_not_awaited()
+
+        assert server._active_sessions == 0
+        close_session.assert_awaited_once()
+
+    def test_workers_require_http_transport(self):
+        """Test that sessionful transports are refused in multi-worker mode."""
+        import server
+
+        with patch.object(server.settings, 'MCP_WORKERS', 4), \
+             patch.object(server.settings, 'MCP_TRANSPORT', 'sse'), \
+             patch('uvicorn.run') as uvicorn_run:
+            with pytest.raises(ValueError, match="MCP_TRANSPORT=http"):
+                server.run_workers()
+
+        uvicorn_run.assert_not_called()
+
+    def test_workers_run_the_app_factory(self):
+        """Test that uvicorn starts MCP_WORKERS processes from the worker app factory."""
+        import server
+
+        with patch.object(server.settings, 'MCP_WORKERS', 4), \
+             patch.object(server.settings, 'MCP_TRANSPORT', 'http'), \
+             patch('uvicorn.run') as uvicorn_run:
+            server.run_workers()
+
+        args, kwargs = uvicorn_run.call_args
+        assert args == ("server:create_worker_app",)
+        assert kwargs["factory"] is True
+        assert kwargs["workers"] == 4
+        assert kwargs["timeout_graceful_shutdown"] >= server.settings.MCP_TOOL_TIMEOUT
+
+    def test_workers_require_shared_store_for_warming(self):
+        """Test that notes warming in multi-worker mode is refused without a shared store to elect one warmer."""
+        import server
+
+        with patch.object(server.settings, 'MCP_WORKERS', 4), \
+             patch.object(server.settings, 'MCP_TRANSPORT', 'http'), \
+             patch.object(server.settings, 'MEETING_NOTES_WARMING_ENABLED', True), \
+             patch.object(server.settings, 'SHARED_CONTENT_ENABLED', False), \
+             patch('uvicorn.run') as uvicorn_run:
+            with pytest.raises(ValueError, match="SHARED_CONTENT_ENABLED"):
+                server.run_workers()
+
+        uvicorn_run.assert_not_called()
@@ -0,0 +1,130 @@
+"""
+Tests for the content store shared between worker processes.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import settings
+from app.core.shared_store import SharedContentStore, get_shared_store, open_shared_database, shared_fetch
+from app.schemas.fun_facts import FunFact
+
+
+def make_fact(fact_id: str) -> FunFact:
+    return FunFact(id=fact_id, text=f"Fact {fact_id}", source="test", source_url="", language="en", permalink="")
+
+
+class TestSharedContentStore:
+    """Test cases for SharedContentStore."""
+
+    def test_database_uses_wal(self, tmp_path):
+        """Test that shared databases are opened in WAL mode."""
+        connection = open_shared_database(str(tmp_path / "shared" / "store.sqlite3"))
+
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        connection.close()
+
+    async def test_items_are_claimed_once_across_processes(self, tmp_path):
+        """Test that an item put by one process is claimed by exactly one other."""
+        path = str(tmp_path / "store.sqlite3")
+        first = SharedContentStore(path, max_items_per_pool=10)
+        second = SharedContentStore(path, max_items_per_pool=10)
+        await first.put("pool", [("a", "1"), ("b", "2"), ("c", "3")])
+
+        claimed = await second.claim("pool", 2) + await first.claim("pool", 2)
+
+        assert claimed == ["1", "2", "3"]
+        assert await second.claim("pool", 2) == []
+        first.close()
+        second.close()
+
+    async def test_put_skips_queued_keys_and_respects_limit(self, tmp_path):
+        """Test that duplicate keys are ignored and each pool is capped."""
+        store = SharedContentStore(str(tmp_path / "store.sqlite3"), max_items_per_pool=2)
+
+        assert await store.put("pool", [("a", "1"), ("a", "1")]) == 1
+        assert await store.put("pool", [("b", "2"), ("c", "3")]) == 1
+        assert await store.put("other", [("a", "1")]) == 1
+        assert store.size("pool") == 2
+        store.close()
+
+    async def test_lease_excludes_other_holders_until_released(self, tmp_path):
+        """Test that only one process holds a pool's fetch lease at a time."""
+        path = str(tmp_path / "store.sqlite3")
+        first = SharedContentStore(path, max_items_per_pool=10)
+        second = SharedContentStore(path, max_items_per_pool=10)
+        second.holder = "other-worker"
+
+        assert await first.acquire_lease("pool", 30)
+        assert not await second.acquire_lease("pool", 30)
+        assert await second.lease_held("pool")
+
+        await first.release_lease("pool")
+
+        assert not await second.lease_held("pool")
+        assert await second.acquire_lease("pool", 30)
+        first.close()
+        second.close()
+
+    async def test_expired_lease_can_be_taken_over(self, tmp_path):
+        """Test that a lease left behind by a crashed worker expires."""
+        path = str(tmp_path / "store.sqlite3")
+        first = SharedContentStore(path, max_items_per_pool=10)
+        second = SharedContentStore(path, max_items_per_pool=10)
+        second.holder = "other-worker"
+        with patch('app.core.shared_store.time.time', return_value=1000.0):
+            await first.acquire_lease("pool", 30)
+        with patch('app.core.shared_store.time.time', return_value=1031.0):
+            assert await second.acquire_lease("pool", 30)
+        first.close()
+        second.close()
+
+
+class TestSharedFetch:
+    """Test cases for shared_fetch."""
+
+    async def test_fetches_directly_without_shared_store(self):
+        """Test that the wrapped fetch is used as is when sharing is disabled."""
+        fetch_batch = AsyncMock(return_value=[make_fact("a")])
+        fetch = shared_fetch("fun_facts", fetch_batch, model=FunFact, key=lambda fact: fact.id, claim_size=1)
+
+        with patch.object(settings, 'SHARED_CONTENT_ENABLED', False):
+            assert await fetch() == [make_fact("a")]
+
+        assert get_shared_store() is None
+
+    async def test_workers_share_one_fetched_batch(self, tmp_path):
+        """Test that a fetched batch is split between claims without fetching again."""
+        fetch_batch = AsyncMock(return_value=[make_fact("a"), make_fact("b"), make_fact("c")])
+        fetch = shared_fetch("fun_facts", fetch_batch, model=FunFact, key=lambda fact: fact.id, claim_size=2)
+
+        with patch.object(settings, 'SHARED_CONTENT_ENABLED', True), \
+             patch.object(settings, 'SHARED_CONTENT_PATH', str(tmp_path / "shared.sqlite3")):
+            first = await fetch()
+            second = await fetch()
+
+        assert [fact.id for fact in first] == ["a", "b"]
+        assert [fact.id for fact in second] == ["c"]
+        fetch_batch.assert_awaited_once()
+
+    async def test_waits_for_batch_fetched_by_lease_holder(self, tmp_path):
+        """Test that a worker without the lease claims the holder's batch instead of fetching."""
+        path = str(tmp_path / "shared.sqlite3")
+        other_worker = SharedContentStore(path, max_items_per_pool=10)
+        other_worker.holder = "other-worker"
+        await other_worker.acquire_lease("fun_facts", 30)
+        fetch_batch = AsyncMock(return_value=[make_fact("own")])
+        fetch = shared_fetch("fun_facts", fetch_batch, model=FunFact, key=lambda fact: fact.id, claim_size=5)
+
+        async def finish_other_fetch():
+            await asyncio.sleep(0.05)
+            await other_worker.put("fun_facts", [("shared", make_fact("shared").model_dump_json())])
+            await other_worker.release_lease("fun_facts")
+
+        with patch.object(settings, 'SHARED_CONTENT_ENABLED', True), \
+             patch.object(settings, 'SHARED_CONTENT_PATH', path), \
+             patch.object(settings, 'SHARED_CONTENT_POLL_INTERVAL', 0.01):
+            result, _ = await asyncio.gather(fetch(), finish_other_fetch())
+
+        assert [fact.id for fact in result] == ["shared"]
+        fetch_batch.assert_not_awaited()
+        other_worker.close()
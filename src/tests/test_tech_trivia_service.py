@@ -0,0 +1,106 @@
+"""
+Tests for the Tech Trivia Service.
+"""
+from unittest.mock import patch, AsyncMock
+
+from app.core.config import settings
+from app.schemas.tech_trivia import TechTriviaQuestion, TechTriviaResponse
+from app.services.tech_trivia_service import TechTriviaService
+
+
+def make_question(index: int) -> TechTriviaQuestion:
+    """Create a trivia question with a unique question text."""
+    return TechTriviaQuestion(
+        category="Science: Computers",
+        type="multiple",
+        difficulty="easy",
+        question=f"Question {index}?",
+        correct_answer=f"Answer {index}",
+        incorrect_answers=["Wrong 1", "Wrong 2", "Wrong 3"]
+    )
+
+
+class TestTechTriviaService:
+    """Test cases for TechTriviaService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = TechTriviaService()
+
+    def test_batch_url_sets_amount(self):
+        """Test that the batch URL requests the configured batch size."""
+        url = self.service._batch_url()
+
+        assert f"amount={settings.TECH_TRIVIA_POOL_BATCH_SIZE}" in url
+        assert "category=18" in url
+
+    @patch('app.services.BaseService._make_request')
+    async def test_fetch_trivia_batch_fallback_returns_empty(self, mock_make_request):
+        """Test that fallback data from the API is not treated as a batch."""
+        mock_make_request.return_value = self.service._get_fallback_data()
+
+        assert await self.service.fetch_trivia_batch() == []
+
+    @patch('app.services.tech_trivia_service.settings.TECH_TRIVIA_POOL_ENABLED', True)
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_get_tech_trivia_pooled_uses_one_batch_request(self, mock_make_request):
+        """Test that pooled trivia serves several questions from a single request."""
+        mock_make_request.return_value = TechTriviaResponse(
+            response_code=0,
+            results=[make_question(i) for i in range(20)]
+        )
+
+        questions = [await TechTriviaService().get_tech_trivia() for _ in range(5)]
+
+        assert [q.question for q in questions] == [f"Question {i}?" for i in range(5)]
+        mock_make_request.assert_called_once()
+
+    @patch('app.services.tech_trivia_service.settings.TECH_TRIVIA_POOL_ENABLED', True)
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_get_tech_trivia_pooled_empty_uses_fallback(self, mock_make_request):
+        """Test that an empty pool falls back to the hardcoded question."""
+        mock_make_request.return_value = self.service._get_fallback_data()
+
+        question = await self.service.get_tech_trivia()
+
+        assert question == self.service._get_fallback_data()
+
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_get_tech_trivia_batch_uses_one_request(self, mock_make_request):
+        """Test that trivia for several meetings comes from a single batch request."""
+        mock_make_request.return_value = TechTriviaResponse(
+            response_code=0,
+            results=[make_question(i) for i in range(20)]
+        )
+
+        questions = await self.service.get_tech_trivia_batch(3)
+
+        assert [q.question for q in questions] == ["Question 0?", "Question 1?", "Question 2?"]
+        mock_make_request.assert_called_once()
+
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_get_tech_trivia_batch_reuses_questions_when_short(self, mock_make_request):
+        """Test that a short batch is reused in turn, and an empty one falls back."""
+        mock_make_request.return_value = TechTriviaResponse(response_code=0, results=[make_question(0), make_question(1)])
+
+        questions = await self.service.get_tech_trivia_batch(3)
+
+        assert [q.question for q in questions] == ["Question 0?", "Question 1?", "Question 0?"]
+
+        mock_make_request.return_value = self.service._get_fallback_data()
+        assert await self.service.get_tech_trivia_batch(2) == [self.service._get_fallback_data()] * 2
+
+    @patch('app.services.tech_trivia_service.settings.TECH_TRIVIA_POOL_ENABLED', True)
+    @patch('app.services.BaseService._make_request', new_callable=AsyncMock)
+    async def test_get_tech_trivia_batch_draws_distinct_pooled_questions(self, mock_make_request):
+        """Test that pooled batches draw distinct questions from the pool."""
+        mock_make_request.return_value = TechTriviaResponse(
+            response_code=0,
+            results=[make_question(i) for i in range(20)]
+        )
+
+        first = await self.service.get_tech_trivia_batch(3)
+        second = await self.service.get_tech_trivia_batch(3)
+
+        assert len({q.question for q in first + second}) == 6
+        mock_make_request.assert_called_once()